@@ -1,6 +1,6 @@
 """Shared dependencies for API routes."""
 
-from collections.abc import Generator
+from collections.abc import AsyncIterator, Generator
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
@@ -9,6 +9,8 @@ from sqlalchemy.orm import Session
 from app.db.session import SessionLocal
 from app.db import models
 from app.core.security import decode_token
+from app.services.admission import admission_error, evaluation_admission
+from app.utils.rate_limit import RateLimitTimeout
 
 
 # Thay đổi từ OAuth2PasswordBearer sang HTTPBearer để chỉ cần nhập token
@@ -64,3 +66,20 @@ def get_current_user(
         )
     return user
 
+
+async def admit_evaluation(
+    current_user: models.User = Depends(get_current_user),
+) -> AsyncIterator[None]:
+    """Hold an evaluation admission for the current user during the request.
+
+    Raises 429 with ``Retry-After`` when the user or the server is over its limit.
+    """
+
+    try:
+        await evaluation_admission.acquire(current_user.user_id)
+    except RateLimitTimeout as e:
+        raise admission_error(e) from None
+    try:
+        yield
+    finally:
+        evaluation_admission.release(current_user.user_id)
@@ -1,32 +1,71 @@
 """Practice endpoints for pronunciation practice feature."""
 
+import asyncio
+import json
 import logging
-from typing import Optional
-import requests
+import re
+from contextlib import AsyncExitStack
+from email.utils import parsedate_to_datetime
+from typing import Any, Optional
+import httpx
 from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
-from fastapi.responses import StreamingResponse
+from fastapi.responses import FileResponse, RedirectResponse, Response, StreamingResponse
+from pydantic import BaseModel
 from sqlalchemy.orm import Session
+from starlette.background import BackgroundTask
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import UploadFile
+from starlette.formparsers import MultiPartException
 
-from app.api.deps import get_current_user, get_db
+from app.api.deps import admit_evaluation, get_current_user, get_db
+from app.core.config import settings
 from app.schemas.common import ResponseModel
 from app.schemas.practice import (
+    BatchEvaluationRequest,
+    BatchEvaluationResponse,
     EvaluationRequest,
+    EvaluationJobResponse,
     EvaluationResponse,
     SentenceResponse,
     SentenceSimpleResponse,
-    ScoreBreakdown,
-    WordComparison,
-    ImprovementSuggestion,
-    FocusPhoneme,
     TopicResponse,
 )
+from app.services.admission import admission_error, evaluation_admission
+from app.services.background_tasks import schedule_local_file_cleanup
 from app.services.practice_service import PracticeService
-from app.services.audio_service import AudioService
-from app.services.gemini_service import GeminiService
+from app.services.drive_audio_cache import CachedAudio, UpstreamError, drive_audio_cache
+from app.services.http_client import upstream_http
+from app.services.recording_store import recording_store
+from app.services.reference_audio import reference_audio_store
+from app.services.evaluation_service import EvaluationService
+from app.services.evaluation_jobs import (
+    JOB_FAILED,
+    JOB_SUCCEEDED,
+    EvaluationJob,
+    QueueFullError,
+    evaluation_job_queue,
+)
 from app.db.models_user import User
+from app.db.session import SessionLocal
+from app.utils.rate_limit import RateLimitTimeout
+from app.utils.uploads import (
+    UploadTooLargeError,
+    check_content_length,
+    parse_multipart,
+    spool_stream,
+)
 
 logger = logging.getLogger(__name__)
 
+# Interval between SSE keep-alive comments while a job is still running
+SSE_KEEPALIVE_SECONDS = 15
+
+# Chunk size when relaying an uncached Google Drive stream
+DRIVE_STREAM_CHUNK_SIZE = 64 * 1024
+
+# Google Drive file id inside ``audio_url`` (…/file/d/<id>/view or …?id=<id>)
+DRIVE_FILE_ID_PATTERN = re.compile(r"/d/([\w-]+)|[?&]id=([\w-]+)")
+
 router = APIRouter(prefix="/practice")
 
 
@@ -60,12 +99,22 @@ async def get_sentence_by_id(
     )
 
 
+def _recent_sentence_ids(service: PracticeService, user: User, exclude_recent: bool) -> set[int]:
+    if not exclude_recent:
+        return set()
+    return service.get_recent_sentence_ids(user.user_id, settings.RANDOM_SENTENCE_EXCLUDE_RECENT)
+
+
 @router.get("/sentences/random/any", response_model=ResponseModel[SentenceResponse])
 async def get_random_sentence(
     difficulty: Optional[str] = Query(
         None, 
         description="Độ khó: beginner, intermediate, advanced"
     ),
+    exclude_recent: bool = Query(
+        False,
+        description="Tránh các câu vừa luyện trong những lượt gần nhất"
+    ),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
@@ -73,12 +122,15 @@ async def get_random_sentence(
     
     Args:
         difficulty: Độ khó (optional) - beginner, intermediate, advanced
+        exclude_recent: Tránh các câu user vừa luyện (optional)
         
     Returns:
         ResponseModel chứa câu ngẫu nhiên
     """
     service = PracticeService(db)
-    sentence = service.get_random_sentence(difficulty)
+    # Index rebuilds and the lookups hit the database: keep them off the event loop
+    exclude_ids = await run_in_threadpool(_recent_sentence_ids, service, current_user, exclude_recent)
+    sentence = await run_in_threadpool(service.get_random_sentence, difficulty, exclude_ids)
     
     if not sentence:
         raise HTTPException(
@@ -100,6 +152,10 @@ async def get_random_sentence_by_topic(
         None,
         description="Độ khó: beginner, intermediate, advanced"
     ),
+    exclude_recent: bool = Query(
+        False,
+        description="Tránh các câu vừa luyện trong những lượt gần nhất"
+    ),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
@@ -108,12 +164,16 @@ async def get_random_sentence_by_topic(
     Args:
         topic: Chủ đề (required)
         difficulty: Độ khó (optional)
+        exclude_recent: Tránh các câu user vừa luyện (optional)
         
     Returns:
         ResponseModel chứa câu ngẫu nhiên theo topic
     """
     service = PracticeService(db)
-    sentence = service.get_random_sentence_by_topic(topic, difficulty)
+    exclude_ids = await run_in_threadpool(_recent_sentence_ids, service, current_user, exclude_recent)
+    sentence = await run_in_threadpool(
+        service.get_random_sentence_by_topic, topic, difficulty, exclude_ids
+    )
     
     if not sentence:
         raise HTTPException(
@@ -173,6 +233,49 @@ async def list_all_sentences(
     )
 
 
+def _is_not_modified(request: Request, entry: CachedAudio) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = [tag.strip() for tag in if_none_match.split(",")]
+        return "*" in tags or entry.etag in tags or f"W/{entry.etag}" in tags
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            return parsedate_to_datetime(entry.last_modified) <= parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+async def _serve_cached_drive_audio(file_id: str, request: Request) -> Response:
+    """Serve a Drive file from the local cache, downloading it once on a miss."""
+    try:
+        entry = await drive_audio_cache.get(file_id)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="file_id không hợp lệ",
+        )
+    except UpstreamError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+    except httpx.HTTPError as e:
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail=f"Lỗi khi tải audio: {str(e)}"
+        )
+    
+    headers = {
+        "ETag": entry.etag,
+        "Last-Modified": entry.last_modified,
+        "Cache-Control": "private, max-age=86400",
+    }
+    if _is_not_modified(request, entry):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    # FileResponse answers Range requests with 206 and uses the ASGI
+    # pathsend extension (zero-copy) when the server supports it
+    return FileResponse(entry.path, media_type=entry.media_type, headers=headers)
+
+
 @router.get("/audio/{file_id}")
 async def proxy_drive_audio(
     file_id: str,
@@ -182,16 +285,21 @@ async def proxy_drive_audio(
     """Proxy audio từ Google Drive để hỗ trợ streaming và seeking.
     
     Frontend gửi file_id từ trường audio_url về, 
-    backend sẽ stream audio từ Google Drive về client.
+    backend sẽ stream audio từ Google Drive về client. File được tải về
+    nguyên vẹn một lần và lưu vào cache trên đĩa (LRU, giới hạn
+    ``DRIVE_AUDIO_CACHE_MAX_BYTES``); các lần phát và tua sau đều được trả
+    từ đĩa, kèm ETag/Last-Modified.
     
     Args:
         file_id: Google Drive file ID từ audio_url
         
     Returns:
-        StreamingResponse với audio data
+        FileResponse từ cache trên đĩa (hoặc StreamingResponse khi tắt cache)
     """
-    DRIVE_BASE = "https://docs.google.com/uc?export=download"
-    drive_url = f"{DRIVE_BASE}&id={file_id}"
+    if settings.DRIVE_AUDIO_CACHE_ENABLED:
+        return await _serve_cached_drive_audio(file_id, request)
+    
+    drive_url = f"{settings.DRIVE_DOWNLOAD_URL}&id={file_id}"
     
     # Forward Range header if client sent it (supports seeking)
     headers = {}
@@ -199,47 +307,138 @@ async def proxy_drive_audio(
     if range_hdr:
         headers["Range"] = range_hdr
     
+    # Shared pooled client (follows Google's redirect to drive.usercontent...)
+    client = upstream_http.client
     try:
-        # Follow redirects (Google trả redirect → drive.usercontent...) and stream
-        resp = requests.get(
-            drive_url, 
-            headers=headers, 
-            stream=True, 
-            allow_redirects=True, 
-            timeout=30
+        resp = await client.send(client.build_request("GET", drive_url, headers=headers), stream=True)
+    except httpx.HTTPError as e:
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail=f"Lỗi khi tải audio: {str(e)}"
         )
-        
-        if resp.status_code not in (200, 206):
-            raise HTTPException(
-                status_code=resp.status_code,
-                detail=f"Không thể tải audio từ Google Drive (status {resp.status_code})"
-            )
-        
-        def iter_stream():
-            """Generator để stream audio chunks."""
-            for chunk in resp.iter_content(chunk_size=8192):
-                if chunk:
-                    yield chunk
-        
-        # Copy response headers từ Google Drive
-        response_headers = {}
-        for h in ("Content-Type", "Content-Length", "Content-Range", "Accept-Ranges"):
-            v = resp.headers.get(h)
-            if v:
-                response_headers[h] = v
-        
-        return StreamingResponse(
-            iter_stream(),
+    
+    if resp.status_code not in (200, 206):
+        await resp.aclose()
+        raise HTTPException(
             status_code=resp.status_code,
-            headers=response_headers,
-            media_type=resp.headers.get("Content-Type", "audio/mpeg")
+            detail=f"Không thể tải audio từ Google Drive (status {resp.status_code})"
         )
     
-    except requests.RequestException as e:
+    async def iter_stream():
+        """Stream audio chunks; the upstream response is closed even if the
+        client disconnects mid-playback."""
+        try:
+            async for chunk in resp.aiter_bytes(DRIVE_STREAM_CHUNK_SIZE):
+                yield chunk
+        except httpx.HTTPError as e:
+            logger.warning(f"Drive stream for {file_id} interrupted: {e}")
+        finally:
+            await resp.aclose()
+    
+    # Copy response headers từ Google Drive
+    response_headers = {}
+    for h in ("Content-Type", "Content-Length", "Content-Range", "Accept-Ranges"):
+        v = resp.headers.get(h)
+        if v:
+            response_headers[h] = v
+    
+    return StreamingResponse(
+        iter_stream(),
+        status_code=resp.status_code,
+        headers=response_headers,
+        media_type=resp.headers.get("Content-Type", "audio/mpeg"),
+        # Runs after the response even when the client went away and the
+        # stream generator was abandoned
+        background=BackgroundTask(resp.aclose),
+    )
+
+
+@router.get("/sentences/{sentence_id}/audio")
+async def get_reference_audio(
+    sentence_id: int,
+    request: Request,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """Phát audio mẫu của câu luyện tập từ kho audio cục bộ.
+    
+    File được tạo trước bằng ``python -m app.scripts.generate_reference_audio``
+    và trả thẳng từ đĩa (hỗ trợ Range để tua). Câu chưa có audio cục bộ
+    được proxy từ Google Drive như ``GET /practice/audio/{file_id}``.
+    
+    Args:
+        sentence_id: ID của câu luyện tập
+        
+    Returns:
+        FileResponse (hoặc StreamingResponse khi lấy từ Google Drive)
+    """
+    path = reference_audio_store.get(sentence_id)
+    if path is not None:
+        return FileResponse(
+            path,
+            media_type=reference_audio_store.media_type,
+            headers={"Cache-Control": "private, max-age=86400"},
+        )
+    
+    sentence = PracticeService(db).get_sentence_by_id(sentence_id)
+    if not sentence:
         raise HTTPException(
-            status_code=status.HTTP_502_BAD_GATEWAY,
-            detail=f"Lỗi khi tải audio: {str(e)}"
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Không tìm thấy câu với ID {sentence_id}",
+        )
+    match = DRIVE_FILE_ID_PATTERN.search(sentence.audio_url or "")
+    if not match:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Câu {sentence_id} chưa có audio mẫu",
+        )
+    logger.info(f"Reference audio for sentence {sentence_id} not generated, using Google Drive")
+    return await proxy_drive_audio(match.group(1) or match.group(2), request, current_user)
+
+
+@router.get("/attempts/{attempt_id}/audio")
+async def get_attempt_audio(
+    attempt_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """Phát lại bản ghi âm của một lượt luyện tập.
+    
+    Với kho S3 trả về redirect tới presigned URL (audio không đi qua API);
+    với kho cục bộ trả file trực tiếp (hỗ trợ Range).
+    
+    Args:
+        attempt_id: ID của lượt luyện tập
+        
+    Returns:
+        RedirectResponse (S3) hoặc FileResponse (cục bộ)
+    """
+    attempt = PracticeService(db).get_user_attempt(attempt_id, current_user.user_id)
+    if not attempt or not attempt.audio_file_path:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Không tìm thấy bản ghi âm của lượt luyện tập {attempt_id}",
+        )
+    key = attempt.audio_file_path
+    try:
+        url = recording_store.url_for(key)
+        path = None if url else recording_store.path_for(key)
+    except ValueError:
+        # Recordings saved before the content-addressed store have no valid key
+        url = path = None
+    if url is not None:
+        return RedirectResponse(url, status_code=status.HTTP_307_TEMPORARY_REDIRECT)
+    if path is None or not path.is_file():
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Bản ghi âm của lượt luyện tập {attempt_id} không còn được lưu",
         )
+    return FileResponse(
+        path,
+        media_type=recording_store.media_type(key),
+        # Content-addressed: the bytes behind a key never change
+        headers={"Cache-Control": "private, max-age=31536000, immutable"},
+    )
 
 
 @router.post("/evaluate", response_model=ResponseModel[EvaluationResponse])
@@ -247,16 +446,16 @@ async def evaluate_pronunciation(
     request: EvaluationRequest,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
+    _admission: None = Depends(admit_evaluation),
 ):
     """Chấm điểm phát âm của học sinh.
     
     Flow:
     1. Nhận audio (base64) và sentence_id từ frontend
-    2. Lưu audio file và lấy thông tin audio
-    3. Chuyển audio thành text (speech-to-text)
-    4. Gửi cho Gemini AI để đánh giá và chấm điểm
-    5. Lưu kết quả vào database
-    6. Trả về feedback chi tiết
+    2. Decode audio một lần trong bộ nhớ
+    3. Gửi cho Gemini AI để đánh giá và chấm điểm
+    4. Lưu file audio và kết quả vào database
+    5. Trả về feedback chi tiết
     
     Args:
         request: EvaluationRequest chứa sentence_id và audio_data (base64)
@@ -265,117 +464,427 @@ async def evaluate_pronunciation(
         ResponseModel chứa kết quả đánh giá chi tiết
     """
     try:
-        # 1. Get the target sentence from database
-        practice_service = PracticeService(db)
-        sentence = practice_service.get_sentence_by_id(request.sentence_id)
+        evaluation_service = EvaluationService(db)
+        response_data = await evaluation_service.evaluate(
+            current_user.user_id,
+            request.sentence_id,
+            request.audio_data,
+        )
         
-        if not sentence:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Không tìm thấy câu với ID {request.sentence_id}"
-            )
+        return ResponseModel(
+            success=True,
+            message="Đánh giá phát âm thành công",
+            data=response_data
+        )
         
-        target_sentence = sentence.sentence_text
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Unexpected error in evaluate_pronunciation: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Lỗi không xác định: {str(e)}"
+        )
+
+
+@router.post("/evaluate/batch", response_model=ResponseModel[BatchEvaluationResponse])
+async def evaluate_pronunciation_batch(
+    request: BatchEvaluationRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """Chấm điểm nhiều câu của một bài học trong một request.
+    
+    Các bản ghi được chấm song song và tất cả attempt thành công được lưu
+    trong cùng một transaction. Lỗi của một câu không làm hỏng cả batch:
+    mỗi phần tử trong ``results`` có ``success`` cùng ``result`` hoặc
+    ``error``/``error_status`` (cùng mã lỗi như ``POST /practice/evaluate``).
+    
+    Mỗi câu tính như một lượt chấm trong giới hạn theo phút của user, và
+    chiếm một slot chấm điểm toàn hệ thống trong lúc được chấm.
+    
+    Args:
+        request: BatchEvaluationRequest chứa danh sách (sentence_id, audio_data)
         
-        # 2. Save audio file
-        audio_service = AudioService()
+    Returns:
+        ResponseModel chứa kết quả từng câu theo thứ tự của request
+    """
+    if len(request.items) > settings.EVALUATION_BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Tối đa {settings.EVALUATION_BATCH_MAX_ITEMS} câu mỗi lần chấm",
+        )
+    if len(request.items) > evaluation_admission.user_burst:
+        # The per-user bucket can never hold this many tokens
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Tối đa {evaluation_admission.user_burst} câu mỗi lần chấm",
+        )
+    try:
+        await evaluation_admission.acquire(
+            current_user.user_id, cost=len(request.items), hold_global=False
+        )
+    except RateLimitTimeout as e:
+        raise admission_error(e) from None
+    
+    try:
+        evaluation_service = EvaluationService(db)
+        response_data = await evaluation_service.evaluate_batch(
+            current_user.user_id,
+            [(item.sentence_id, item.audio_data) for item in request.items],
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Unexpected error in evaluate_pronunciation_batch: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Lỗi không xác định: {str(e)}"
+        )
+    finally:
+        evaluation_admission.release(current_user.user_id, hold_global=False)
+    
+    return ResponseModel(
+        success=response_data.failed == 0,
+        message=f"Đã chấm {response_data.succeeded}/{response_data.total} câu",
+        data=response_data
+    )
+
+
+def _sse_event(event: str, value: Any) -> str:
+    if isinstance(value, BaseModel):
+        payload = value.model_dump_json()
+    else:
+        payload = json.dumps(value, ensure_ascii=False)
+    return f"event: {event}\ndata: {payload}\n\n"
+
+
+@router.post("/evaluate/stream")
+async def evaluate_pronunciation_stream(
+    request: EvaluationRequest,
+    http_request: Request,
+    current_user: User = Depends(get_current_user),
+):
+    """Chấm điểm phát âm, trả kết quả từng phần qua Server-Sent Events.
+    
+    Cùng input với ``POST /practice/evaluate``. Mỗi phần của kết quả được gửi
+    ngay khi AI tạo xong, dưới dạng event mang tên của field
+    (``overall_score``, ``score_label``, ``transcription``, ``breakdown``,
+    ``transcription_comparison``, ``strengths``, ``improvements``, ...).
+    Event cuối là ``result`` chứa ``EvaluationResponse`` đầy đủ (đã lưu vào
+    database), hoặc ``error`` với ``status_code`` và ``detail``.
+    
+    Lỗi xảy ra trước phần đầu tiên (câu không tồn tại, audio lỗi, AI quá tải)
+    được trả về như HTTP error thông thường.
+    
+    Args:
+        request: EvaluationRequest chứa sentence_id và audio_data (base64)
+        
+    Returns:
+        StreamingResponse dạng text/event-stream
+    """
+    # The stream outlives this handler, so it holds its own admission and
+    # owns its database session
+    try:
+        await evaluation_admission.acquire(current_user.user_id)
+    except RateLimitTimeout as e:
+        raise admission_error(e) from None
+    db = SessionLocal()
+    events = EvaluationService(db).evaluate_stream(
+        current_user.user_id,
+        request.sentence_id,
+        request.audio_data,
+    )
+    
+    async def close() -> None:
         try:
-            audio_file_path, audio_duration = audio_service.save_audio_file(
-                request.audio_data,
-                current_user.user_id,
-                request.sentence_id
-            )
-        except Exception as e:
-            logger.error(f"Error saving audio: {e}")
+            await events.aclose()
+            await run_in_threadpool(db.close)
+        finally:
+            evaluation_admission.release(current_user.user_id)
+    
+    try:
+        first_event = await anext(events)
+    except Exception as e:
+        await close()
+        if isinstance(e, HTTPException):
+            raise
+        logger.error(f"Unexpected error in evaluate_pronunciation_stream: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Lỗi không xác định: {str(e)}"
+        )
+    
+    async def event_stream():
+        try:
+            yield _sse_event(*first_event)
+            async for event, value in events:
+                yield _sse_event(event, value)
+                if await http_request.is_disconnected():
+                    logger.info("Client disconnected from evaluation stream")
+                    break
+        except HTTPException as e:
+            yield _sse_event("error", {"status_code": e.status_code, "detail": e.detail})
+        except Exception as e:  # noqa: BLE001
+            logger.error(f"Unexpected error in evaluate_pronunciation_stream: {e}")
+            yield _sse_event("error", {"status_code": 500, "detail": f"Lỗi không xác định: {str(e)}"})
+        finally:
+            await close()
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+# Content types accepted as a raw (non-multipart) recording body
+RAW_AUDIO_CONTENT_TYPES = ("application/octet-stream", "audio/")
+
+
+@router.post("/evaluate/upload", response_model=ResponseModel[EvaluationResponse])
+async def evaluate_pronunciation_upload(
+    request: Request,
+    sentence_id: Optional[int] = Query(
+        None,
+        description="ID của câu luyện tập (bắt buộc khi gửi application/octet-stream)"
+    ),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+    _admission: None = Depends(admit_evaluation),
+):
+    """Chấm điểm phát âm từ file âm thanh nhị phân (không cần base64).
+    
+    Hỗ trợ hai cách gửi:
+    - ``multipart/form-data`` với field ``audio_file`` và ``sentence_id``
+    - ``application/octet-stream`` (hoặc ``audio/*``) với body là audio thô
+      và ``sentence_id`` trên query string
+    
+    Body được đọc theo từng chunk vào file tạm (giữ trong RAM khi nhỏ, tự
+    chuyển xuống đĩa khi lớn) rồi đưa vào cùng pipeline với ``/evaluate``.
+    Request vượt ``MAX_UPLOAD_SIZE`` bị từ chối ngay khi đọc tới giới hạn
+    (hoặc ngay từ ``Content-Length``), không phải đợi nhận hết body. Lưu ý:
+    audio sau khi decode vẫn được giữ dạng PCM trong RAM để chấm điểm.
+    
+    Returns:
+        ResponseModel chứa kết quả đánh giá chi tiết
+    """
+    content_type = request.headers.get("content-type", "").lower()
+    
+    async with AsyncExitStack() as cleanup:
+        try:
+            if content_type.startswith("multipart/form-data"):
+                form = await parse_multipart(
+                    request.headers, request.stream(), settings.MAX_UPLOAD_SIZE
+                )
+                cleanup.push_async_callback(form.close)
+                upload = form.get("audio_file")
+                if not isinstance(upload, UploadFile):
+                    raise HTTPException(
+                        status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                        detail="Thiếu file âm thanh trong field 'audio_file'",
+                    )
+                if upload.size is not None and upload.size > settings.MAX_UPLOAD_SIZE:
+                    raise UploadTooLargeError()
+                form_sentence_id = form.get("sentence_id")
+                if form_sentence_id is not None:
+                    try:
+                        sentence_id = int(form_sentence_id)
+                    except ValueError:
+                        raise HTTPException(
+                            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                            detail="sentence_id phải là số nguyên",
+                        )
+                # The parser already spooled the file; read it in place
+                audio_size = upload.size or 0
+                audio_input = upload.file
+            elif content_type.startswith(RAW_AUDIO_CONTENT_TYPES):
+                check_content_length(request.headers, settings.MAX_UPLOAD_SIZE)
+                spool = await spool_stream(
+                    request.stream(),
+                    max_memory=settings.UPLOAD_SPOOL_MAX_MEMORY,
+                    max_size=settings.MAX_UPLOAD_SIZE,
+                    discard=schedule_local_file_cleanup,
+                )
+                cleanup.callback(spool.close)
+                audio_size = spool.size
+                audio_input = spool.as_audio_input()
+            else:
+                raise HTTPException(
+                    status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+                    detail="Chỉ hỗ trợ multipart/form-data, application/octet-stream hoặc audio/*",
+                )
+        except UploadTooLargeError:
             raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Lỗi khi lưu file âm thanh: {str(e)}"
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"File âm thanh vượt quá {settings.MAX_UPLOAD_SIZE // (1024 * 1024)}MB",
             )
+        except MultiPartException as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=e.message)
         
-        # 3. Get audio metadata
-        audio_metadata = audio_service.get_audio_metadata(audio_file_path)
-        
-        # 4. Evaluate pronunciation using Gemini AI (directly with audio file)
-        gemini_service = GeminiService()
-        try:
-            evaluation_result = gemini_service.evaluate_pronunciation_with_audio(
-                target_sentence=target_sentence,
-                audio_file_path=audio_file_path
+        if sentence_id is None:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="Thiếu sentence_id",
             )
-        except Exception as e:
-            logger.error(f"Error evaluating pronunciation: {e}")
-            audio_service.cleanup_audio_file(audio_file_path)
+        if audio_size == 0:
             raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Lỗi khi đánh giá phát âm: {str(e)}"
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="File âm thanh rỗng",
             )
         
-        # 5. Save attempt to database
         try:
-            # Get transcription from evaluation result
-            transcription = evaluation_result.get("transcription", "")
-            
-            attempt = practice_service.save_attempt(
-                user_id=current_user.user_id,
-                sentence_id=request.sentence_id,
-                target_sentence=target_sentence,
-                overall_score=evaluation_result.get("overall_score", 0),
-                phoneme_accuracy=evaluation_result.get("breakdown", {}).get("phoneme_accuracy"),
-                word_stress=evaluation_result.get("breakdown", {}).get("word_stress"),
-                intonation=evaluation_result.get("breakdown", {}).get("intonation"),
-                fluency=evaluation_result.get("breakdown", {}).get("fluency"),
-                clarity=evaluation_result.get("breakdown", {}).get("clarity"),
-                audio_file_path=audio_file_path,
-                audio_duration=audio_duration,
-                transcription=transcription,
-                ai_feedback=evaluation_result
+            evaluation_service = EvaluationService(db)
+            response_data = await evaluation_service.evaluate(
+                current_user.user_id,
+                sentence_id,
+                audio_input,
             )
+        except HTTPException:
+            raise
         except Exception as e:
-            logger.error(f"Error saving attempt: {e}")
-            audio_service.cleanup_audio_file(audio_file_path)
+            logger.error(f"Unexpected error in evaluate_pronunciation_upload: {e}")
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Lỗi khi lưu kết quả: {str(e)}"
+                detail=f"Lỗi không xác định: {str(e)}"
             )
-        
-        # 6. Prepare response
-        response_data = EvaluationResponse(
-            attempt_id=attempt.attempt_id,
-            sentence_id=request.sentence_id,
-            target_sentence=target_sentence,
-            transcription=evaluation_result.get("transcription", ""),
-            overall_score=evaluation_result.get("overall_score", 0),
-            score_label=evaluation_result.get("score_label", ""),
-            breakdown=ScoreBreakdown(**evaluation_result.get("breakdown", {})),
-            transcription_comparison=[
-                WordComparison(**comp) 
-                for comp in evaluation_result.get("transcription_comparison", [])
-            ],
-            strengths=evaluation_result.get("strengths", []),
-            improvements=[
-                ImprovementSuggestion(**imp) 
-                for imp in evaluation_result.get("improvements", [])
-            ],
-            suggestions=evaluation_result.get("suggestions", []),
-            focus_phonemes=[
-                FocusPhoneme(**phoneme) 
-                for phoneme in evaluation_result.get("focus_phonemes", [])
-            ],
-            encouragement=evaluation_result.get("encouragement", ""),
-            practiced_at=attempt.created_at
+    
+    return ResponseModel(
+        success=True,
+        message="Đánh giá phát âm thành công",
+        data=response_data
+    )
+
+
+def _job_to_response(job: EvaluationJob) -> EvaluationJobResponse:
+    return EvaluationJobResponse.model_validate(job)
+
+
+def _get_job_or_404(job_id: str, user: User) -> EvaluationJob:
+    job = evaluation_job_queue.get(job_id, user.user_id)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Không tìm thấy job {job_id}",
         )
+    return job
+
+
+@router.post(
+    "/evaluate/jobs",
+    response_model=ResponseModel[EvaluationJobResponse],
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def submit_evaluation_job(
+    request: EvaluationRequest,
+    current_user: User = Depends(get_current_user),
+):
+    """Đưa bài ghi âm vào hàng đợi chấm điểm và trả về job_id ngay lập tức.
+    
+    Client dùng ``GET /practice/evaluate/jobs/{job_id}`` để poll kết quả
+    hoặc ``GET /practice/evaluate/jobs/{job_id}/events`` để nhận SSE.
+    
+    Job chịu cùng giới hạn theo user như ``POST /practice/evaluate``: job
+    đang chờ hoặc đang chấm được tính vào số lượt đồng thời của user cho
+    đến khi hoàn tất.
+    
+    Args:
+        request: EvaluationRequest chứa sentence_id và audio_data (base64)
         
-        return ResponseModel(
-            success=True,
-            message="Đánh giá phát âm thành công",
-            data=response_data
+    Returns:
+        ResponseModel chứa trạng thái job vừa tạo
+    """
+    user_id = current_user.user_id
+    try:
+        # The job workers bound global concurrency; only user limits apply here
+        await evaluation_admission.acquire(user_id, hold_global=False)
+    except RateLimitTimeout as e:
+        raise admission_error(e) from None
+    
+    try:
+        job = evaluation_job_queue.submit(
+            user_id,
+            request.sentence_id,
+            request.audio_data,
+            on_finish=lambda: evaluation_admission.release(user_id, hold_global=False),
         )
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Unexpected error in evaluate_pronunciation: {e}")
+    except QueueFullError:
+        evaluation_admission.release(user_id, hold_global=False)
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Lỗi không xác định: {str(e)}"
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Hệ thống đang quá tải, vui lòng thử lại sau",
+            headers={"Retry-After": "5"},
         )
+    
+    return ResponseModel(
+        success=True,
+        message="Đã nhận bài, đang chờ chấm điểm",
+        data=_job_to_response(job),
+    )
+
+
+@router.get("/evaluate/jobs/{job_id}", response_model=ResponseModel[EvaluationJobResponse])
+async def get_evaluation_job(
+    job_id: str,
+    current_user: User = Depends(get_current_user),
+):
+    """Lấy trạng thái và kết quả của một job chấm điểm.
+    
+    Args:
+        job_id: ID của job trả về từ ``POST /practice/evaluate/jobs``
+        
+    Returns:
+        ResponseModel chứa trạng thái job (và kết quả nếu đã xong)
+    """
+    job = _get_job_or_404(job_id, current_user)
+    return ResponseModel(
+        success=True,
+        message="Lấy trạng thái job thành công",
+        data=_job_to_response(job),
+    )
+
+
+@router.get("/evaluate/jobs/{job_id}/events")
+async def stream_evaluation_job(
+    job_id: str,
+    request: Request,
+    current_user: User = Depends(get_current_user),
+):
+    """Theo dõi job chấm điểm qua Server-Sent Events.
+    
+    Gửi event ``status`` mỗi khi trạng thái thay đổi, ``: keep-alive``
+    comment định kỳ, và kết thúc bằng event ``result`` (hoặc ``error``)
+    chứa cùng payload như ``GET /practice/evaluate/jobs/{job_id}``.
+    
+    Args:
+        job_id: ID của job cần theo dõi
+        
+    Returns:
+        StreamingResponse dạng text/event-stream
+    """
+    job = _get_job_or_404(job_id, current_user)
+    
+    async def event_stream():
+        last_status = None
+        while True:
+            if job.status != last_status:
+                last_status = job.status
+                event = "status"
+                if job.status == JOB_SUCCEEDED:
+                    event = "result"
+                elif job.status == JOB_FAILED:
+                    event = "error"
+                payload = _job_to_response(job).model_dump_json()
+                yield f"event: {event}\ndata: {payload}\n\n"
+            if job.is_finished or await request.is_disconnected():
+                break
+            try:
+                await asyncio.wait_for(job.done.wait(), timeout=SSE_KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
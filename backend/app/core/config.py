@@ -23,6 +23,153 @@ class Settings(BaseSettings):
 
     # Gemini AI Configuration (optional - only needed for pronunciation evaluation)
     GEMINI_API_KEY: Optional[str] = None
+    # Audio up to this size is sent inline; larger clips use the file API
+    GEMINI_INLINE_AUDIO_MAX_BYTES: int = 8 * 1024 * 1024
+    # Client-side limits matching the API quota; excess calls queue briefly
+    GEMINI_MAX_CONCURRENCY: int = 8
+    GEMINI_REQUESTS_PER_MINUTE: int = 60
+    GEMINI_RATE_BURST: int = 5
+    GEMINI_QUEUE_TIMEOUT_SECONDS: float = 10.0
+    # Retries for transient errors (5xx, 429, timeouts) with jittered backoff
+    GEMINI_RETRY_ATTEMPTS: int = 3
+    GEMINI_RETRY_BASE_DELAY_SECONDS: float = 0.5
+    GEMINI_RETRY_MAX_DELAY_SECONDS: float = 8.0
+    # Context caching of the static evaluation prompt (recreated before expiry)
+    GEMINI_CONTEXT_CACHE_ENABLED: bool = True
+    GEMINI_CONTEXT_CACHE_TTL_SECONDS: int = 3600
+    GEMINI_CONTEXT_CACHE_MIN_TOKENS: int = 1024   # explicit caching minimum of the model (2.5 Flash)
+    # Total model calls allowed when the answer fails schema validation
+    GEMINI_PARSE_ATTEMPTS: int = 2
+    # Hedging: start a second attempt when a call outlives the observed p95
+    GEMINI_HEDGE_ENABLED: bool = False
+    GEMINI_HEDGE_MIN_SAMPLES: int = 20
+    # Circuit breaker: fail fast with 503 while the upstream error rate is high
+    GEMINI_CIRCUIT_FAILURE_RATE: float = 0.5
+    GEMINI_CIRCUIT_MIN_CALLS: int = 10
+    GEMINI_CIRCUIT_WINDOW_SECONDS: float = 60.0
+    GEMINI_CIRCUIT_OPEN_SECONDS: float = 30.0
+
+    # Random sentence selection from an in-memory id index
+    SENTENCE_INDEX_TTL_SECONDS: int = 300   # rebuild at least this often (changes from other nodes)
+    RANDOM_SENTENCE_EXCLUDE_RECENT: int = 20   # attempts considered by exclude_recent
+
+    # Evaluation job queue (POST /practice/evaluate/jobs); jobs live in process
+    # memory, so run the API as a single worker process
+    EVALUATION_WORKERS: int = 4
+    EVALUATION_QUEUE_SIZE: int = 100
+    EVALUATION_JOB_TTL_SECONDS: int = 900   # keep finished results for 15 minutes
+
+    # Admission control for evaluation endpoints (429 + Retry-After when exceeded)
+    ADMISSION_USER_MAX_CONCURRENCY: int = 2   # evaluations in flight per user
+    ADMISSION_USER_REQUESTS_PER_MINUTE: int = 20
+    ADMISSION_USER_BURST: int = 20   # at least EVALUATION_BATCH_MAX_ITEMS (a batch costs one token per item)
+    ADMISSION_MAX_IN_FLIGHT: int = 32   # evaluations in flight across all users
+    ADMISSION_MAX_WAITING: int = 64   # admitted requests waiting for a global slot
+    ADMISSION_QUEUE_TIMEOUT_SECONDS: float = 10.0
+
+    # Background cleanup tasks (remote/local file deletes) off the request path
+    BACKGROUND_TASK_WORKERS: int = 2
+    BACKGROUND_TASK_QUEUE_SIZE: int = 1000   # overflow is recorded for the sweeper
+    BACKGROUND_TASK_MAX_ATTEMPTS: int = 3
+    BACKGROUND_TASK_RETRY_BASE_DELAY_SECONDS: float = 1.0
+    BACKGROUND_SWEEP_INTERVAL_SECONDS: int = 600   # orphan sweeper period
+    BACKGROUND_ORPHAN_MIN_AGE_SECONDS: int = 3600   # leftovers older than this are orphans
+    LOG_QUEUE_ENABLED: bool = True   # hand log records to a listener thread
+
+    # Batch evaluation (POST /practice/evaluate/batch)
+    EVALUATION_BATCH_MAX_ITEMS: int = 20
+    EVALUATION_BATCH_CONCURRENCY: int = 4   # items of one batch scored in parallel
+
+    # Binary audio uploads (POST /practice/evaluate/upload)
+    MAX_UPLOAD_SIZE: int = 10 * 1024 * 1024   # 10MB
+    UPLOAD_SPOOL_MAX_MEMORY: int = 1024 * 1024   # larger bodies spill to disk
+
+    # Audio pipeline
+    SAVE_ATTEMPT_AUDIO: bool = True   # write each attempt's recording to disk
+    RECORDING_STORAGE_DIR: str = "recordings"   # content-addressed, sharded store
+    RECORDING_FORMAT: str = "flac"   # wav | flac | opus (falls back to wav without ffmpeg)
+    RECORDING_GC_ENABLED: bool = True
+    RECORDING_GC_INTERVAL_SECONDS: int = 3600
+    RECORDING_RETENTION_DAYS: float = 90   # 0 keeps recordings regardless of age
+    RECORDING_QUOTA_BYTES: int = 5 * 1024 * 1024 * 1024   # 5GB; 0 disables the quota
+    RECORDING_STORAGE_BACKEND: str = "local"   # local | s3 (required for multi-node deployments)
+    # S3-compatible object storage (AWS S3, MinIO) for RECORDING_STORAGE_BACKEND=s3
+    S3_BUCKET: Optional[str] = None
+    S3_PREFIX: str = "recordings/"
+    S3_ENDPOINT_URL: Optional[str] = None   # e.g. http://minio:9000; None for AWS
+    S3_PUBLIC_ENDPOINT_URL: Optional[str] = None   # host used in presigned URLs, if different
+    S3_REGION: str = "us-east-1"
+    S3_ACCESS_KEY_ID: Optional[str] = None   # None uses the default AWS credential chain
+    S3_SECRET_ACCESS_KEY: Optional[str] = None
+    S3_MAX_POOL_CONNECTIONS: int = 20
+    S3_PRESIGNED_URL_EXPIRES_SECONDS: int = 900
+    AUDIO_MODEL_SAMPLE_RATE: int = 16000   # resample before sending to the model
+    AUDIO_MODEL_CHANNELS: int = 1   # downmix to mono
+    AUDIO_MODEL_FORMAT: str = "flac"   # wav | flac | opus
+    AUDIO_MODEL_OPUS_BITRATE: str = "24k"
+
+    # Silence trimming / voice-activity detection before evaluation
+    VAD_ENABLED: bool = True
+    VAD_FRAME_MS: int = 20
+    VAD_SILENCE_THRESHOLD_DB: float = -50.0   # frames quieter than this are silence
+    VAD_DYNAMIC_RANGE_DB: float = 40.0   # ... as are frames this far below the peak
+    VAD_PADDING_MS: int = 150   # keep this much around detected speech
+    VAD_MAX_PAUSE_MS: int = 600   # internal pauses are shortened to this
+
+    # Pre-flight gate: reject unusable recordings (422) before the model call
+    AUDIO_PREFLIGHT_ENABLED: bool = True
+    AUDIO_PREFLIGHT_MIN_DURATION_SECONDS: float = 0.3
+    AUDIO_PREFLIGHT_MIN_SECONDS_PER_WORD: float = 0.12   # speech shorter than this per word is too short
+    AUDIO_PREFLIGHT_MAX_BASE_SECONDS: float = 10.0   # allowed length is base + per-word allowance
+    AUDIO_PREFLIGHT_MAX_SECONDS_PER_WORD: float = 2.0
+    AUDIO_PREFLIGHT_MIN_RMS_DB: float = -55.0   # quieter recordings are treated as silent
+    AUDIO_PREFLIGHT_MIN_SPEECH_RATIO: float = 0.05   # minimum share of speech frames
+    AUDIO_PREFLIGHT_CLIP_LEVEL: float = 0.99   # |sample| at or above this is clipped
+    AUDIO_PREFLIGHT_MAX_CLIPPED_RATIO: float = 0.02   # maximum share of clipped samples
+
+    # Evaluation result cache (duplicate submissions of the same recording)
+    EVALUATION_CACHE_BACKEND: str = "memory"   # memory | sqlite | none
+    EVALUATION_CACHE_MAX_ENTRIES: int = 1024
+    EVALUATION_CACHE_TTL_SECONDS: int = 3600
+    EVALUATION_CACHE_SQLITE_PATH: str = "evaluation_cache.sqlite3"
+
+    # IPA transcription (eng_to_ipa first, model only for unknown words)
+    IPA_CACHE_PATH: str = "ipa_cache.sqlite3"   # persistent word -> IPA cache; empty disables
+
+    # Local reference audio (served from disk instead of Google Drive)
+    REFERENCE_AUDIO_DIR: str = "reference_audio"
+    REFERENCE_AUDIO_SYNTHESIZER: str = "gtts"   # gtts | fake
+    REFERENCE_AUDIO_LANG: str = "en"
+    REFERENCE_AUDIO_TLD: str = "com"   # gTTS accent: com (US), co.uk (UK), ...
+
+    # Google Drive download endpoint used by the audio proxy (overridable
+    # so load tests can point it at a local stand-in)
+    DRIVE_DOWNLOAD_URL: str = "https://docs.google.com/uc?export=download"
+    # Shared async HTTP client for upstream calls (HTTP/2 when h2 is installed)
+    HTTP_CLIENT_HTTP2: bool = True
+    HTTP_CLIENT_CONNECT_TIMEOUT_SECONDS: float = 5.0
+    HTTP_CLIENT_READ_TIMEOUT_SECONDS: float = 30.0
+    HTTP_CLIENT_POOL_TIMEOUT_SECONDS: float = 5.0   # wait for a free pooled connection
+    HTTP_CLIENT_MAX_CONNECTIONS: int = 100
+    HTTP_CLIENT_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_CLIENT_KEEPALIVE_EXPIRY_SECONDS: float = 30.0
+    # On-disk LRU cache of proxied Drive audio
+    DRIVE_AUDIO_CACHE_ENABLED: bool = True
+    DRIVE_AUDIO_CACHE_DIR: str = "drive_audio_cache"
+    DRIVE_AUDIO_CACHE_MAX_BYTES: int = 512 * 1024 * 1024   # 512MB in total for all workers sharing the dir
+
+    # Evaluator backend: "gemini" (production) or "fake" (offline load tests)
+    EVALUATOR_BACKEND: str = "gemini"
+    # Fake evaluator: latency distribution (fixed|uniform|normal|lognormal),
+    # spread is the relative width (sigma for lognormal), rates are 0-1
+    FAKE_EVALUATOR_LATENCY_MS: float = 1500.0
+    FAKE_EVALUATOR_LATENCY_DISTRIBUTION: str = "lognormal"
+    FAKE_EVALUATOR_LATENCY_SPREAD: float = 0.4
+    FAKE_EVALUATOR_ERROR_RATE: float = 0.0
+    FAKE_EVALUATOR_UNAVAILABLE_RATE: float = 0.0
+    # Optional JSON file with a list of canned PronunciationEvaluation objects
+    FAKE_EVALUATOR_RESPONSES_PATH: Optional[str] = None
+    FAKE_EVALUATOR_SEED: Optional[int] = None
 
     # Server Configuration
     HOST: str = "0.0.0.0"
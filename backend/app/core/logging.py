@@ -1,6 +1,21 @@
 """Logging configuration utilities."""
 
 import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+# Name given to the stream handlers created here, so they can be found again
+_DEFAULT_HANDLER_NAME = "app-default"
+
+
+def _default_handler() -> logging.Handler:
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    handler.set_name(_DEFAULT_HANDLER_NAME)
+    return handler
 
 
 def get_logger(name: str) -> logging.Logger:
@@ -8,11 +23,76 @@ def get_logger(name: str) -> logging.Logger:
 
     logger = logging.getLogger(name)
     if not logger.handlers:
-        handler = logging.StreamHandler()
-        formatter = logging.Formatter(
-            "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-        )
-        handler.setFormatter(formatter)
-        logger.addHandler(handler)
         logger.setLevel(logging.INFO)
+        # With queue logging on, records reach the queued root handler instead
+        if _queue_listener is None:
+            logger.addHandler(_default_handler())
     return logger
+
+
+_queue_listener: Optional[QueueListener] = None
+# Undo information for ``stop_queue_logging``
+_root_level: Optional[int] = None
+_detached_handlers: list[tuple[logging.Logger, logging.Handler]] = []
+
+
+def start_queue_logging() -> None:
+    """Route log output through a queue drained by a listener thread.
+
+    Request handlers then only enqueue log records; formatting and writing
+    to the (possibly slow) handlers happens off the event loop.
+
+    The app's modules log through ``logging.getLogger(__name__)`` without
+    configuring the root logger, so when it has no handlers a default stream
+    handler (``LOG_FORMAT``, INFO) is installed behind the queue. Stream
+    handlers attached by ``get_logger`` are detached and their records
+    propagate to the queued root handlers instead.
+    """
+    global _queue_listener, _root_level
+    if _queue_listener is not None:
+        return
+    root = logging.getLogger()
+    handlers = list(root.handlers)
+    for handler in handlers:
+        root.removeHandler(handler)
+    if not handlers:
+        handlers = [_default_handler()]
+        _root_level = root.level
+        if root.level > logging.INFO:
+            root.setLevel(logging.INFO)
+
+    for logger in list(logging.root.manager.loggerDict.values()):
+        if not isinstance(logger, logging.Logger):
+            continue
+        for handler in list(logger.handlers):
+            if handler.get_name() == _DEFAULT_HANDLER_NAME:
+                logger.removeHandler(handler)
+                _detached_handlers.append((logger, handler))
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    root.addHandler(QueueHandler(log_queue))
+    _queue_listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _queue_listener.start()
+
+
+def stop_queue_logging() -> None:
+    """Flush queued records and restore the original handlers."""
+    global _queue_listener, _root_level
+    if _queue_listener is None:
+        return
+    _queue_listener.stop()
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        if isinstance(handler, QueueHandler):
+            root.removeHandler(handler)
+    if _root_level is None:
+        for handler in _queue_listener.handlers:
+            root.addHandler(handler)
+    else:
+        # The default handler only existed for the queue
+        root.setLevel(_root_level)
+        _root_level = None
+    for logger, handler in _detached_handlers:
+        logger.addHandler(handler)
+    _detached_handlers.clear()
+    _queue_listener = None
@@ -0,0 +1,61 @@
+"""In-process counters and gauges exposed via ``GET /metrics``."""
+
+import threading
+from collections import defaultdict
+from collections.abc import Callable
+from typing import Any
+
+
+def _series(name: str, labels: dict[str, Any]) -> str:
+    if not labels:
+        return name
+    rendered = ",".join(f'{key}="{value}"' for key, value in sorted(labels.items()))
+    return f"{name}{{{rendered}}}"
+
+
+class Metrics:
+    """Thread-safe registry of monotonically increasing counters and gauges.
+
+    Counters are keyed by name plus optional labels, e.g.
+    ``metrics.increment("audio_rejections_total", reason="silent")``.
+    Gauges are callables evaluated when a snapshot is taken.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counters: dict[str, float] = defaultdict(float)
+        self._gauges: dict[str, Callable[[], float]] = {}
+
+    def increment(self, name: str, value: float = 1, **labels: Any) -> None:
+        """Add ``value`` to a counter."""
+        key = _series(name, labels)
+        with self._lock:
+            self._counters[key] += value
+
+    def get(self, name: str, **labels: Any) -> float:
+        """Current value of a counter (0 if never incremented)."""
+        with self._lock:
+            return self._counters.get(_series(name, labels), 0)
+
+    def register_gauge(self, name: str, read: Callable[[], float]) -> None:
+        """Register a callable returning the current value of a gauge."""
+        with self._lock:
+            self._gauges[name] = read
+
+    def snapshot(self) -> dict[str, float]:
+        """Return all counters and the current value of every gauge."""
+        with self._lock:
+            values = dict(self._counters)
+            gauges = dict(self._gauges)
+        for name, read in gauges.items():
+            try:
+                values[name] = read()
+            except Exception:  # noqa: BLE001
+                continue
+        return dict(sorted(values.items()))
+
+
+metrics = Metrics()
+
+
+__all__ = ["Metrics", "metrics"]
@@ -82,12 +82,13 @@ class FocusPhoneme(BaseModel):
     practice_words: list[str] = Field(..., description="Words to practice this phoneme")
 
 
-class EvaluationResponse(BaseModel):
-    """Response schema for pronunciation evaluation result."""
+class PronunciationEvaluation(BaseModel):
+    """Structured AI evaluation of one recording.
+
+    Also used (via ``to_gemini_schema``) as the model's response schema, so
+    the AI output is parsed and validated in a single step.
+    """
 
-    attempt_id: int = Field(..., description="ID of this practice attempt")
-    sentence_id: int = Field(..., description="ID of the practiced sentence")
-    target_sentence: str = Field(..., description="The original sentence")
     transcription: str = Field(..., description="What the student said")
     
     overall_score: float = Field(..., ge=0, le=10, description="Overall score (0-10)")
@@ -101,10 +102,75 @@ class EvaluationResponse(BaseModel):
     suggestions: list[str] = Field(..., description="General improvement suggestions")
     focus_phonemes: list[FocusPhoneme] = Field(..., description="Phonemes to focus on")
     encouragement: str = Field(..., description="Motivational message in Vietnamese")
+
+
+class EvaluationResponse(PronunciationEvaluation):
+    """Response schema for pronunciation evaluation result."""
+
+    attempt_id: int = Field(..., description="ID of this practice attempt")
+    sentence_id: int = Field(..., description="ID of the practiced sentence")
+    target_sentence: str = Field(..., description="The original sentence")
     
     practiced_at: datetime = Field(..., description="Timestamp of this attempt")
 
 
+class BatchEvaluationItem(BaseModel):
+    """One recording of a batch evaluation request."""
+
+    sentence_id: int = Field(..., description="ID of the sentence being practiced")
+    audio_data: str = Field(
+        ..., description="Base64-encoded audio data (with or without data URL prefix)"
+    )
+
+
+class BatchEvaluationRequest(BaseModel):
+    """Request schema for evaluating several sentences of a lesson at once."""
+
+    items: list[BatchEvaluationItem] = Field(
+        ..., min_length=1, description="Recordings to evaluate, one per sentence"
+    )
+
+
+class BatchEvaluationItemResult(BaseModel):
+    """Outcome of one item of a batch evaluation."""
+
+    index: int = Field(..., description="Position of the item in the request")
+    sentence_id: int = Field(..., description="ID of the practiced sentence")
+    success: bool = Field(..., description="Whether the item was evaluated and saved")
+    result: Optional[EvaluationResponse] = Field(
+        None, description="Evaluation result when success is true"
+    )
+    error: Optional[str] = Field(None, description="Error message if the item failed")
+    error_status: Optional[int] = Field(None, description="HTTP status code of the failure")
+
+
+class BatchEvaluationResponse(BaseModel):
+    """Per-item results of a batch evaluation."""
+
+    total: int = Field(..., description="Number of items in the request")
+    succeeded: int = Field(..., description="Number of items evaluated and saved")
+    failed: int = Field(..., description="Number of items that failed")
+    results: list[BatchEvaluationItemResult] = Field(..., description="Results in request order")
+
+
+class EvaluationJobResponse(BaseModel):
+    """Status of an asynchronous evaluation job."""
+
+    job_id: str = Field(..., description="Identifier used to poll the job")
+    sentence_id: int = Field(..., description="ID of the practiced sentence")
+    status: str = Field(..., description="pending | running | succeeded | failed")
+    created_at: datetime = Field(..., description="When the job was queued")
+    started_at: Optional[datetime] = Field(None, description="When a worker picked the job up")
+    finished_at: Optional[datetime] = Field(None, description="When the job finished")
+    result: Optional[EvaluationResponse] = Field(
+        None, description="Evaluation result, available once status is succeeded"
+    )
+    error: Optional[str] = Field(None, description="Error message if the job failed")
+    error_status: Optional[int] = Field(None, description="HTTP status code of the failure")
+
+    model_config = {"from_attributes": True}
+
+
 class PronunciationScore(BaseModel):
     """Detailed pronunciation scores (legacy - for backward compatibility)."""
 
@@ -141,6 +207,12 @@ __all__ = [
     "SentenceSimpleResponse",
     "EvaluationRequest",
     "EvaluationResponse",
+    "EvaluationJobResponse",
+    "BatchEvaluationItem",
+    "BatchEvaluationRequest",
+    "BatchEvaluationItemResult",
+    "BatchEvaluationResponse",
+    "PronunciationEvaluation",
     "AttemptHistoryResponse",
     "PronunciationScore",
     "TopicResponse",
@@ -0,0 +1,115 @@
+"""Backfill ``practice_sentences.phonetic_transcription`` with local IPA.
+
+Usage (from ``backend/``)::
+
+    python -m app.scripts.backfill_ipa                # only empty rows
+    python -m app.scripts.backfill_ipa --all          # recompute every row
+    python -m app.scripts.backfill_ipa --no-model     # dictionary + cache only
+
+Sentences are read in primary-key order and written back with one bulk
+UPDATE per batch. Words missing from the ``eng_to_ipa`` dictionary are sent
+to Gemini once per batch (unless ``--no-model``) and kept in the persistent
+word cache at ``IPA_CACHE_PATH``.
+"""
+
+import argparse
+import logging
+import time
+from typing import Optional
+
+from sqlalchemy import or_, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.models import PracticeSentence
+from app.db.session import SessionLocal
+from app.services.ipa_service import IPAFallback, IPAService, create_ipa_cache
+
+logger = logging.getLogger(__name__)
+
+
+def backfill(
+    db: Session,
+    ipa_service: IPAService,
+    batch_size: int = 500,
+    recompute: bool = False,
+    dry_run: bool = False,
+) -> int:
+    """Fill the IPA column batch by batch; return the number of rows updated."""
+    updated = 0
+    last_id = 0
+    while True:
+        query = db.query(PracticeSentence.sentence_id, PracticeSentence.sentence_text).filter(
+            PracticeSentence.sentence_id > last_id
+        )
+        if not recompute:
+            query = query.filter(
+                or_(
+                    PracticeSentence.phonetic_transcription.is_(None),
+                    PracticeSentence.phonetic_transcription == "",
+                )
+            )
+        rows = query.order_by(PracticeSentence.sentence_id).limit(batch_size).all()
+        if not rows:
+            break
+        last_id = rows[-1].sentence_id
+
+        transcriptions = ipa_service.transcribe_many([row.sentence_text for row in rows])
+        if not dry_run:
+            db.execute(
+                update(PracticeSentence),
+                [
+                    {"sentence_id": row.sentence_id, "phonetic_transcription": ipa}
+                    for row, ipa in zip(rows, transcriptions)
+                ],
+            )
+            db.commit()
+        updated += len(rows)
+        logger.info(f"Transcribed {updated} sentences (up to id {last_id})")
+    return updated
+
+
+def _model_fallback() -> Optional[IPAFallback]:
+    if not settings.GEMINI_API_KEY:
+        logger.warning("GEMINI_API_KEY not configured - unknown words are left as written")
+        return None
+    from app.services.gemini_service import GeminiService
+
+    return GeminiService().transcribe_words_ipa
+
+
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--all", action="store_true", help="recompute rows that already have IPA")
+    parser.add_argument("--no-model", action="store_true", help="never call the model for unknown words")
+    parser.add_argument("--dry-run", action="store_true", help="compute without writing")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    ipa_service = IPAService(
+        create_ipa_cache(),
+        fallback=None if args.no_model else _model_fallback(),
+    )
+    started = time.monotonic()
+    db = SessionLocal()
+    try:
+        updated = backfill(
+            db, ipa_service, batch_size=args.batch_size, recompute=args.all, dry_run=args.dry_run
+        )
+    finally:
+        db.close()
+
+    logger.info(
+        f"Done: {updated} sentences in {time.monotonic() - started:.1f}s "
+        f"(words: {ipa_service.dictionary_words} dictionary, {ipa_service.cached_words} cached, "
+        f"{ipa_service.fallback_words} model, {ipa_service.unresolved_words} unresolved)"
+    )
+
+
+if __name__ == "__main__":
+    main()
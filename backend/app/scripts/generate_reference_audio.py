@@ -0,0 +1,93 @@
+"""Pre-generate reference audio for every practice sentence.
+
+Usage (from ``backend/``)::
+
+    python -m app.scripts.generate_reference_audio              # missing files only
+    python -m app.scripts.generate_reference_audio --all        # regenerate everything
+    python -m app.scripts.generate_reference_audio --synthesizer fake
+
+Files are written to ``REFERENCE_AUDIO_DIR`` and served by
+``GET /practice/sentences/{sentence_id}/audio``.
+"""
+
+import argparse
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.models import PracticeSentence
+from app.db.session import SessionLocal
+from app.services.reference_audio import ReferenceAudioStore, create_synthesizer
+
+logger = logging.getLogger(__name__)
+
+
+def generate_all(
+    db: Session,
+    store: ReferenceAudioStore,
+    overwrite: bool = False,
+    concurrency: int = 4,
+    batch_size: int = 500,
+) -> tuple[int, int]:
+    """Generate missing (or all) reference files; return (generated, failed)."""
+    generated = failed = 0
+    last_id = 0
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        while True:
+            rows = (
+                db.query(PracticeSentence.sentence_id, PracticeSentence.sentence_text)
+                .filter(PracticeSentence.sentence_id > last_id)
+                .order_by(PracticeSentence.sentence_id)
+                .limit(batch_size)
+                .all()
+            )
+            if not rows:
+                break
+            last_id = rows[-1].sentence_id
+
+            pending = [row for row in rows if overwrite or store.get(row.sentence_id) is None]
+            futures = {
+                row.sentence_id: pool.submit(store.generate, row.sentence_id, row.sentence_text, True)
+                for row in pending
+            }
+            for sentence_id, future in futures.items():
+                try:
+                    future.result()
+                    generated += 1
+                except Exception as e:  # noqa: BLE001
+                    failed += 1
+                    logger.warning(f"Could not generate audio for sentence {sentence_id}: {e}")
+    return generated, failed
+
+
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--all", action="store_true", help="regenerate existing files")
+    parser.add_argument("--concurrency", type=int, default=4, help="parallel synthesis requests")
+    parser.add_argument("--synthesizer", choices=("gtts", "fake"), help="override REFERENCE_AUDIO_SYNTHESIZER")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    store = ReferenceAudioStore(settings.REFERENCE_AUDIO_DIR, create_synthesizer(args.synthesizer))
+    started = time.monotonic()
+    db = SessionLocal()
+    try:
+        generated, failed = generate_all(db, store, overwrite=args.all, concurrency=args.concurrency)
+    finally:
+        db.close()
+    logger.info(
+        f"Done: {generated} generated, {failed} failed in {time.monotonic() - started:.1f}s "
+        f"({store.root})"
+    )
+
+
+if __name__ == "__main__":
+    main()
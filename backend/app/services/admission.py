@@ -0,0 +1,41 @@
+"""Admission control for the evaluation endpoints.
+
+Every evaluation ties up a worker, a database connection and model quota, so
+requests are admitted per user (concurrent and per-minute limits) and
+globally (in-flight cap with a bounded wait queue) before any work starts.
+"""
+
+import math
+
+from fastapi import HTTPException, status
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.utils.rate_limit import AdmissionController, RateLimitTimeout
+
+evaluation_admission = AdmissionController(
+    user_max_concurrency=settings.ADMISSION_USER_MAX_CONCURRENCY,
+    user_rate_per_minute=settings.ADMISSION_USER_REQUESTS_PER_MINUTE,
+    user_burst=settings.ADMISSION_USER_BURST,
+    max_in_flight=settings.ADMISSION_MAX_IN_FLIGHT,
+    max_waiting=settings.ADMISSION_MAX_WAITING,
+    queue_timeout=settings.ADMISSION_QUEUE_TIMEOUT_SECONDS,
+)
+metrics.register_gauge("evaluation_admission_in_flight", lambda: evaluation_admission.in_flight)
+metrics.register_gauge("evaluation_admission_queue_depth", lambda: evaluation_admission.waiting)
+
+
+def admission_error(error: RateLimitTimeout) -> HTTPException:
+    """429 response for a request that was not admitted."""
+    metrics.increment("evaluation_admission_rejections_total")
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail="Bạn đang gửi quá nhiều yêu cầu chấm điểm, vui lòng thử lại sau",
+        headers={
+            "Retry-After": str(max(1, math.ceil(error.retry_after))),
+            "X-Queue-Depth": str(evaluation_admission.waiting),
+        },
+    )
+
+
+__all__ = ["admission_error", "evaluation_admission"]
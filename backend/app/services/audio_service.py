@@ -6,8 +6,14 @@ import logging
 import os
 import sys
 import tempfile
+import wave
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import BinaryIO, Optional, Tuple, Union
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.utils.exceptions import AudioRejectedError
 
 # Check Python version and handle compatibility
 PYTHON_VERSION = sys.version_info
@@ -36,8 +42,210 @@ except ImportError:
     logger = logging.getLogger(__name__)
     logger.error("pydub not available")
 
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+    logger = logging.getLogger(__name__)
+    logger.error("numpy not available - silence trimming disabled")
+
 logger = logging.getLogger(__name__)
 
+# Size of the canonical RIFF header written by the ``wave`` module
+WAV_HEADER_SIZE = 44
+
+# Audio accepted by AudioService: base64 string (JSON clients), raw bytes,
+# a binary file object, or the path of a spooled upload on disk
+AudioInput = Union[str, bytes, BinaryIO, Path]
+
+
+@dataclass(frozen=True)
+class DecodedAudio:
+    """Audio decoded once to interleaved little-endian PCM.
+
+    Every pipeline stage (metadata, pre-processing, model submission and
+    persistence) works from this object instead of re-decoding the upload or
+    reloading a WAV from disk.
+    """
+
+    pcm: bytes
+    frame_rate: int
+    channels: int
+    sample_width: int
+
+    @property
+    def frame_count(self) -> int:
+        return len(self.pcm) // (self.channels * self.sample_width)
+
+    @property
+    def duration(self) -> float:
+        """Duration in seconds."""
+        return self.frame_count / self.frame_rate if self.frame_rate else 0.0
+
+    @classmethod
+    def from_segment(cls, segment: "AudioSegment") -> "DecodedAudio":
+        return cls(
+            pcm=segment.raw_data,
+            frame_rate=segment.frame_rate,
+            channels=segment.channels,
+            sample_width=segment.sample_width,
+        )
+
+    def to_segment(self) -> "AudioSegment":
+        """Wrap the PCM in a pydub ``AudioSegment`` without copying through disk."""
+        return AudioSegment(
+            data=self.pcm,
+            sample_width=self.sample_width,
+            frame_rate=self.frame_rate,
+            channels=self.channels,
+        )
+
+    def samples(self) -> "np.ndarray":
+        """PCM as a float32 array of shape (frames, channels) in [-1, 1]."""
+        width = self.sample_width
+        if width == 1:
+            # 8-bit WAV is unsigned
+            data = np.frombuffer(self.pcm, dtype=np.uint8).astype(np.float32) - 128.0
+        elif width == 3:
+            raw = np.frombuffer(self.pcm, dtype=np.uint8).reshape(-1, 3)
+            data = (
+                raw[:, 0].astype(np.int32)
+                | (raw[:, 1].astype(np.int32) << 8)
+                | (raw[:, 2].astype(np.int8).astype(np.int32) << 16)
+            ).astype(np.float32)
+        else:
+            data = np.frombuffer(self.pcm, dtype=f"<i{width}").astype(np.float32)
+        scale = float(2 ** (8 * width - 1))
+        usable = self.frame_count * self.channels
+        return (data[:usable] / scale).reshape(-1, self.channels)
+
+    def select_frames(self, mask: "np.ndarray") -> "DecodedAudio":
+        """Return a copy keeping only the frames where ``mask`` is True."""
+        frame_bytes = self.channels * self.sample_width
+        usable = self.frame_count * frame_bytes
+        frames = np.frombuffer(self.pcm[:usable], dtype=np.uint8).reshape(-1, frame_bytes)
+        return DecodedAudio(
+            pcm=frames[mask].tobytes(),
+            frame_rate=self.frame_rate,
+            channels=self.channels,
+            sample_width=self.sample_width,
+        )
+
+    def to_wav_bytes(self) -> bytes:
+        """Encode as an in-memory WAV container (no ffmpeg required)."""
+        buffer = io.BytesIO()
+        with wave.open(buffer, "wb") as wav_file:
+            wav_file.setnchannels(self.channels)
+            wav_file.setsampwidth(self.sample_width)
+            wav_file.setframerate(self.frame_rate)
+            wav_file.writeframes(self.pcm)
+        return buffer.getvalue()
+
+    def metadata(self) -> dict:
+        """Metadata in the same shape as ``AudioService.get_audio_metadata``."""
+        return {
+            "duration": self.duration,
+            "channels": self.channels,
+            "sample_width": self.sample_width,
+            "frame_rate": self.frame_rate,
+            "clarity": "normal",
+            "noise": "low",
+        }
+
+
+@dataclass(frozen=True)
+class EncodedAudio:
+    """Compact encoding of a recording, ready to be sent to the AI model."""
+
+    data: bytes
+    mime_type: str
+    format: str
+    duration: float
+    bytes_before: int
+
+    @property
+    def bytes_after(self) -> int:
+        return len(self.data)
+
+    @property
+    def compression_ratio(self) -> float:
+        return self.bytes_before / self.bytes_after if self.bytes_after else 0.0
+
+
+# Reasons reported by ``AudioService.preflight_check`` (also the metric label)
+PREFLIGHT_TOO_SHORT = "too_short"
+PREFLIGHT_TOO_LONG = "too_long"
+PREFLIGHT_SILENT = "silent"
+PREFLIGHT_NO_SPEECH = "no_speech"
+PREFLIGHT_CLIPPED = "clipped"
+
+
+@dataclass(frozen=True)
+class AudioQuality:
+    """Cheap signal statistics computed by the pre-flight gate."""
+
+    duration: float
+    rms_db: float
+    speech_ratio: float
+    speech_seconds: float
+    clipped_ratio: float
+
+
+# Output container/codec per AUDIO_MODEL_FORMAT: (pydub format, codec, mime type)
+MODEL_AUDIO_FORMATS = {
+    "wav": ("wav", None, "audio/wav"),
+    "flac": ("flac", None, "audio/flac"),
+    "opus": ("ogg", "libopus", "audio/ogg"),
+}
+
+
+def frame_energy_db(audio: DecodedAudio, frame_ms: int) -> "np.ndarray":
+    """RMS energy (dBFS) of consecutive mono frames of ``frame_ms``.
+
+    The trailing partial frame is ignored.
+    """
+    mono = audio.samples().mean(axis=1)
+    frame_len = max(1, audio.frame_rate * frame_ms // 1000)
+    n_frames = len(mono) // frame_len
+    if n_frames == 0:
+        return np.empty(0, dtype=np.float32)
+    frames = mono[: n_frames * frame_len].reshape(n_frames, frame_len)
+    rms = np.sqrt(np.mean(np.square(frames), axis=1))
+    return 20.0 * np.log10(np.maximum(rms, 1e-10))
+
+
+def speech_frame_mask(energy_db: "np.ndarray") -> "np.ndarray":
+    """Classify frames as speech using absolute and peak-relative thresholds."""
+    if energy_db.size == 0:
+        return np.zeros(0, dtype=bool)
+    threshold = max(
+        settings.VAD_SILENCE_THRESHOLD_DB,
+        float(energy_db.max()) - settings.VAD_DYNAMIC_RANGE_DB,
+    )
+    return energy_db > threshold
+
+
+def _dilate(mask: "np.ndarray", radius: int) -> "np.ndarray":
+    """Grow True regions by ``radius`` frames on each side."""
+    if radius <= 0 or not mask.any():
+        return mask
+    kernel = np.ones(2 * radius + 1, dtype=np.int32)
+    return np.convolve(mask.astype(np.int32), kernel, mode="same") > 0
+
+
+def _cap_silent_runs(keep: "np.ndarray", max_run: int) -> "np.ndarray":
+    """Shorten every run of False frames longer than ``max_run`` to ``max_run``."""
+    silent = ~keep
+    if not silent.any():
+        return keep
+    # Start index of the run each frame belongs to, then position within run
+    run_begins = np.diff(np.concatenate(([False], silent)).astype(np.int8)) == 1
+    starts = np.flatnonzero(run_begins)
+    run_id = np.maximum(np.cumsum(run_begins) - 1, 0)
+    position = np.arange(len(keep)) - starts[run_id]
+    return keep | (silent & (position < max_run))
+
 
 class AudioService:
     """Service for handling audio files and speech-to-text conversion."""
@@ -53,26 +261,24 @@ class AudioService:
             self.recognizer.energy_threshold = 4000
             self.recognizer.dynamic_energy_threshold = True
 
-    def save_audio_file(self, audio_data: str, user_id: int, sentence_id: int) -> Tuple[str, float]:
-        """Save base64 audio data to file.
+    def decode_base64_audio(self, audio_data: str) -> bytes:
+        """Decode base64 audio data sent as JSON.
         
         Args:
             audio_data: Base64-encoded audio data (with or without data URL prefix)
-            user_id: ID of the user
-            sentence_id: ID of the sentence being practiced
             
         Returns:
-            Tuple of (file_path, duration_in_seconds)
+            Raw audio bytes
             
         Raises:
-            Exception: If audio processing fails
+            Exception: If the base64 string cannot be decoded
         """
         try:
             # Remove data URL prefix if present
             original_length = len(audio_data)
             if ',' in audio_data and audio_data.startswith('data:'):
                 audio_data = audio_data.split(',', 1)[1]
-                logger.info(f"Removed data URL prefix, length: {original_length} -> {len(audio_data)}")
+                logger.debug(f"Removed data URL prefix, length: {original_length} -> {len(audio_data)}")
             
             # Clean up base64 string - remove whitespace and fix padding
             audio_data = audio_data.strip().replace('\n', '').replace('\r', '').replace(' ', '')
@@ -81,38 +287,14 @@ class AudioService:
             padding = len(audio_data) % 4
             if padding:
                 audio_data += '=' * (4 - padding)
-                logger.info(f"Added padding: {4 - padding} characters")
+                logger.debug(f"Added padding: {4 - padding} characters")
             
-            logger.info(f"Base64 string length: {len(audio_data)} characters")
+            logger.debug(f"Base64 string length: {len(audio_data)} characters")
             
             # Decode base64
             audio_bytes = base64.b64decode(audio_data)
-            logger.info(f"Decoded audio size: {len(audio_bytes)} bytes ({len(audio_bytes) / 1024:.2f} KB)")
-            
-            # Create uploads directory if not exists
-            upload_dir = Path("backend/audio")
-            upload_dir.mkdir(parents=True, exist_ok=True)
-            
-            # Generate filename
-            import time
-            filename = f"user_{user_id}_sentence_{sentence_id}_{int(time.time() * 1000)}.wav"
-            file_path = upload_dir / filename
-            
-            if PYDUB_AVAILABLE:
-                # Load audio using pydub to get duration and convert if needed
-                audio = AudioSegment.from_file(io.BytesIO(audio_bytes))
-                duration = len(audio) / 1000.0  # Convert to seconds
-                
-                # Export as WAV for better compatibility
-                audio.export(str(file_path), format="wav")
-            else:
-                # Fallback: save directly
-                with open(file_path, 'wb') as f:
-                    f.write(audio_bytes)
-                duration = 0.0  # Unknown duration
-            
-            logger.info(f"Saved audio file: {file_path} (duration: {duration}s)")
-            return str(file_path), duration
+            logger.debug(f"Decoded audio size: {len(audio_bytes)} bytes ({len(audio_bytes) / 1024:.2f} KB)")
+            return audio_bytes
             
         except base64.binascii.Error as e:
             logger.error(f"Base64 decode error: {e}")
@@ -121,10 +303,75 @@ class AudioService:
                 f"Lỗi decode audio data. Đảm bảo frontend gửi đúng định dạng base64. "
                 f"Chi tiết: {e}"
             )
+
+    def _resolve_audio_input(self, audio_data: AudioInput) -> Union[BinaryIO, str]:
+        """Normalize an ``AudioInput`` to a file object or a filesystem path."""
+        if isinstance(audio_data, str):
+            return io.BytesIO(self.decode_base64_audio(audio_data))
+        if isinstance(audio_data, (bytes, bytearray)):
+            return io.BytesIO(audio_data)
+        if isinstance(audio_data, Path):
+            return str(audio_data)
+        audio_data.seek(0)
+        return audio_data
+
+    @staticmethod
+    def _is_pcm_wav(source: Union[BinaryIO, str]) -> bool:
+        """Check for a RIFF/WAVE header with PCM (format tag 1) samples."""
+        if isinstance(source, str):
+            with open(source, "rb") as f:
+                header = f.read(22)
+        else:
+            header = source.read(22)
+            source.seek(0)
+        return (
+            len(header) == 22
+            and header[:4] == b"RIFF"
+            and header[8:12] == b"WAVE"
+            and header[20:22] == b"\x01\x00"
+        )
+
+    def decode_audio(self, audio_data: AudioInput) -> DecodedAudio:
+        """Decode audio to PCM exactly once.
+        
+        Args:
+            audio_data: Base64 string (with or without data URL prefix), raw
+                bytes, a binary file object or a path to a temporary upload
+            
+        Returns:
+            DecodedAudio carrying PCM samples and format information
+            
+        Raises:
+            Exception: If the audio cannot be decoded
+        """
+        try:
+            source = self._resolve_audio_input(audio_data)
+            
+            if self._is_pcm_wav(source) or not PYDUB_AVAILABLE:
+                # Uncompressed WAV is read with the stdlib, skipping the
+                # ffmpeg subprocess (and the only option without pydub)
+                with wave.open(source, "rb") as wav_file:
+                    decoded = DecodedAudio(
+                        pcm=wav_file.readframes(wav_file.getnframes()),
+                        frame_rate=wav_file.getframerate(),
+                        channels=wav_file.getnchannels(),
+                        sample_width=wav_file.getsampwidth(),
+                    )
+            else:
+                # Paths are handed to ffmpeg directly so large uploads are not
+                # read back into memory.
+                decoded = DecodedAudio.from_segment(AudioSegment.from_file(source))
+            
+            logger.debug(
+                f"Decoded audio: {decoded.duration:.2f}s, {decoded.channels}ch, "
+                f"{decoded.frame_rate}Hz"
+            )
+            return decoded
+            
         except Exception as e:
-            logger.error(f"Error saving audio file: {e}")
+            logger.error(f"Error decoding audio: {e}")
             logger.error(f"Error type: {type(e).__name__}")
-            raise Exception(f"Failed to save audio: {e}")
+            raise Exception(f"Failed to decode audio: {e}")
 
     def transcribe_audio(self, audio_file_path: str) -> str:
         """Convert speech to text using Google Speech Recognition.
@@ -166,15 +413,217 @@ class AudioService:
             logger.error(f"Error transcribing audio: {e}")
             raise Exception(f"Lỗi khi chuyển đổi giọng nói sang văn bản: {e}")
 
-    def get_audio_metadata(self, audio_file_path: str) -> dict:
+    @staticmethod
+    def measure_quality(audio: DecodedAudio) -> AudioQuality:
+        """Compute RMS level, speech-frame ratio and clipping in one pass.
+        
+        Args:
+            audio: Decoded recording (numpy must be available)
+            
+        Returns:
+            AudioQuality of the recording
+        """
+        samples = audio.samples()
+        if samples.size == 0:
+            return AudioQuality(audio.duration, -200.0, 0.0, 0.0, 0.0)
+        
+        rms = float(np.sqrt(np.mean(np.square(samples))))
+        clipped = float(np.mean(np.abs(samples) >= settings.AUDIO_PREFLIGHT_CLIP_LEVEL))
+        
+        frame_ms = settings.VAD_FRAME_MS
+        speech = speech_frame_mask(frame_energy_db(audio, frame_ms))
+        speech_frames = int(speech.sum())
+        return AudioQuality(
+            duration=audio.duration,
+            rms_db=20.0 * float(np.log10(max(rms, 1e-10))),
+            speech_ratio=speech_frames / speech.size if speech.size else 0.0,
+            speech_seconds=speech_frames * frame_ms / 1000,
+            clipped_ratio=clipped,
+        )
+
+    def preflight_check(self, audio: DecodedAudio, target_sentence: str) -> None:
+        """Reject recordings that cannot produce a meaningful score.
+        
+        Runs in milliseconds on the decoded PCM, before any model call:
+        duration against the word count of the target sentence, overall RMS
+        level, share of speech frames and share of clipped samples.
+        Rejections are counted in ``audio_rejections_total{reason}``.
+        
+        Args:
+            audio: Decoded recording (before silence trimming)
+            target_sentence: Câu mục tiêu, dùng để ước lượng độ dài hợp lý
+            
+        Raises:
+            AudioRejectedError: Nếu bản ghi không dùng được, kèm ``reason``
+        """
+        if not settings.AUDIO_PREFLIGHT_ENABLED:
+            return
+        
+        words = max(1, len(target_sentence.split()))
+        max_duration = (
+            settings.AUDIO_PREFLIGHT_MAX_BASE_SECONDS
+            + words * settings.AUDIO_PREFLIGHT_MAX_SECONDS_PER_WORD
+        )
+        if audio.duration < settings.AUDIO_PREFLIGHT_MIN_DURATION_SECONDS:
+            self._reject(PREFLIGHT_TOO_SHORT, "Bản ghi âm quá ngắn, vui lòng đọc lại cả câu")
+        if audio.duration > max_duration:
+            self._reject(
+                PREFLIGHT_TOO_LONG,
+                f"Bản ghi âm quá dài ({audio.duration:.0f}s), tối đa {max_duration:.0f}s cho câu này"
+            )
+        if not NUMPY_AVAILABLE:
+            return
+        
+        quality = self.measure_quality(audio)
+        if quality.rms_db < settings.AUDIO_PREFLIGHT_MIN_RMS_DB:
+            self._reject(PREFLIGHT_SILENT, "Không nghe thấy âm thanh, vui lòng kiểm tra micro")
+        if quality.speech_ratio < settings.AUDIO_PREFLIGHT_MIN_SPEECH_RATIO:
+            self._reject(PREFLIGHT_NO_SPEECH, "Không phát hiện giọng nói trong bản ghi âm")
+        if quality.speech_seconds < words * settings.AUDIO_PREFLIGHT_MIN_SECONDS_PER_WORD:
+            self._reject(PREFLIGHT_TOO_SHORT, "Bản ghi âm quá ngắn so với câu cần đọc")
+        if quality.clipped_ratio > settings.AUDIO_PREFLIGHT_MAX_CLIPPED_RATIO:
+            self._reject(PREFLIGHT_CLIPPED, "Âm thanh bị rè do thu quá to, vui lòng để micro xa hơn")
+
+    @staticmethod
+    def _reject(reason: str, message: str) -> None:
+        metrics.increment("audio_rejections_total", reason=reason)
+        logger.info(f"Recording rejected by pre-flight gate: {reason}")
+        raise AudioRejectedError(reason, message)
+
+    def trim_silence(self, audio: DecodedAudio) -> DecodedAudio:
+        """Trim leading/trailing silence and collapse long internal pauses.
+        
+        Frames are classified with a vectorized RMS energy detector; speech
+        regions are padded by ``VAD_PADDING_MS`` so word onsets and final
+        consonants are kept, and pauses longer than ``VAD_MAX_PAUSE_MS`` are
+        shortened to that length.
+        
+        Args:
+            audio: Decoded recording
+            
+        Returns:
+            Trimmed recording (the input itself if no speech was detected or
+            numpy is unavailable)
+        """
+        if not NUMPY_AVAILABLE or audio.frame_count == 0:
+            return audio
+        
+        frame_ms = settings.VAD_FRAME_MS
+        energy_db = frame_energy_db(audio, frame_ms)
+        speech = speech_frame_mask(energy_db)
+        if not speech.any():
+            return audio
+        
+        padded = _dilate(speech, settings.VAD_PADDING_MS // frame_ms)
+        keep = _cap_silent_runs(padded, settings.VAD_MAX_PAUSE_MS // frame_ms)
+        
+        # Drop leading/trailing silence entirely
+        first, last = np.flatnonzero(padded)[[0, -1]]
+        keep[:first] = False
+        keep[last + 1:] = False
+        
+        # Expand the frame decision to samples; the partial tail frame
+        # follows the last full frame
+        frame_len = max(1, audio.frame_rate * frame_ms // 1000)
+        sample_mask = np.repeat(keep, frame_len)
+        tail = audio.frame_count - sample_mask.size
+        if tail > 0:
+            sample_mask = np.concatenate((sample_mask, np.full(tail, keep[-1])))
+        
+        trimmed = audio.select_frames(sample_mask)
+        logger.debug(f"Trimmed silence: {audio.duration:.2f}s -> {trimmed.duration:.2f}s")
+        return trimmed
+
+    def encode_audio(self, audio: DecodedAudio, output_format: str) -> Tuple[bytes, str, str]:
+        """Encode a recording as WAV, FLAC or Opus.
+        
+        Compressed formats need ffmpeg; when it is missing (or the format is
+        unknown) the audio is encoded as WAV instead.
+        
+        Args:
+            audio: Decoded recording
+            output_format: wav | flac | opus
+            
+        Returns:
+            Tuple of (data, format actually used, mime type)
+        """
+        output_format = output_format.lower()
+        if output_format not in MODEL_AUDIO_FORMATS:
+            logger.warning(f"Unknown audio format '{output_format}', using wav")
+            output_format = "wav"
+        
+        pydub_format, codec, mime_type = MODEL_AUDIO_FORMATS[output_format]
+        if output_format != "wav" and PYDUB_AVAILABLE:
+            try:
+                buffer = io.BytesIO()
+                export_args = {"format": pydub_format}
+                if codec:
+                    export_args["codec"] = codec
+                    export_args["bitrate"] = settings.AUDIO_MODEL_OPUS_BITRATE
+                audio.to_segment().export(buffer, **export_args)
+                return buffer.getvalue(), output_format, mime_type
+            except Exception as e:
+                logger.warning(f"Could not encode audio as {output_format}, using WAV: {e}")
+        
+        _, _, mime_type = MODEL_AUDIO_FORMATS["wav"]
+        return audio.to_wav_bytes(), "wav", mime_type
+
+    def prepare_for_model(self, audio: DecodedAudio) -> EncodedAudio:
+        """Downmix, resample and compress a recording before model submission.
+        
+        Browsers usually record 48 kHz stereo; speech evaluation only needs
+        16 kHz mono, and FLAC/Opus shrink it further. Configured through
+        ``AUDIO_MODEL_SAMPLE_RATE``, ``AUDIO_MODEL_CHANNELS`` and
+        ``AUDIO_MODEL_FORMAT``.
+        
+        Args:
+            audio: Decoded recording
+            
+        Returns:
+            EncodedAudio with the payload and its size before/after
+        """
+        bytes_before = len(audio.pcm) + WAV_HEADER_SIZE
+        
+        compact = audio
+        if PYDUB_AVAILABLE:
+            # Channel/rate conversion is done in-process by pydub (no ffmpeg)
+            segment = (
+                audio.to_segment()
+                .set_channels(settings.AUDIO_MODEL_CHANNELS)
+                .set_frame_rate(settings.AUDIO_MODEL_SAMPLE_RATE)
+                .set_sample_width(2)
+            )
+            compact = DecodedAudio.from_segment(segment)
+        
+        data, output_format, mime_type = self.encode_audio(compact, settings.AUDIO_MODEL_FORMAT)
+        
+        encoded = EncodedAudio(
+            data=data,
+            mime_type=mime_type,
+            format=output_format,
+            duration=compact.duration,
+            bytes_before=bytes_before,
+        )
+        logger.debug(
+            f"Prepared audio for model: {encoded.bytes_before / 1024:.1f} KB -> "
+            f"{encoded.bytes_after / 1024:.1f} KB ({output_format}, "
+            f"{compact.channels}ch, {compact.frame_rate}Hz)"
+        )
+        return encoded
+
+    def get_audio_metadata(self, audio_file_path: Union[DecodedAudio, str]) -> dict:
         """Extract metadata from audio file.
         
         Args:
-            audio_file_path: Path to the audio file
+            audio_file_path: Already decoded audio (no I/O needed) or path to
+                the audio file
             
         Returns:
             Dictionary containing audio metadata
         """
+        if isinstance(audio_file_path, DecodedAudio):
+            return audio_file_path.metadata()
+        
         if not PYDUB_AVAILABLE:
             # Return basic metadata without pydub
             try:
@@ -211,18 +660,4 @@ class AudioService:
                 "noise": "unknown"
             }
 
-    def cleanup_audio_file(self, file_path: str) -> None:
-        """Delete audio file after processing if needed.
-        
-        Args:
-            file_path: Path to the audio file to delete
-        """
-        try:
-            if os.path.exists(file_path):
-                os.remove(file_path)
-                logger.info(f"Deleted audio file: {file_path}")
-        except Exception as e:
-            logger.warning(f"Could not delete audio file {file_path}: {e}")
-
-
-__all__ = ["AudioService"]
+__all__ = ["AudioService", "AudioInput", "AudioQuality", "DecodedAudio", "EncodedAudio"]
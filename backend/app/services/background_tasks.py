@@ -0,0 +1,303 @@
+"""Background runner for side effects that must not delay a response.
+
+Cleanup work (deleting files uploaded to the Gemini file API, removing
+spooled upload files) is submitted as ``(kind, target)`` pairs to a bounded
+queue drained by a fixed pool of workers. Each kind has a registered handler
+that runs in the thread pool and is retried with exponential backoff.
+
+Tasks that still fail, or that cannot be queued, are recorded; the
+``OrphanSweeper`` periodically retries those records and asks the registered
+scanners for orphans that were never recorded (e.g. after a crash).
+"""
+
+import asyncio
+import logging
+import os
+import random
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+TASK_DELETE_LOCAL_FILE = "delete_local_file"
+TASK_DELETE_GEMINI_FILE = "delete_gemini_file"
+
+TaskHandler = Callable[[str], None]
+# Returns ``(kind, target)`` pairs of leftovers to delete
+OrphanScanner = Callable[[], list[tuple[str, str]]]
+
+
+@dataclass
+class FailedTask:
+    """A cleanup task that exhausted its retries (or was never queued)."""
+
+    kind: str
+    target: str
+    error: str
+    attempts: int
+    failed_at: float
+
+
+class BackgroundTaskRunner:
+    """Bounded queue of cleanup tasks with retrying workers.
+
+    ``submit`` is safe to call from the event loop and from worker threads
+    (sync code running in the thread pool).
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        max_queue_size: int,
+        max_attempts: int,
+        retry_base_delay: float,
+        max_failures: int = 1000,
+    ) -> None:
+        self.workers = workers
+        self.max_queue_size = max_queue_size
+        self.max_attempts = max(1, max_attempts)
+        self.retry_base_delay = retry_base_delay
+        self.max_failures = max_failures
+        self._handlers: dict[str, TaskHandler] = {}
+        self._failures: OrderedDict[tuple[str, str], FailedTask] = OrderedDict()
+        self._failures_lock = threading.Lock()
+        self._queue: Optional[asyncio.Queue[tuple[str, str]]] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._tasks: list[asyncio.Task] = []
+        metrics.register_gauge("background_tasks_queued", self.depth)
+        metrics.register_gauge("background_tasks_failed", lambda: len(self._failures))
+
+    def register(self, kind: str, handler: TaskHandler) -> None:
+        """Register the handler executed for tasks of ``kind``.
+
+        Handlers raise on failure (so the task is retried) and must be
+        idempotent: a target that is already gone counts as done.
+        """
+        self._handlers[kind] = handler
+
+    def depth(self) -> int:
+        return self._queue.qsize() if self._queue else 0
+
+    @property
+    def failures(self) -> list[FailedTask]:
+        with self._failures_lock:
+            return list(self._failures.values())
+
+    async def start(self) -> None:
+        """Spawn the worker tasks on the running event loop."""
+        if self._tasks:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self._tasks = [
+            asyncio.create_task(self._worker(), name=f"background-task-worker-{i}")
+            for i in range(self.workers)
+        ]
+
+    async def stop(self, timeout: float = 5.0) -> None:
+        """Drain queued tasks for up to ``timeout`` seconds, then cancel the workers."""
+        if self._queue is not None:
+            try:
+                await asyncio.wait_for(self._queue.join(), timeout)
+            except asyncio.TimeoutError:
+                logger.warning(f"{self._queue.qsize()} background tasks left unfinished at shutdown")
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self._queue is not None:
+            while not self._queue.empty():
+                kind, target = self._queue.get_nowait()
+                self._record_failure(kind, target, "not run before shutdown", attempts=0)
+        self._queue = None
+        self._loop = None
+
+    def submit(self, kind: str, target: str) -> None:
+        """Queue a task without waiting for it.
+
+        Raises:
+            KeyError: If no handler is registered for ``kind``
+        """
+        if kind not in self._handlers:
+            raise KeyError(f"No background task handler registered for '{kind}'")
+
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            # Not running inside the app (scripts, tests): run inline, once
+            self._run_inline(kind, target)
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            self._enqueue(kind, target)
+        else:
+            loop.call_soon_threadsafe(self._enqueue, kind, target)
+
+    def _enqueue(self, kind: str, target: str) -> None:
+        if self._queue is None:
+            self._record_failure(kind, target, "runner stopped", attempts=0)
+            return
+        try:
+            self._queue.put_nowait((kind, target))
+        except asyncio.QueueFull:
+            metrics.increment("background_tasks_dropped_total", kind=kind)
+            self._record_failure(kind, target, "queue full", attempts=0)
+
+    def _run_inline(self, kind: str, target: str) -> None:
+        try:
+            self._handlers[kind](target)
+        except Exception as e:  # noqa: BLE001
+            self._record_failure(kind, target, str(e), attempts=1)
+
+    async def _worker(self) -> None:
+        assert self._queue is not None
+        while True:
+            kind, target = await self._queue.get()
+            try:
+                await self.run(kind, target)
+            finally:
+                self._queue.task_done()
+
+    async def run(self, kind: str, target: str) -> bool:
+        """Run one task with retries; record it if every attempt fails."""
+        handler = self._handlers[kind]
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                await run_in_threadpool(handler, target)
+                metrics.increment("background_tasks_succeeded_total", kind=kind)
+                self._forget_failure(kind, target)
+                return True
+            except Exception as e:  # noqa: BLE001
+                if attempt == self.max_attempts:
+                    logger.warning(f"Background task {kind}({target}) failed after {attempt} attempts: {e}")
+                    metrics.increment("background_tasks_failed_total", kind=kind)
+                    self._record_failure(kind, target, str(e), attempts=attempt)
+                    return False
+                delay = self.retry_base_delay * 2 ** (attempt - 1)
+                await asyncio.sleep(random.uniform(delay / 2, delay))
+        return False
+
+    def _record_failure(self, kind: str, target: str, error: str, attempts: int) -> None:
+        with self._failures_lock:
+            self._failures[(kind, target)] = FailedTask(kind, target, error, attempts, time.time())
+            self._failures.move_to_end((kind, target))
+            while len(self._failures) > self.max_failures:
+                self._failures.popitem(last=False)
+
+    def _forget_failure(self, kind: str, target: str) -> None:
+        with self._failures_lock:
+            self._failures.pop((kind, target), None)
+
+
+class OrphanSweeper:
+    """Periodically retries failed cleanups and removes unrecorded orphans."""
+
+    def __init__(self, runner: BackgroundTaskRunner, interval_seconds: float) -> None:
+        self.runner = runner
+        self.interval_seconds = interval_seconds
+        self._scanners: list[OrphanScanner] = []
+        self._task: Optional[asyncio.Task] = None
+
+    def add_scanner(self, scanner: OrphanScanner) -> None:
+        self._scanners.append(scanner)
+
+    async def sweep_once(self) -> int:
+        """One pass; returns the number of leftovers removed."""
+        pending = {(failed.kind, failed.target) for failed in self.runner.failures}
+        for scanner in self._scanners:
+            try:
+                pending.update(await run_in_threadpool(scanner))
+            except Exception as e:  # noqa: BLE001
+                logger.warning(f"Orphan scanner {getattr(scanner, '__name__', scanner)} failed: {e}")
+
+        removed = 0
+        for kind, target in pending:
+            if await self.runner.run(kind, target):
+                removed += 1
+        if removed:
+            metrics.increment("orphan_sweeper_removed_total", removed)
+            logger.info(f"Orphan sweeper removed {removed} leftovers")
+        return removed
+
+    async def _loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            try:
+                await self.sweep_once()
+            except Exception as e:  # noqa: BLE001
+                logger.error(f"Orphan sweep failed: {e}")
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._loop(), name="orphan-sweeper")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+
+def delete_local_file(path: str) -> None:
+    """Delete a local file; a file that is already gone counts as deleted."""
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def scan_stale_uploads() -> list[tuple[str, str]]:
+    """Spooled upload files (``upload_*``) older than the orphan age."""
+    cutoff = time.time() - settings.BACKGROUND_ORPHAN_MIN_AGE_SECONDS
+    stale = []
+    for path in Path(tempfile.gettempdir()).glob("upload_*"):
+        try:
+            if path.is_file() and path.stat().st_mtime < cutoff:
+                stale.append((TASK_DELETE_LOCAL_FILE, str(path)))
+        except FileNotFoundError:
+            continue
+    return stale
+
+
+def schedule_local_file_cleanup(path: str) -> None:
+    """Delete a local file in the background."""
+    background_tasks.submit(TASK_DELETE_LOCAL_FILE, path)
+
+
+background_tasks = BackgroundTaskRunner(
+    workers=settings.BACKGROUND_TASK_WORKERS,
+    max_queue_size=settings.BACKGROUND_TASK_QUEUE_SIZE,
+    max_attempts=settings.BACKGROUND_TASK_MAX_ATTEMPTS,
+    retry_base_delay=settings.BACKGROUND_TASK_RETRY_BASE_DELAY_SECONDS,
+)
+background_tasks.register(TASK_DELETE_LOCAL_FILE, delete_local_file)
+
+orphan_sweeper = OrphanSweeper(background_tasks, settings.BACKGROUND_SWEEP_INTERVAL_SECONDS)
+orphan_sweeper.add_scanner(scan_stale_uploads)
+
+
+__all__ = [
+    "TASK_DELETE_GEMINI_FILE",
+    "TASK_DELETE_LOCAL_FILE",
+    "BackgroundTaskRunner",
+    "FailedTask",
+    "OrphanSweeper",
+    "background_tasks",
+    "delete_local_file",
+    "orphan_sweeper",
+    "scan_stale_uploads",
+    "schedule_local_file_cleanup",
+]
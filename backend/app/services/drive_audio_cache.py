@@ -0,0 +1,275 @@
+"""Size-bounded on-disk cache for audio proxied from Google Drive.
+
+Browsers request the same reference file on every play and issue several
+Range requests while seeking. The first request downloads the whole file
+once (concurrent misses for the same ``file_id`` share that download); every
+later request, ranged or not, is served from local disk.
+
+Several worker processes may share one cache directory. The size limit is
+enforced against what is on disk, not against one process's view of it:
+before evicting, the index is re-read from the directory, so files cached
+by other workers count towards ``max_bytes`` too.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from email.utils import formatdate
+from pathlib import Path
+from typing import Optional
+
+import anyio
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.services.http_client import upstream_http
+
+logger = logging.getLogger(__name__)
+
+# Drive file ids are URL-safe base64; anything else could escape the cache dir
+FILE_ID_PATTERN = re.compile(r"^[A-Za-z0-9_-]{1,128}$")
+
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+
+class UpstreamError(Exception):
+    """Raised when Google Drive does not return the file."""
+
+    def __init__(self, message: str, status_code: int) -> None:
+        super().__init__(message)
+        self.status_code = status_code
+
+
+@dataclass(frozen=True)
+class CachedAudio:
+    """A cached file plus the headers it is served with."""
+
+    path: Path
+    size: int
+    media_type: str
+    etag: str
+    last_modified: str
+
+
+# Downloads ``file_id`` to the given path; returns (content type, Last-Modified)
+Downloader = Callable[[str, str], Awaitable[tuple[str, Optional[str]]]]
+
+
+async def download_from_drive(file_id: str, destination: str) -> tuple[str, Optional[str]]:
+    """Fetch the whole file from Google Drive into ``destination``.
+
+    Raises:
+        UpstreamError: If Drive answers with a non-200 status
+        httpx.HTTPError: On network errors and timeouts
+    """
+    url = f"{settings.DRIVE_DOWNLOAD_URL}&id={file_id}"
+    async with upstream_http.client.stream("GET", url) as response:
+        if response.status_code != 200:
+            raise UpstreamError(
+                f"Không thể tải audio từ Google Drive (status {response.status_code})",
+                status_code=response.status_code,
+            )
+        async with await anyio.open_file(destination, "wb") as out:
+            async for chunk in response.aiter_bytes(DOWNLOAD_CHUNK_SIZE):
+                await out.write(chunk)
+        return (
+            response.headers.get("Content-Type", "audio/mpeg"),
+            response.headers.get("Last-Modified"),
+        )
+
+
+class DriveAudioCache:
+    """LRU cache of whole Drive files under ``root``, bounded by ``max_bytes``.
+
+    Each entry is ``<file_id>`` (the audio) plus ``<file_id>.json`` (content
+    type, ETag, Last-Modified). Recency is kept in memory and mirrored to the
+    file's mtime so the LRU order survives restarts and is shared by every
+    process using the same ``root``.
+    """
+
+    def __init__(self, root: str, max_bytes: int, downloader: Downloader = download_from_drive) -> None:
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.downloader = downloader
+        self.hits = 0
+        self.misses = 0
+        self.bytes_saved = 0
+        self.total_bytes = 0
+        self._entries: Optional[OrderedDict[str, int]] = None
+        self._inflight: dict[str, asyncio.Task] = {}
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def _load_index(self) -> OrderedDict[str, int]:
+        if self._entries is None:
+            self._set_index(self._scan())
+        return self._entries
+
+    def _set_index(self, entries: OrderedDict[str, int]) -> None:
+        self._entries = entries
+        self.total_bytes = sum(entries.values())
+
+    def _scan(self) -> OrderedDict[str, int]:
+        """Cached files on disk, least recently used first."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        files = []
+        for path in self.root.iterdir():
+            if not (FILE_ID_PATTERN.match(path.name) and path.with_suffix(".json").is_file()):
+                continue
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                # Evicted by another worker meanwhile
+                continue
+            files.append((stat.st_mtime_ns, path.name, stat.st_size))
+        files.sort()
+        return OrderedDict((name, size) for _, name, size in files)
+
+    def _read_entry(self, file_id: str) -> Optional[CachedAudio]:
+        path = self.root / file_id
+        try:
+            meta = json.loads(path.with_suffix(".json").read_text())
+            size = path.stat().st_size
+        except (OSError, ValueError):
+            return None
+        return CachedAudio(path, size, meta["media_type"], meta["etag"], meta["last_modified"])
+
+    async def get(self, file_id: str) -> CachedAudio:
+        """Return the cached file, downloading it on a miss.
+
+        Raises:
+            ValueError: If ``file_id`` is not a valid Drive file id
+            UpstreamError / httpx.HTTPError: If the download failed
+        """
+        if not FILE_ID_PATTERN.match(file_id):
+            raise ValueError(f"Invalid file id '{file_id}'")
+        entries = self._load_index()
+
+        if file_id in entries:
+            entry = await run_in_threadpool(self._read_entry, file_id)
+            if entry is not None:
+                entries.move_to_end(file_id)
+                self._record_hit(entry)
+                await run_in_threadpool(os.utime, entry.path)
+                return entry
+            self.total_bytes -= entries.pop(file_id)
+
+        fetch = self._inflight.get(file_id)
+        if fetch is not None:
+            # Someone is already downloading this file; share the result
+            entry = await asyncio.shield(fetch)
+            self._record_hit(entry)
+            return entry
+
+        self.misses += 1
+        metrics.increment("drive_audio_cache_misses_total")
+        # The download runs in its own task so a requester that disconnects
+        # (and is cancelled) neither aborts nor fails it for the others
+        fetch = asyncio.create_task(self._fetch(file_id), name=f"drive-audio-{file_id}")
+        self._inflight[file_id] = fetch
+        fetch.add_done_callback(lambda task: self._fetch_done(file_id, task))
+        return await asyncio.shield(fetch)
+
+    async def _fetch(self, file_id: str) -> CachedAudio:
+        """Download ``file_id``, add it to the index and evict down to ``max_bytes``."""
+        entry = await self._download(file_id)
+        # Re-read the directory so files cached by other workers are counted
+        entries = await run_in_threadpool(self._scan)
+        entries[file_id] = entry.size
+        entries.move_to_end(file_id)
+        self._set_index(entries)
+        victims = self._pick_victims(keep=file_id)
+        if victims:
+            await run_in_threadpool(self._remove_files, victims)
+        return entry
+
+    def _fetch_done(self, file_id: str, task: asyncio.Task) -> None:
+        if self._inflight.get(file_id) is task:
+            del self._inflight[file_id]
+        if not task.cancelled():
+            # Mark a failure as retrieved when every requester went away
+            task.exception()
+
+    def _record_hit(self, entry: CachedAudio) -> None:
+        self.hits += 1
+        self.bytes_saved += entry.size
+        metrics.increment("drive_audio_cache_hits_total")
+        metrics.increment("drive_audio_cache_bytes_saved_total", entry.size)
+
+    async def _download(self, file_id: str) -> CachedAudio:
+        started = time.monotonic()
+        fd, tmp_path = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+        os.close(fd)
+        try:
+            media_type, last_modified = await self.downloader(file_id, tmp_path)
+            entry = await run_in_threadpool(self._store, file_id, tmp_path, media_type, last_modified)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+        logger.info(
+            f"Cached Drive file {file_id} ({entry.size / 1024:.1f} KB in {time.monotonic() - started:.2f}s)"
+        )
+        return entry
+
+    def _store(
+        self, file_id: str, tmp_path: str, media_type: str, last_modified: Optional[str]
+    ) -> CachedAudio:
+        """Hash the downloaded file, write its metadata and move it into place."""
+        digest = hashlib.sha256()
+        with open(tmp_path, "rb") as downloaded:
+            while chunk := downloaded.read(DOWNLOAD_CHUNK_SIZE):
+                digest.update(chunk)
+        path = self.root / file_id
+        meta = {
+            "media_type": media_type,
+            "etag": f'"{digest.hexdigest()[:32]}"',
+            "last_modified": last_modified or formatdate(time.time(), usegmt=True),
+        }
+        path.with_suffix(".json").write_text(json.dumps(meta))
+        os.replace(tmp_path, path)
+        return CachedAudio(path, path.stat().st_size, meta["media_type"], meta["etag"], meta["last_modified"])
+
+    def _pick_victims(self, keep: str) -> list[str]:
+        """Drop least recently used entries until the cache fits ``max_bytes``."""
+        entries = self._entries
+        victims = []
+        for file_id in list(entries):
+            if self.total_bytes <= self.max_bytes:
+                break
+            if file_id != keep:
+                self.total_bytes -= entries.pop(file_id)
+                victims.append(file_id)
+        return victims
+
+    def _remove_files(self, file_ids: list[str]) -> None:
+        for file_id in file_ids:
+            path = self.root / file_id
+            path.unlink(missing_ok=True)
+            path.with_suffix(".json").unlink(missing_ok=True)
+            metrics.increment("drive_audio_cache_evictions_total")
+
+
+drive_audio_cache = DriveAudioCache(settings.DRIVE_AUDIO_CACHE_DIR, settings.DRIVE_AUDIO_CACHE_MAX_BYTES)
+metrics.register_gauge("drive_audio_cache_hit_ratio", lambda: drive_audio_cache.hit_ratio)
+metrics.register_gauge("drive_audio_cache_bytes", lambda: drive_audio_cache.total_bytes)
+
+
+__all__ = [
+    "CachedAudio",
+    "DriveAudioCache",
+    "UpstreamError",
+    "download_from_drive",
+    "drive_audio_cache",
+]
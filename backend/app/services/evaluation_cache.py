@@ -0,0 +1,201 @@
+"""Content-addressed cache of AI evaluation results.
+
+Flaky clients resubmit the exact same recording for the same sentence; the
+cache key is a hash of the decoded PCM plus the sentence id and prompt
+version, so a resubmission reuses the previous model output instead of
+paying for another call.
+"""
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from typing import Any, Optional, Protocol
+
+from cachetools import TTLCache
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.services.audio_service import DecodedAudio
+
+logger = logging.getLogger(__name__)
+
+
+class CacheBackend(Protocol):
+    """Storage used by ``EvaluationCache``."""
+
+    def get(self, key: str) -> Optional[dict[str, Any]]: ...
+
+    def set(self, key: str, value: dict[str, Any]) -> None: ...
+
+    def clear(self) -> None: ...
+
+
+class MemoryCacheBackend:
+    """Per-process LRU cache with TTL eviction."""
+
+    def __init__(self, max_entries: int, ttl_seconds: int) -> None:
+        self._cache: TTLCache = TTLCache(maxsize=max_entries, ttl=ttl_seconds)
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[dict[str, Any]]:
+        with self._lock:
+            return self._cache.get(key)
+
+    def set(self, key: str, value: dict[str, Any]) -> None:
+        with self._lock:
+            self._cache[key] = value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+
+class SQLiteCacheBackend:
+    """LRU cache with TTL in a local SQLite file shared by all workers on a host."""
+
+    def __init__(self, path: str, max_entries: int, ttl_seconds: int) -> None:
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS evaluation_cache ("
+                " key TEXT PRIMARY KEY,"
+                " value TEXT NOT NULL,"
+                " expires_at REAL NOT NULL,"
+                " last_access REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS ix_evaluation_cache_last_access"
+                " ON evaluation_cache (last_access)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Optional[dict[str, Any]]:
+        now = time.time()
+        conn = self._connect()
+        row = conn.execute(
+            "SELECT value, expires_at FROM evaluation_cache WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        if row[1] < now:
+            conn.execute("DELETE FROM evaluation_cache WHERE key = ?", (key,))
+            return None
+        conn.execute("UPDATE evaluation_cache SET last_access = ? WHERE key = ?", (now, key))
+        return json.loads(row[0])
+
+    def set(self, key: str, value: dict[str, Any]) -> None:
+        now = time.time()
+        conn = self._connect()
+        conn.execute(
+            "INSERT OR REPLACE INTO evaluation_cache (key, value, expires_at, last_access)"
+            " VALUES (?, ?, ?, ?)",
+            (key, json.dumps(value, ensure_ascii=False), now + self.ttl_seconds, now),
+        )
+        # Expire old rows, then evict least recently used beyond the bound
+        conn.execute("DELETE FROM evaluation_cache WHERE expires_at < ?", (now,))
+        conn.execute(
+            "DELETE FROM evaluation_cache WHERE key IN ("
+            " SELECT key FROM evaluation_cache ORDER BY last_access DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,),
+        )
+
+    def clear(self) -> None:
+        self._connect().execute("DELETE FROM evaluation_cache")
+
+
+class EvaluationCache:
+    """Evaluation result cache with hit/miss accounting."""
+
+    def __init__(self, backend: Optional[CacheBackend]) -> None:
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend is not None
+
+    @staticmethod
+    def make_key(audio: DecodedAudio, sentence_id: int, prompt_version: str) -> str:
+        """Hash the decoded PCM and its format together with the request context."""
+        digest = hashlib.sha256()
+        digest.update(f"{audio.frame_rate}:{audio.channels}:{audio.sample_width}:".encode())
+        digest.update(audio.pcm)
+        digest.update(f":{sentence_id}:{prompt_version}".encode())
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[dict[str, Any]]:
+        if self.backend is None:
+            return None
+        try:
+            value = self.backend.get(key)
+        except Exception as e:  # noqa: BLE001
+            logger.warning(f"Evaluation cache lookup failed: {e}")
+            value = None
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def set(self, key: str, value: dict[str, Any]) -> None:
+        if self.backend is None:
+            return
+        try:
+            self.backend.set(key, value)
+        except Exception as e:  # noqa: BLE001
+            logger.warning(f"Evaluation cache store failed: {e}")
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+def _create_backend() -> Optional[CacheBackend]:
+    backend = settings.EVALUATION_CACHE_BACKEND.lower()
+    if backend == "memory":
+        return MemoryCacheBackend(
+            max_entries=settings.EVALUATION_CACHE_MAX_ENTRIES,
+            ttl_seconds=settings.EVALUATION_CACHE_TTL_SECONDS,
+        )
+    if backend == "sqlite":
+        return SQLiteCacheBackend(
+            path=settings.EVALUATION_CACHE_SQLITE_PATH,
+            max_entries=settings.EVALUATION_CACHE_MAX_ENTRIES,
+            ttl_seconds=settings.EVALUATION_CACHE_TTL_SECONDS,
+        )
+    if backend != "none":
+        logger.warning(f"Unknown EVALUATION_CACHE_BACKEND '{backend}', cache disabled")
+    return None
+
+
+evaluation_cache = EvaluationCache(_create_backend())
+metrics.register_gauge("evaluation_cache_hits", lambda: evaluation_cache.hits)
+metrics.register_gauge("evaluation_cache_misses", lambda: evaluation_cache.misses)
+metrics.register_gauge("evaluation_cache_hit_ratio", lambda: evaluation_cache.hit_ratio)
+
+
+__all__ = [
+    "CacheBackend",
+    "MemoryCacheBackend",
+    "SQLiteCacheBackend",
+    "EvaluationCache",
+    "evaluation_cache",
+]
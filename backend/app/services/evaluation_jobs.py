@@ -0,0 +1,235 @@
+"""Background job queue for asynchronous pronunciation evaluation.
+
+Evaluations take several seconds (audio decoding, AI scoring, DB commit).
+Instead of pinning the HTTP connection for the whole pipeline, job mode
+accepts the recording, pushes it to a bounded queue consumed by a fixed pool
+of worker tasks and lets the client poll (or subscribe via SSE) for the
+``EvaluationResponse``.
+
+Jobs and their results live in this process's memory: the API must run as a
+single worker process (``uvicorn`` without ``--workers``), otherwise a poll
+can reach a process that never saw the job. Queued jobs are lost on restart.
+"""
+
+import asyncio
+import logging
+import os
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from collections.abc import Callable
+from typing import Optional
+
+from fastapi import HTTPException
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.db.session import SessionLocal
+from app.schemas.practice import EvaluationResponse
+from app.services.evaluation_service import EvaluationService
+
+logger = logging.getLogger(__name__)
+
+
+JOB_PENDING = "pending"
+JOB_RUNNING = "running"
+JOB_SUCCEEDED = "succeeded"
+JOB_FAILED = "failed"
+
+
+class QueueFullError(Exception):
+    """Raised when the evaluation queue cannot accept more jobs."""
+
+
+@dataclass
+class EvaluationJob:
+    """State of one queued evaluation."""
+
+    job_id: str
+    user_id: int
+    sentence_id: int
+    audio_data: Optional[str]
+    status: str = JOB_PENDING
+    created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    result: Optional[EvaluationResponse] = None
+    error: Optional[str] = None
+    error_status: Optional[int] = None
+    done: asyncio.Event = field(default_factory=asyncio.Event)
+    # Called once when the job finishes (releases the submitter's admission)
+    on_finish: Optional[Callable[[], None]] = field(default=None, repr=False)
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in (JOB_SUCCEEDED, JOB_FAILED)
+
+
+class EvaluationJobQueue:
+    """Bounded in-process queue with a fixed pool of evaluation workers."""
+
+    def __init__(self, workers: int, max_queue_size: int, result_ttl_seconds: int) -> None:
+        self.workers = workers
+        self.max_queue_size = max_queue_size
+        self.result_ttl_seconds = result_ttl_seconds
+        self._queue: Optional[asyncio.Queue[EvaluationJob]] = None
+        self._jobs: dict[str, EvaluationJob] = {}
+        self._finished_at: dict[str, float] = {}
+        self._tasks: list[asyncio.Task] = []
+
+    @property
+    def depth(self) -> int:
+        """Number of jobs waiting for a worker."""
+        return self._queue.qsize() if self._queue else 0
+
+    async def start(self) -> None:
+        """Spawn the worker tasks on the running event loop."""
+        if self._tasks:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self._tasks = [
+            asyncio.create_task(self._worker(i), name=f"evaluation-worker-{i}")
+            for i in range(self.workers)
+        ]
+        logger.info(f"Started {self.workers} evaluation workers (queue size {self.max_queue_size})")
+        if os.environ.get("WEB_CONCURRENCY", "1") != "1":
+            logger.warning(
+                "Evaluation jobs are kept in process memory; with several worker "
+                "processes a job can only be polled on the process that accepted it"
+            )
+
+    async def stop(self) -> None:
+        """Cancel the workers; queued jobs that never ran are marked failed."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        for job in self._jobs.values():
+            if not job.is_finished:
+                self._finish(job, error="Server đang khởi động lại, vui lòng gửi lại bài", error_status=503)
+
+    def submit(
+        self,
+        user_id: int,
+        sentence_id: int,
+        audio_data: str,
+        on_finish: Optional[Callable[[], None]] = None,
+    ) -> EvaluationJob:
+        """Enqueue a recording for evaluation.
+
+        ``on_finish`` runs once the job has finished (not when submission fails).
+
+        Raises:
+            QueueFullError: If the queue is not running or already full
+        """
+        if self._queue is None:
+            raise QueueFullError("Evaluation workers are not running")
+
+        self._purge_expired()
+        job = EvaluationJob(
+            job_id=uuid.uuid4().hex,
+            user_id=user_id,
+            sentence_id=sentence_id,
+            audio_data=audio_data,
+            on_finish=on_finish,
+        )
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            raise QueueFullError("Evaluation queue is full") from None
+
+        self._jobs[job.job_id] = job
+        return job
+
+    def get(self, job_id: str, user_id: int) -> Optional[EvaluationJob]:
+        """Return a job if it exists and belongs to ``user_id``."""
+        self._purge_expired()
+        job = self._jobs.get(job_id)
+        if job is None or job.user_id != user_id:
+            return None
+        return job
+
+    async def _worker(self, index: int) -> None:
+        assert self._queue is not None
+        while True:
+            job = await self._queue.get()
+            try:
+                await self._run(job)
+            except asyncio.CancelledError:
+                self._finish(job, error="Job bị huỷ", error_status=503)
+                raise
+            finally:
+                self._queue.task_done()
+            # Results nobody polls again must not pile up between submissions
+            self._purge_expired()
+
+    async def _run(self, job: EvaluationJob) -> None:
+        job.status = JOB_RUNNING
+        job.started_at = datetime.now(timezone.utc)
+        try:
+            job.result = await self._evaluate(job)
+            self._finish(job)
+        except HTTPException as e:
+            self._finish(job, error=str(e.detail), error_status=e.status_code)
+        except Exception as e:  # noqa: BLE001
+            logger.error(f"Evaluation job {job.job_id} failed: {e}")
+            self._finish(job, error=f"Lỗi không xác định: {str(e)}", error_status=500)
+
+    @staticmethod
+    async def _evaluate(job: EvaluationJob) -> EvaluationResponse:
+        db = SessionLocal()
+        try:
+            return await EvaluationService(db).evaluate(job.user_id, job.sentence_id, job.audio_data)
+        finally:
+            await run_in_threadpool(db.close)
+
+    def _finish(
+        self,
+        job: EvaluationJob,
+        error: Optional[str] = None,
+        error_status: Optional[int] = None,
+    ) -> None:
+        job.status = JOB_FAILED if error else JOB_SUCCEEDED
+        job.error = error
+        job.error_status = error_status
+        job.finished_at = datetime.now(timezone.utc)
+        # Release the recording as soon as it is no longer needed
+        job.audio_data = None
+        self._finished_at.pop(job.job_id, None)
+        self._finished_at[job.job_id] = time.monotonic()
+        job.done.set()
+        on_finish, job.on_finish = job.on_finish, None
+        if on_finish is not None:
+            on_finish()
+
+    def _purge_expired(self) -> None:
+        cutoff = time.monotonic() - self.result_ttl_seconds
+        # ``_finished_at`` is in finish order, so only its head can be expired
+        while self._finished_at:
+            job_id, finished_at = next(iter(self._finished_at.items()))
+            if finished_at >= cutoff:
+                break
+            del self._finished_at[job_id]
+            self._jobs.pop(job_id, None)
+
+
+evaluation_job_queue = EvaluationJobQueue(
+    workers=settings.EVALUATION_WORKERS,
+    max_queue_size=settings.EVALUATION_QUEUE_SIZE,
+    result_ttl_seconds=settings.EVALUATION_JOB_TTL_SECONDS,
+)
+metrics.register_gauge("evaluation_queue_depth", lambda: evaluation_job_queue.depth)
+
+
+__all__ = [
+    "EvaluationJob",
+    "EvaluationJobQueue",
+    "QueueFullError",
+    "evaluation_job_queue",
+    "JOB_PENDING",
+    "JOB_RUNNING",
+    "JOB_SUCCEEDED",
+    "JOB_FAILED",
+]
@@ -0,0 +1,544 @@
+"""Service orchestrating the full pronunciation evaluation pipeline."""
+
+import asyncio
+import logging
+import math
+from collections.abc import AsyncIterator, Sequence
+from contextlib import asynccontextmanager
+from typing import Any, Optional, Tuple
+
+from fastapi import HTTPException, status
+from pydantic import ValidationError
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.db.models_practice_attempt import PracticeAttempt
+from app.schemas.practice import (
+    BatchEvaluationItemResult,
+    BatchEvaluationResponse,
+    EvaluationResponse,
+    PronunciationEvaluation,
+)
+from app.services.admission import admission_error, evaluation_admission
+from app.services.audio_service import AudioInput, AudioService, DecodedAudio
+from app.services.evaluation_cache import evaluation_cache
+from app.services.evaluator import EVALUATION_COMPLETE, PronunciationEvaluator
+from app.services.fake_evaluator import FakeEvaluator
+from app.services.gemini_service import PROMPT_VERSION, GeminiService
+from app.services.practice_service import PracticeService
+from app.services.recording_store import recording_store
+from app.utils.exceptions import AudioRejectedError, GeminiUnavailableError
+from app.utils.rate_limit import RateLimitTimeout
+
+logger = logging.getLogger(__name__)
+
+_fake_evaluator: Optional[FakeEvaluator] = None
+
+
+def create_evaluator() -> PronunciationEvaluator:
+    """Return the evaluator backend selected by ``EVALUATOR_BACKEND``."""
+    global _fake_evaluator
+    backend = settings.EVALUATOR_BACKEND.lower()
+    if backend == "fake":
+        # One shared instance so its RNG (seed) drives the whole run
+        if _fake_evaluator is None:
+            _fake_evaluator = FakeEvaluator.from_settings()
+        return _fake_evaluator
+    if backend != "gemini":
+        raise ValueError(f"Unknown EVALUATOR_BACKEND '{settings.EVALUATOR_BACKEND}'")
+    return GeminiService()
+
+
+def evaluation_cache_version() -> str:
+    """Version component of evaluation cache keys (backend + prompt version)."""
+    return f"{settings.EVALUATOR_BACKEND.lower()}:{PROMPT_VERSION}"
+
+
+class EvaluationService:
+    """Run a recording through audio processing, AI scoring and persistence.
+
+    Shared by the synchronous ``/practice/evaluate`` endpoint, its streaming
+    and batch variants and the background evaluation job workers so all of
+    them return the same ``EvaluationResponse``.
+
+    ``evaluate`` is a coroutine: blocking stages (database, audio decoding,
+    file writes) run in the thread pool while the model call is awaited
+    natively, so waiting on the AI never occupies a worker thread.
+    """
+
+    def __init__(self, db: Session) -> None:
+        self.db = db
+
+    async def evaluate(self, user_id: int, sentence_id: int, audio_data: AudioInput) -> EvaluationResponse:
+        """Chấm điểm một bản ghi âm và lưu kết quả.
+
+        Flow:
+        1. Lấy câu mục tiêu từ database
+        2. Decode audio một lần (giữ PCM trong bộ nhớ) và cắt khoảng lặng
+        3. Gửi cho Gemini AI để đánh giá và chấm điểm
+        4. Lưu file audio (tuỳ chọn) và lưu kết quả vào database
+        5. Trả về feedback chi tiết
+
+        Args:
+            user_id: ID của user
+            sentence_id: ID của câu đang luyện
+            audio_data: Audio dạng base64 (JSON) hoặc bytes/file/path (upload nhị phân)
+
+        Returns:
+            EvaluationResponse chứa kết quả đánh giá chi tiết
+
+        Raises:
+            HTTPException: Nếu một bước trong pipeline thất bại
+        """
+        practice_service, audio_service, target_sentence, audio, cache_key = await self._prepare(
+            sentence_id, audio_data
+        )
+
+        # 3. Evaluate pronunciation with the configured evaluator (Gemini AI
+        #    by default)
+        evaluation = await self._score(audio_service, sentence_id, target_sentence, audio, cache_key)
+
+        # 4. Persist the recording (optional) and save attempt to database
+        attempt = await run_in_threadpool(
+            self._persist,
+            practice_service,
+            audio,
+            user_id,
+            sentence_id,
+            target_sentence,
+            evaluation,
+        )
+
+        # 5. Prepare response
+        return self._build_response(attempt, sentence_id, target_sentence, evaluation)
+
+    async def evaluate_stream(
+        self, user_id: int, sentence_id: int, audio_data: AudioInput
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        """Chấm điểm như ``evaluate`` nhưng trả về từng phần kết quả ngay khi có.
+
+        Yields ``(field, value)`` for each top-level field of the evaluation
+        (``overall_score``, ``breakdown``, ``transcription_comparison``, then
+        the feedback sections) as soon as the model has produced it, and
+        finally ``("result", EvaluationResponse)`` once the attempt is saved.
+        The attempt is persisted exactly once, at the end.
+
+        Args:
+            user_id: ID của user
+            sentence_id: ID của câu đang luyện
+            audio_data: Audio dạng base64 (JSON) hoặc bytes/file/path (upload nhị phân)
+
+        Raises:
+            HTTPException: Nếu một bước trong pipeline thất bại
+        """
+        practice_service, audio_service, target_sentence, audio, cache_key = await self._prepare(
+            sentence_id, audio_data
+        )
+
+        evaluation = await run_in_threadpool(self._cached_evaluation, cache_key)
+        if evaluation is not None:
+            logger.info(f"Evaluation cache hit for sentence {sentence_id}")
+            for field, value in evaluation.model_dump().items():
+                yield field, value
+        else:
+            evaluator = create_evaluator()
+            try:
+                model_audio = await run_in_threadpool(audio_service.prepare_for_model, audio)
+                async for field, value in evaluator.stream_pronunciation_evaluation(
+                    target_sentence=target_sentence,
+                    audio=model_audio
+                ):
+                    if field == EVALUATION_COMPLETE:
+                        evaluation = value
+                    else:
+                        yield field, value
+            except Exception as e:
+                raise self._evaluation_error(e)
+            await run_in_threadpool(evaluation_cache.set, cache_key, evaluation.model_dump())
+
+        attempt = await run_in_threadpool(
+            self._persist,
+            practice_service,
+            audio,
+            user_id,
+            sentence_id,
+            target_sentence,
+            evaluation,
+        )
+        yield "result", self._build_response(attempt, sentence_id, target_sentence, evaluation)
+
+    async def evaluate_batch(
+        self, user_id: int, items: Sequence[Tuple[int, AudioInput]]
+    ) -> BatchEvaluationResponse:
+        """Chấm điểm nhiều câu của một bài học trong một request.
+
+        Flow:
+        1. Lấy tất cả câu mục tiêu bằng một truy vấn
+        2. Decode và chấm điểm từng bản ghi song song (tối đa
+           ``EVALUATION_BATCH_CONCURRENCY`` cùng lúc)
+        3. Lưu tất cả attempt thành công trong một transaction
+        4. Trả về kết quả theo thứ tự của request
+
+        Lỗi của một câu (câu không tồn tại, audio lỗi, AI lỗi) không ảnh hưởng
+        các câu còn lại; nếu transaction thất bại thì mọi câu đã chấm đều được
+        báo lỗi và không attempt nào được lưu.
+
+        Args:
+            user_id: ID của user
+            items: Danh sách (sentence_id, audio_data)
+
+        Returns:
+            BatchEvaluationResponse chứa kết quả từng câu
+
+        Raises:
+            HTTPException: 422 nếu số câu vượt quá ``EVALUATION_BATCH_MAX_ITEMS``
+        """
+        if len(items) > settings.EVALUATION_BATCH_MAX_ITEMS:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=f"Tối đa {settings.EVALUATION_BATCH_MAX_ITEMS} câu mỗi lần chấm",
+            )
+
+        # 1. One query for every target sentence of the batch
+        practice_service = PracticeService(self.db)
+        sentences = await run_in_threadpool(
+            practice_service.get_sentences_by_ids, [sentence_id for sentence_id, _ in items]
+        )
+
+        # 2. Score the items concurrently; the session is only used again
+        #    once every item is done
+        audio_service = AudioService()
+        semaphore = asyncio.Semaphore(max(1, settings.EVALUATION_BATCH_CONCURRENCY))
+
+        async def score_item(sentence_id: int, audio_data: AudioInput):
+            async with semaphore, self._global_admission():
+                sentence = sentences.get(sentence_id)
+                if sentence is None:
+                    raise HTTPException(
+                        status_code=status.HTTP_404_NOT_FOUND,
+                        detail=f"Không tìm thấy câu với ID {sentence_id}"
+                    )
+                audio, cache_key = await self._decode_or_400(
+                    audio_service, audio_data, sentence_id, sentence.sentence_text
+                )
+                evaluation = await self._score(
+                    audio_service, sentence_id, sentence.sentence_text, audio, cache_key
+                )
+                return sentence.sentence_text, audio, evaluation
+
+        outcomes = await asyncio.gather(
+            *(score_item(sentence_id, audio_data) for sentence_id, audio_data in items),
+            return_exceptions=True,
+        )
+
+        results: list[Optional[BatchEvaluationItemResult]] = [None] * len(items)
+        scored = []
+        for index, ((sentence_id, _), outcome) in enumerate(zip(items, outcomes)):
+            if isinstance(outcome, BaseException):
+                results[index] = self._batch_failure(index, sentence_id, outcome)
+            else:
+                scored.append((index, sentence_id, *outcome))
+
+        # 3. Persist every scored item in a single transaction
+        if scored:
+            try:
+                attempts = await run_in_threadpool(
+                    self._persist_batch, practice_service, user_id, scored
+                )
+            except HTTPException as e:
+                for index, sentence_id, *_ in scored:
+                    results[index] = self._batch_failure(index, sentence_id, e)
+            else:
+                for attempt, (index, sentence_id, target_sentence, _, evaluation) in zip(attempts, scored):
+                    results[index] = BatchEvaluationItemResult(
+                        index=index,
+                        sentence_id=sentence_id,
+                        success=True,
+                        result=self._build_response(attempt, sentence_id, target_sentence, evaluation),
+                    )
+
+        succeeded = sum(1 for result in results if result.success)
+        return BatchEvaluationResponse(
+            total=len(items),
+            succeeded=succeeded,
+            failed=len(items) - succeeded,
+            results=results,
+        )
+
+    async def _prepare(
+        self, sentence_id: int, audio_data: AudioInput
+    ) -> Tuple[PracticeService, AudioService, str, DecodedAudio, str]:
+        """Steps 1-2: load the target sentence and decode the recording.
+
+        Raises:
+            HTTPException: 404 for an unknown sentence, 400 for undecodable
+                audio, 422 for a recording rejected by the pre-flight gate
+        """
+        # 1. Get the target sentence from database
+        practice_service = PracticeService(self.db)
+        sentence = await run_in_threadpool(practice_service.get_sentence_by_id, sentence_id)
+
+        if not sentence:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Không tìm thấy câu với ID {sentence_id}"
+            )
+
+        # 2. Decode audio once, reject unusable recordings before paying for
+        #    a model call, and trim silence; every later stage reuses the
+        #    PCM in memory
+        audio_service = AudioService()
+        audio, cache_key = await self._decode_or_400(
+            audio_service, audio_data, sentence_id, sentence.sentence_text
+        )
+
+        return practice_service, audio_service, sentence.sentence_text, audio, cache_key
+
+    async def _decode_or_400(
+        self,
+        audio_service: AudioService,
+        audio_data: AudioInput,
+        sentence_id: int,
+        target_sentence: str,
+    ) -> Tuple[DecodedAudio, str]:
+        """Decode the recording and run the pre-flight gate.
+
+        Raises:
+            HTTPException: 422 for an unusable recording (reason in the
+                ``X-Audio-Rejection-Reason`` header), 400 for undecodable audio
+        """
+        try:
+            return await run_in_threadpool(
+                self._decode, audio_service, audio_data, sentence_id, target_sentence
+            )
+        except AudioRejectedError as e:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=str(e),
+                headers={"X-Audio-Rejection-Reason": e.reason},
+            )
+        except Exception as e:
+            logger.error(f"Error decoding audio: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Lỗi khi xử lý file âm thanh: {str(e)}"
+            )
+
+    async def _score(
+        self,
+        audio_service: AudioService,
+        sentence_id: int,
+        target_sentence: str,
+        audio: DecodedAudio,
+        cache_key: str,
+    ) -> PronunciationEvaluation:
+        """Step 3: evaluate with the configured backend.
+
+        Uses a compact (mono, 16 kHz, compressed) copy of the recording,
+        unless the exact same recording was already evaluated for this
+        sentence.
+
+        Raises:
+            HTTPException: 503 when the AI is saturated, 500 on other failures
+        """
+        evaluation = await run_in_threadpool(self._cached_evaluation, cache_key)
+        if evaluation is not None:
+            logger.info(f"Evaluation cache hit for sentence {sentence_id}")
+            return evaluation
+
+        evaluator = create_evaluator()
+        try:
+            model_audio = await run_in_threadpool(audio_service.prepare_for_model, audio)
+            evaluation = await evaluator.evaluate_pronunciation_with_audio_async(
+                target_sentence=target_sentence,
+                audio=model_audio
+            )
+        except Exception as e:
+            raise self._evaluation_error(e)
+        await run_in_threadpool(evaluation_cache.set, cache_key, evaluation.model_dump())
+        return evaluation
+
+    @staticmethod
+    def _evaluation_error(error: Exception) -> HTTPException:
+        """Map a failed AI evaluation to the HTTP error returned to the client."""
+        if isinstance(error, GeminiUnavailableError):
+            logger.warning(f"AI service unavailable: {error}")
+            return HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Hệ thống chấm điểm đang quá tải, vui lòng thử lại sau",
+                headers={"Retry-After": str(max(1, math.ceil(error.retry_after)))},
+            )
+        logger.error(f"Error evaluating pronunciation: {error}")
+        return HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Lỗi khi đánh giá phát âm: {str(error)}"
+        )
+
+    @staticmethod
+    @asynccontextmanager
+    async def _global_admission() -> AsyncIterator[None]:
+        """One global evaluation slot per batch item (429 when none frees up)."""
+        try:
+            await evaluation_admission.acquire_global()
+        except RateLimitTimeout as e:
+            raise admission_error(e) from None
+        try:
+            yield
+        finally:
+            evaluation_admission.release_global()
+
+    @staticmethod
+    def _batch_failure(index: int, sentence_id: int, error: BaseException) -> BatchEvaluationItemResult:
+        if isinstance(error, HTTPException):
+            error_status, detail = error.status_code, str(error.detail)
+        else:
+            logger.error(f"Unexpected error evaluating batch item {index}: {error}")
+            error_status, detail = 500, f"Lỗi không xác định: {str(error)}"
+        return BatchEvaluationItemResult(
+            index=index,
+            sentence_id=sentence_id,
+            success=False,
+            error=detail,
+            error_status=error_status,
+        )
+
+    @staticmethod
+    def _build_response(
+        attempt: PracticeAttempt,
+        sentence_id: int,
+        target_sentence: str,
+        evaluation: PronunciationEvaluation,
+    ) -> EvaluationResponse:
+        return EvaluationResponse(
+            attempt_id=attempt.attempt_id,
+            sentence_id=sentence_id,
+            target_sentence=target_sentence,
+            practiced_at=attempt.created_at,
+            **evaluation.model_dump()
+        )
+
+    @staticmethod
+    def _cached_evaluation(cache_key: str) -> Optional[PronunciationEvaluation]:
+        """Look up a cached evaluation; entries that no longer validate count as misses."""
+        cached = evaluation_cache.get(cache_key)
+        if cached is None:
+            return None
+        try:
+            return PronunciationEvaluation.model_validate(cached)
+        except ValidationError as e:
+            logger.warning(f"Discarding invalid cached evaluation: {e}")
+            return None
+
+    @staticmethod
+    def _decode(
+        audio_service: AudioService, audio_data: AudioInput, sentence_id: int, target_sentence: str
+    ) -> Tuple[DecodedAudio, str]:
+        """Decode the recording, reject unusable input, derive its cache key and trim silence."""
+        audio = audio_service.decode_audio(audio_data)
+        audio_service.preflight_check(audio, target_sentence)
+        cache_key = evaluation_cache.make_key(audio, sentence_id, evaluation_cache_version())
+        if settings.VAD_ENABLED:
+            audio = audio_service.trim_silence(audio)
+        return audio, cache_key
+
+    @staticmethod
+    def _persist(
+        practice_service: PracticeService,
+        audio: DecodedAudio,
+        user_id: int,
+        sentence_id: int,
+        target_sentence: str,
+        evaluation: PronunciationEvaluation,
+    ) -> PracticeAttempt:
+        """Save the recording (optional) and the attempt row.
+
+        Raises:
+            HTTPException: If the attempt could not be saved
+        """
+        audio_file_path = EvaluationService._save_recording(audio)
+
+        try:
+            return practice_service.save_attempt(
+                **EvaluationService._attempt_fields(
+                    user_id, sentence_id, target_sentence, audio, evaluation, audio_file_path
+                )
+            )
+        except Exception as e:
+            # The stored recording may be shared with other attempts (it is
+            # content-addressed); an unreferenced one is left to the retention job
+            logger.error(f"Error saving attempt: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Lỗi khi lưu kết quả: {str(e)}"
+            )
+
+    @staticmethod
+    def _persist_batch(
+        practice_service: PracticeService,
+        user_id: int,
+        scored: list,
+    ) -> list[PracticeAttempt]:
+        """Save the recordings (optional) and all attempt rows in one transaction.
+
+        Raises:
+            HTTPException: If the transaction failed; no attempt is saved
+        """
+        attempts = []
+        for _, sentence_id, target_sentence, audio, evaluation in scored:
+            audio_file_path = EvaluationService._save_recording(audio)
+            attempts.append(
+                EvaluationService._attempt_fields(
+                    user_id, sentence_id, target_sentence, audio, evaluation, audio_file_path
+                )
+            )
+
+        try:
+            return practice_service.save_attempts(attempts)
+        except Exception as e:
+            logger.error(f"Error saving batch attempts: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Lỗi khi lưu kết quả: {str(e)}"
+            )
+
+    @staticmethod
+    def _save_recording(audio: DecodedAudio) -> Optional[str]:
+        """Store the recording and return its key in the recording store."""
+        if not settings.SAVE_ATTEMPT_AUDIO:
+            return None
+        try:
+            return recording_store.save(audio)
+        except Exception as e:
+            # The evaluation already succeeded; keep the attempt without audio
+            logger.warning(f"Could not persist recording: {e}")
+            return None
+
+    @staticmethod
+    def _attempt_fields(
+        user_id: int,
+        sentence_id: int,
+        target_sentence: str,
+        audio: DecodedAudio,
+        evaluation: PronunciationEvaluation,
+        audio_file_path: Optional[str],
+    ) -> dict:
+        breakdown = evaluation.breakdown
+        return {
+            "user_id": user_id,
+            "sentence_id": sentence_id,
+            "target_sentence": target_sentence,
+            "overall_score": evaluation.overall_score,
+            "phoneme_accuracy": breakdown.phoneme_accuracy,
+            "word_stress": breakdown.word_stress,
+            "intonation": breakdown.intonation,
+            "fluency": breakdown.fluency,
+            "clarity": breakdown.clarity,
+            "audio_file_path": audio_file_path,
+            "audio_duration": audio.duration,
+            "transcription": evaluation.transcription,
+            "ai_feedback": evaluation.model_dump(),
+        }
+
+
+__all__ = ["EvaluationService", "create_evaluator"]
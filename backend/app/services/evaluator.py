@@ -0,0 +1,44 @@
+"""Interface implemented by pronunciation evaluation backends.
+
+``GeminiService`` is the production backend; ``FakeEvaluator`` is an offline
+stand-in for load tests. ``EvaluationService`` only talks to this protocol,
+and ``Settings.EVALUATOR_BACKEND`` picks the implementation.
+"""
+
+from collections.abc import AsyncIterator
+from typing import Any, Protocol, Tuple, Union
+
+from app.schemas.practice import PronunciationEvaluation
+from app.services.audio_service import DecodedAudio, EncodedAudio
+
+# Final item yielded by ``stream_pronunciation_evaluation``
+EVALUATION_COMPLETE = "evaluation"
+
+
+class PronunciationEvaluator(Protocol):
+    """Scores one recording against its target sentence."""
+
+    async def evaluate_pronunciation_with_audio_async(
+        self,
+        target_sentence: str,
+        audio: Union[DecodedAudio, EncodedAudio],
+    ) -> PronunciationEvaluation:
+        """Return the complete, validated evaluation.
+
+        Raises:
+            GeminiUnavailableError: If the backend is saturated or failing (503)
+            Exception: If evaluation fails
+        """
+        ...
+
+    def stream_pronunciation_evaluation(
+        self,
+        target_sentence: str,
+        audio: Union[DecodedAudio, EncodedAudio],
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        """Yield ``(field, value)`` per top-level field as it becomes available,
+        then ``(EVALUATION_COMPLETE, PronunciationEvaluation)``."""
+        ...
+
+
+__all__ = ["EVALUATION_COMPLETE", "PronunciationEvaluator"]
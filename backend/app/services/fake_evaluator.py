@@ -0,0 +1,182 @@
+"""Deterministic offline evaluator backend.
+
+Produces schema-valid evaluations without any network access so the rest of
+the pipeline (upload, decoding, VAD, database, serialization) can be
+benchmarked on an offline machine without spending model quota. Latency and
+failures are simulated from configurable distributions.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import random
+import re
+from collections.abc import AsyncIterator
+from pathlib import Path
+from typing import Any, Optional, Tuple, Union
+
+from app.core.config import settings
+from app.schemas.practice import PronunciationEvaluation
+from app.services.audio_service import DecodedAudio, EncodedAudio
+from app.services.evaluator import EVALUATION_COMPLETE
+from app.utils.exceptions import GeminiUnavailableError
+
+logger = logging.getLogger(__name__)
+
+LATENCY_DISTRIBUTIONS = ("fixed", "uniform", "normal", "lognormal")
+
+
+def _audio_digest(audio: Union[DecodedAudio, EncodedAudio]) -> bytes:
+    data = audio.pcm if isinstance(audio, DecodedAudio) else audio.data
+    return hashlib.sha256(data).digest()
+
+
+def default_evaluation(target_sentence: str, seed: int) -> PronunciationEvaluation:
+    """Plausible evaluation of ``target_sentence`` with scores derived from ``seed``."""
+    rng = random.Random(seed)
+    breakdown = {
+        name: round(rng.uniform(6.0, 9.5), 1)
+        for name in ("phoneme_accuracy", "word_stress", "intonation", "fluency", "clarity")
+    }
+    overall = round(
+        breakdown["phoneme_accuracy"] * 0.4
+        + breakdown["word_stress"] * 0.2
+        + breakdown["intonation"] * 0.2
+        + breakdown["fluency"] * 0.1
+        + breakdown["clarity"] * 0.1,
+        1,
+    )
+    label = "Xuất sắc" if overall >= 9 else "Tốt" if overall >= 7.5 else "Khá"
+    words = re.findall(r"[A-Za-z']+", target_sentence)
+    return PronunciationEvaluation(
+        transcription=target_sentence,
+        overall_score=overall,
+        score_label=label,
+        breakdown=breakdown,
+        transcription_comparison=[
+            {"word": word, "student_said": word, "status": "correct", "phonetic_issue": None}
+            for word in words
+        ],
+        strengths=["Phát âm rõ ràng", "Tốc độ nói tự nhiên"],
+        improvements=[
+            {
+                "issue": "Âm cuối chưa được phát âm rõ",
+                "example": words[-1] if words else "",
+                "phonetic": None,
+                "tip": "Chú ý bật hơi ở phụ âm cuối",
+            }
+        ],
+        suggestions=["Luyện tập thêm với tốc độ chậm"],
+        focus_phonemes=[
+            {"phoneme": "θ", "description": "Âm 'th' vô thanh", "practice_words": ["think", "three", "bath"]}
+        ],
+        encouragement="Bạn đang tiến bộ rất tốt, tiếp tục nhé!",
+    )
+
+
+class FakeEvaluator:
+    """``PronunciationEvaluator`` that never leaves the process.
+
+    The response is a pure function of the target sentence and the audio:
+    either one of the canned responses (picked by hash) or a generated one.
+    Latency is drawn from ``latency_distribution`` around ``latency_ms`` with
+    ``latency_spread`` (relative width, or sigma for lognormal); a fraction
+    ``unavailable_rate`` of calls raise ``GeminiUnavailableError`` (503) and
+    ``error_rate`` raise a generic failure (500).
+    """
+
+    def __init__(
+        self,
+        latency_ms: float = 0.0,
+        latency_distribution: str = "fixed",
+        latency_spread: float = 0.0,
+        error_rate: float = 0.0,
+        unavailable_rate: float = 0.0,
+        canned_responses: Optional[list[PronunciationEvaluation]] = None,
+        seed: Optional[int] = None,
+    ) -> None:
+        if latency_distribution not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(f"Unknown latency distribution '{latency_distribution}'")
+        self.latency_ms = latency_ms
+        self.latency_distribution = latency_distribution
+        self.latency_spread = latency_spread
+        self.error_rate = error_rate
+        self.unavailable_rate = unavailable_rate
+        self.canned_responses = canned_responses or []
+        self._rng = random.Random(seed)
+
+    @classmethod
+    def from_settings(cls) -> "FakeEvaluator":
+        canned = None
+        if settings.FAKE_EVALUATOR_RESPONSES_PATH:
+            raw = json.loads(Path(settings.FAKE_EVALUATOR_RESPONSES_PATH).read_text(encoding="utf-8"))
+            canned = [PronunciationEvaluation.model_validate(item) for item in raw]
+        return cls(
+            latency_ms=settings.FAKE_EVALUATOR_LATENCY_MS,
+            latency_distribution=settings.FAKE_EVALUATOR_LATENCY_DISTRIBUTION,
+            latency_spread=settings.FAKE_EVALUATOR_LATENCY_SPREAD,
+            error_rate=settings.FAKE_EVALUATOR_ERROR_RATE,
+            unavailable_rate=settings.FAKE_EVALUATOR_UNAVAILABLE_RATE,
+            canned_responses=canned,
+            seed=settings.FAKE_EVALUATOR_SEED,
+        )
+
+    def sample_latency(self) -> float:
+        """Simulated call latency in seconds."""
+        mean = self.latency_ms / 1000
+        spread = self.latency_spread
+        if mean <= 0 or self.latency_distribution == "fixed":
+            return max(0.0, mean)
+        if self.latency_distribution == "uniform":
+            return self._rng.uniform(mean * (1 - spread), mean * (1 + spread))
+        if self.latency_distribution == "normal":
+            return max(0.0, self._rng.gauss(mean, mean * spread))
+        # lognormal with median ``mean``: long right tail like real model calls
+        return self._rng.lognormvariate(0.0, spread) * mean
+
+    def response_for(
+        self, target_sentence: str, audio: Union[DecodedAudio, EncodedAudio]
+    ) -> PronunciationEvaluation:
+        """The deterministic answer for this sentence and recording."""
+        digest = hashlib.sha256(target_sentence.encode() + _audio_digest(audio)).digest()
+        seed = int.from_bytes(digest[:8], "big")
+        if self.canned_responses:
+            return self.canned_responses[seed % len(self.canned_responses)]
+        return default_evaluation(target_sentence, seed)
+
+    def _maybe_fail(self) -> None:
+        roll = self._rng.random()
+        if roll < self.unavailable_rate:
+            raise GeminiUnavailableError("Simulated AI overload", retry_after=1.0)
+        if roll < self.unavailable_rate + self.error_rate:
+            raise Exception("Pronunciation evaluation failed: simulated error")
+
+    async def evaluate_pronunciation_with_audio_async(
+        self,
+        target_sentence: str,
+        audio: Union[DecodedAudio, EncodedAudio],
+    ) -> PronunciationEvaluation:
+        await asyncio.sleep(self.sample_latency())
+        self._maybe_fail()
+        return self.response_for(target_sentence, audio)
+
+    async def stream_pronunciation_evaluation(
+        self,
+        target_sentence: str,
+        audio: Union[DecodedAudio, EncodedAudio],
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        evaluation = self.response_for(target_sentence, audio)
+        fields = evaluation.model_dump()
+        latency = self.sample_latency()
+        # A third of the latency before the first field, the rest spread evenly
+        await asyncio.sleep(latency / 3)
+        self._maybe_fail()
+        step = (latency * 2 / 3) / max(1, len(fields))
+        for field, value in fields.items():
+            yield field, value
+            await asyncio.sleep(step)
+        yield EVALUATION_COMPLETE, evaluation
+
+
+__all__ = ["FakeEvaluator", "default_evaluation", "LATENCY_DISTRIBUTIONS"]
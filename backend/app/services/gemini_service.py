@@ -1,169 +1,47 @@
 """Service for Gemini AI pronunciation evaluation."""
 
+import asyncio
+import io
 import json
 import logging
-from pathlib import Path
-from typing import Optional, Dict, Any
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable
+from typing import Optional, Any, Tuple, Union
 import google.generativeai as genai
+from pydantic import ValidationError
+from google.api_core import exceptions as google_exceptions
 
 from app.core.config import settings
+from app.core.metrics import metrics
+from app.schemas.practice import PronunciationEvaluation
+from app.services.audio_service import DecodedAudio, EncodedAudio
+from app.services.background_tasks import TASK_DELETE_GEMINI_FILE, background_tasks, orphan_sweeper
+from app.services.evaluator import EVALUATION_COMPLETE
+from app.services.ipa_service import IPAService, shared_ipa_cache
+from app.services.prompt_cache import PromptContextCache
+from app.utils.exceptions import GeminiUnavailableError, InvalidAIResponseError
+from app.utils.json_schema import to_gemini_schema
+from app.utils.json_stream import IncrementalJSONObjectParser
+from app.utils.rate_limit import ConcurrencyLimiter, RateLimitTimeout
+from app.utils.resilience import (
+    CIRCUIT_CLOSED,
+    CircuitBreaker,
+    CircuitOpenError,
+    LatencyTracker,
+    backoff_delay,
+    hedged,
+    retry_async,
+)
 
 logger = logging.getLogger(__name__)
 
+# Bump whenever the evaluation prompt changes; cached results are keyed on it
+PROMPT_VERSION = "v4"
 
-class GeminiService:
-    """Service for evaluating pronunciation using Google Gemini AI."""
-
-    def __init__(self):
-        """Initialize Gemini service with API key from settings."""
-        if not settings.GEMINI_API_KEY:
-            raise ValueError(
-                "GEMINI_API_KEY is not configured. "
-                "Please add it to your .env file. "
-                "Get your API key from: https://aistudio.google.com/app/apikey"
-            )
-        genai.configure(api_key=settings.GEMINI_API_KEY)
-        # Use Gemini 2.5 Flash - fastest and most capable for audio
-        self.model = genai.GenerativeModel('models/gemini-2.5-flash')
-
-    def get_phonetic_transcription(self, text: str) -> str:
-        """Get phonetic transcription for a sentence.
-        
-        Args:
-            text: English sentence to get phonetic transcription for
-            
-        Returns:
-            IPA phonetic transcription
-        """
-        # Simplified - in production you might want to use a dedicated library
-        # or API for accurate IPA transcription
-        prompt = f"Provide the IPA (International Phonetic Alphabet) transcription for: \"{text}\""
-        try:
-            response = self.model.generate_content(prompt)
-            return response.text.strip()
-        except Exception as e:
-            logger.error(f"Error getting phonetic transcription: {e}")
-            return "[IPA not available]"
-
-    def create_pronunciation_prompt(
-        self, 
-        target_sentence: str, 
-        transcription: str,
-        audio_metadata: Optional[Dict[str, Any]] = None
-    ) -> str:
-        """Create a detailed prompt for pronunciation evaluation.
-        
-        Args:
-            target_sentence: The correct sentence to compare against
-            transcription: What the student actually said (from speech recognition)
-            audio_metadata: Optional metadata about the audio (duration, clarity, etc.)
-            
-        Returns:
-            Formatted prompt string for Gemini
-        """
-        if audio_metadata is None:
-            audio_metadata = {}
-
-        phonetic = self.get_phonetic_transcription(target_sentence)
-        
-        prompt = f"""Evaluate this English pronunciation attempt by a Vietnamese student.
-
-TARGET SENTENCE (what they should say):
-"{target_sentence}"
-
-PHONETIC TRANSCRIPTION OF TARGET:
-{phonetic}
-
-STUDENT'S ACTUAL PRONUNCIATION (from speech recognition):
-"{transcription}"
-
-AUDIO METADATA:
-- Duration: {audio_metadata.get('duration', 'unknown')} seconds
-- Clarity: {audio_metadata.get('clarity', 'normal')}
-- Background noise: {audio_metadata.get('noise', 'low')}
-
-TASK:
-1. Compare the student's pronunciation with the target sentence
-2. Identify mispronounced words and phonemes
-3. Calculate an overall pronunciation score (0-10)
-4. Provide detailed feedback in Vietnamese
-5. Suggest specific improvement areas
-
-RESPONSE FORMAT (JSON):
-{{
-  "overall_score": <number 0-10, one decimal place>,
-  "score_label": "<string: 'Xuất sắc' | 'Tốt' | 'Khá' | 'Cần cải thiện'>",
-  "breakdown": {{
-    "phoneme_accuracy": <number 0-10>,
-    "word_stress": <number 0-10>,
-    "intonation": <number 0-10>,
-    "fluency": <number 0-10>,
-    "clarity": <number 0-10>
-  }},
-  "transcription_comparison": [
-    {{
-      "word": "<target word>",
-      "student_said": "<what student said>",
-      "status": "correct" | "partially_correct" | "incorrect" | "missing",
-      "phonetic_issue": "<specific phoneme problem, if any>"
-    }}
-  ],
-  "strengths": [
-    "<positive feedback point 1 in Vietnamese>",
-    "<positive feedback point 2 in Vietnamese>",
-    "<positive feedback point 3 in Vietnamese>"
-  ],
-  "improvements": [
-    {{
-      "issue": "<problem description in Vietnamese>",
-      "example": "<specific word or sound>",
-      "phonetic": "<IPA notation if applicable>",
-      "tip": "<practical advice in Vietnamese>"
-    }}
-  ],
-  "suggestions": [
-    "<general improvement suggestion 1 in Vietnamese>",
-    "<general improvement suggestion 2 in Vietnamese>",
-    "<general improvement suggestion 3 in Vietnamese>"
-  ],
-  "focus_phonemes": [
-    {{
-      "phoneme": "<IPA symbol>",
-      "description": "<Vietnamese description>",
-      "practice_words": ["<word1>", "<word2>", "<word3>"]
-    }}
-  ],
-  "encouragement": "<motivational message in Vietnamese>"
-}}
-
-Important:
-- Be specific about which sounds were mispronounced
-- All Vietnamese text should be natural and encouraging
-- Score should reflect actual performance but be slightly generous to maintain motivation
-- Identify 1-3 key areas to focus on (don't overwhelm the student)
-- Provide actionable tips, not just identification of problems
-- Response MUST be valid JSON only, no additional text"""
-
-        return prompt
+GEMINI_MODEL_NAME = "models/gemini-2.5-flash"
 
-    def evaluate_pronunciation_with_audio(
-        self,
-        target_sentence: str,
-        audio_file_path: str
-    ) -> Dict[str, Any]:
-        """Evaluate pronunciation directly from audio file using Gemini.
-        
-        Args:
-            target_sentence: The correct sentence to compare against
-            audio_file_path: Path to the audio file
-            
-        Returns:
-            Dictionary containing scores and feedback
-            
-        Raises:
-            Exception: If evaluation fails
-        """
-        system_prompt = """You are an expert English pronunciation teacher and speech evaluator with 20 years of experience teaching Vietnamese students.
+# Static part of the evaluation prompt; registered once as a context cache
+EVALUATION_SYSTEM_PROMPT = """You are an expert English pronunciation teacher and speech evaluator with 20 years of experience teaching Vietnamese students.
 
 Your role:
 - Listen to the audio and evaluate English pronunciation accuracy
@@ -189,10 +67,8 @@ Be encouraging but honest. Vietnamese learners commonly struggle with:
 
 Always respond in JSON format as specified."""
 
-        evaluation_prompt = f"""Listen to the audio recording and evaluate this English pronunciation attempt by a Vietnamese student.
-
-TARGET SENTENCE (what they should say):
-"{target_sentence}"
+EVALUATION_INSTRUCTIONS = """Listen to the audio recording and evaluate this English pronunciation attempt by a Vietnamese student.
+The target sentence (what they should say) is given together with each recording.
 
 TASK:
 1. Listen to the audio and transcribe what the student actually said
@@ -203,24 +79,24 @@ TASK:
 6. Suggest specific improvement areas
 
 RESPONSE FORMAT (JSON):
-{{
+{
   "overall_score": <number 0-10, one decimal place>,
   "score_label": "<string: 'Xuất sắc' | 'Tốt' | 'Khá' | 'Cần cải thiện'>",
   "transcription": "<what the student actually said>",
-  "breakdown": {{
+  "breakdown": {
     "phoneme_accuracy": <number 0-10>,
     "word_stress": <number 0-10>,
     "intonation": <number 0-10>,
     "fluency": <number 0-10>,
     "clarity": <number 0-10>
-  }},
+  },
   "transcription_comparison": [
-    {{
+    {
       "word": "<target word>",
       "student_said": "<what student said>",
       "status": "correct" | "partially_correct" | "incorrect" | "missing",
       "phonetic_issue": "<specific phoneme problem, if any>"
-    }}
+    }
   ],
   "strengths": [
     "<positive feedback point 1 in Vietnamese>",
@@ -228,12 +104,12 @@ RESPONSE FORMAT (JSON):
     "<positive feedback point 3 in Vietnamese>"
   ],
   "improvements": [
-    {{
+    {
       "issue": "<problem description in Vietnamese>",
       "example": "<specific word or sound>",
       "phonetic": "<IPA notation if applicable>",
       "tip": "<practical advice in Vietnamese>"
-    }}
+    }
   ],
   "suggestions": [
     "<general improvement suggestion 1 in Vietnamese>",
@@ -241,14 +117,14 @@ RESPONSE FORMAT (JSON):
     "<general improvement suggestion 3 in Vietnamese>"
   ],
   "focus_phonemes": [
-    {{
+    {
       "phoneme": "<IPA symbol>",
       "description": "<Vietnamese description>",
       "practice_words": ["<word1>", "<word2>", "<word3>"]
-    }}
+    }
   ],
   "encouragement": "<motivational message in Vietnamese>"
-}}
+}
 
 Important:
 - Listen carefully to the pronunciation in the audio
@@ -259,50 +135,545 @@ Important:
 - Provide actionable tips, not just identification of problems
 - Response MUST be valid JSON only, no additional text"""
 
-        try:
-            # Upload audio file to Gemini
-            audio_file = genai.upload_file(path=audio_file_path)
-            logger.info(f"Uploaded audio file: {audio_file.uri}")
-            
-            # Generate content with audio and prompt
-            response = self.model.generate_content([
-                system_prompt,
-                evaluation_prompt,
-                audio_file
-            ])
-            
-            response_text = response.text.strip()
+# JSON mode constrained to the evaluation schema (parsed with the same model)
+EVALUATION_GENERATION_CONFIG = {
+    "response_mime_type": "application/json",
+    "response_schema": to_gemini_schema(PronunciationEvaluation),
+}
+
+# The schema as prompt text: streaming runs without ``response_schema``, and it
+# lifts the static prompt above the explicit caching minimum
+EVALUATION_RESPONSE_SCHEMA = (
+    "RESPONSE SCHEMA (OpenAPI; every listed field must be present):\n"
+    + json.dumps(EVALUATION_GENERATION_CONFIG["response_schema"], ensure_ascii=False)
+)
+
+# Static prompt registered once as cached content, refreshed before expiry
+evaluation_prompt_cache = PromptContextCache(
+    model_name=GEMINI_MODEL_NAME,
+    display_name=f"pronunciation-evaluation-{PROMPT_VERSION}",
+    system_instruction=EVALUATION_SYSTEM_PROMPT,
+    contents=[EVALUATION_INSTRUCTIONS, EVALUATION_RESPONSE_SCHEMA],
+    ttl_seconds=settings.GEMINI_CONTEXT_CACHE_TTL_SECONDS,
+    min_tokens=settings.GEMINI_CONTEXT_CACHE_MIN_TOKENS,
+)
+
+# Streaming uses plain JSON mode so fields arrive in the prompt's order
+EVALUATION_STREAM_CONFIG = {"response_mime_type": "application/json"}
+
+# Process-wide cap on concurrent model calls and their start rate (API quota)
+gemini_call_limiter = ConcurrencyLimiter(
+    max_concurrency=settings.GEMINI_MAX_CONCURRENCY,
+    rate_per_minute=settings.GEMINI_REQUESTS_PER_MINUTE,
+    burst=settings.GEMINI_RATE_BURST,
+)
+metrics.register_gauge("gemini_calls_in_flight", lambda: gemini_call_limiter.in_flight)
+metrics.register_gauge("gemini_calls_waiting", lambda: gemini_call_limiter.waiting)
+
+# Trips when the upstream error rate spikes so requests fail fast with 503
+gemini_circuit = CircuitBreaker(
+    failure_rate=settings.GEMINI_CIRCUIT_FAILURE_RATE,
+    min_calls=settings.GEMINI_CIRCUIT_MIN_CALLS,
+    window_seconds=settings.GEMINI_CIRCUIT_WINDOW_SECONDS,
+    open_seconds=settings.GEMINI_CIRCUIT_OPEN_SECONDS,
+)
+gemini_latency = LatencyTracker()
+metrics.register_gauge("gemini_circuit_open", lambda: int(gemini_circuit.state != CIRCUIT_CLOSED))
+metrics.register_gauge(
+    "gemini_parse_failure_ratio",
+    lambda: (
+        metrics.get("gemini_parse_failures_total", reason="invalid_json")
+        + metrics.get("gemini_parse_failures_total", reason="schema_mismatch")
+    ) / max(1, metrics.get("gemini_responses_total")),
+)
+metrics.register_gauge("gemini_latency_p95_seconds", lambda: gemini_latency.percentile(95) or 0.0)
+
+# Errors worth another attempt: overload, quota, 5xx and timeouts
+RETRYABLE_ERRORS = (
+    google_exceptions.TooManyRequests,
+    google_exceptions.InternalServerError,
+    google_exceptions.BadGateway,
+    google_exceptions.ServiceUnavailable,
+    google_exceptions.GatewayTimeout,
+    google_exceptions.DeadlineExceeded,
+    asyncio.TimeoutError,
+    ConnectionError,
+    TimeoutError,
+)
+
+
+def is_retryable_error(error: BaseException) -> bool:
+    """Whether a failed Gemini call is transient and may be retried."""
+    return isinstance(error, RETRYABLE_ERRORS)
+
+
+def _record_token_usage(response: Any) -> None:
+    usage = getattr(response, "usage_metadata", None)
+    if usage is None:
+        return
+    metrics.increment("gemini_prompt_tokens_total", getattr(usage, "prompt_token_count", 0) or 0)
+    metrics.increment("gemini_cached_tokens_total", getattr(usage, "cached_content_token_count", 0) or 0)
+
+
+def _call_error(error: Exception) -> Exception:
+    """Translate a failed evaluation call into the error raised to callers."""
+    if isinstance(error, RateLimitTimeout):
+        logger.warning(f"Gemini call limiter saturated: {error}")
+        return GeminiUnavailableError(
+            "AI service is busy, please retry shortly", retry_after=error.retry_after
+        )
+    if isinstance(error, GeminiUnavailableError):
+        return error
+    if isinstance(error, CircuitOpenError):
+        metrics.increment("gemini_circuit_rejections_total")
+        return GeminiUnavailableError(
+            "AI service is temporarily unavailable", retry_after=error.retry_after
+        )
+    logger.error(f"Error evaluating pronunciation: {error}")
+    if is_retryable_error(error):
+        return GeminiUnavailableError(
+            f"AI service is temporarily unavailable: {error}",
+            retry_after=max(gemini_circuit.retry_after(), settings.GEMINI_RETRY_MAX_DELAY_SECONDS),
+        )
+    return Exception(f"Pronunciation evaluation failed: {error}")
+
+
+# Display-name prefix of audio uploaded by this app, so the orphan sweeper
+# never touches other files stored under the same API key
+UPLOAD_DISPLAY_NAME_PREFIX = "pronunciation-attempt-"
+
+
+def _delete_remote_file(file_name: str) -> None:
+    """Background task handler; raises so failed deletes are retried."""
+    try:
+        genai.delete_file(file_name)
+    except google_exceptions.NotFound:
+        return
+    logger.debug(f"Deleted uploaded audio file from Gemini: {file_name}")
+
+
+def _scan_orphaned_remote_files() -> list[tuple[str, str]]:
+    """Uploaded audio older than the orphan age (evaluations take seconds)."""
+    if not settings.GEMINI_API_KEY:
+        return []
+    cutoff = time.time() - settings.BACKGROUND_ORPHAN_MIN_AGE_SECONDS
+    return [
+        (TASK_DELETE_GEMINI_FILE, remote_file.name)
+        for remote_file in genai.list_files()
+        if (remote_file.display_name or "").startswith(UPLOAD_DISPLAY_NAME_PREFIX)
+        and remote_file.create_time.timestamp() < cutoff
+    ]
+
+
+def schedule_remote_file_cleanup(file_name: str) -> None:
+    """Delete a file uploaded to the Gemini file API in the background."""
+    background_tasks.submit(TASK_DELETE_GEMINI_FILE, file_name)
+
+
+background_tasks.register(TASK_DELETE_GEMINI_FILE, _delete_remote_file)
+orphan_sweeper.add_scanner(_scan_orphaned_remote_files)
+
+
+class GeminiService:
+    """Service for evaluating pronunciation using Google Gemini AI.
+    
+    Implements the ``PronunciationEvaluator`` protocol.
+    """
+
+    def __init__(self):
+        """Initialize Gemini service with API key from settings."""
+        if not settings.GEMINI_API_KEY:
+            raise ValueError(
+                "GEMINI_API_KEY is not configured. "
+                "Please add it to your .env file. "
+                "Get your API key from: https://aistudio.google.com/app/apikey"
+            )
+        genai.configure(api_key=settings.GEMINI_API_KEY)
+        # Use Gemini 2.5 Flash - fastest and most capable for audio
+        self.model = genai.GenerativeModel(GEMINI_MODEL_NAME)
+
+    def get_phonetic_transcription(self, text: str) -> str:
+        """Get phonetic transcription for a sentence.
+        
+        Words are transcribed locally with ``eng_to_ipa`` first, then looked
+        up in the shared persistent IPA word cache; only words missing from
+        both are sent to the model (one call for all of them) and cached.
+        
+        Args:
+            text: English sentence to get phonetic transcription for
             
-            # Remove markdown code blocks if present
-            if response_text.startswith("```json"):
-                response_text = response_text[7:]
-            if response_text.startswith("```"):
-                response_text = response_text[3:]
-            if response_text.endswith("```"):
-                response_text = response_text[:-3]
+        Returns:
+            IPA phonetic transcription
+        """
+        try:
+            return IPAService(shared_ipa_cache(), fallback=self.transcribe_words_ipa).transcribe(text)
+        except Exception as e:
+            logger.error(f"Error getting phonetic transcription: {e}")
+            return "[IPA not available]"
+
+    def transcribe_words_ipa(self, words: list[str]) -> dict[str, str]:
+        """Ask the model for the IPA of words the local dictionary does not know.
+        
+        Args:
+            words: Lower-cased English words
             
-            response_text = response_text.strip()
+        Returns:
+            Dict word -> IPA (words the model skipped are missing)
+        """
+        prompt = (
+            "Give the General American IPA transcription, with primary and "
+            "secondary stress marks, of each of these English words. Answer "
+            "with a JSON object mapping each word exactly as written to its "
+            "IPA string, without slashes or brackets.\n\n"
+            + json.dumps(words)
+        )
+        response = self.model.generate_content(
+            prompt, generation_config={"response_mime_type": "application/json"}
+        )
+        _record_token_usage(response)
+        answer = json.loads(response.text)
+        if not isinstance(answer, dict):
+            raise InvalidAIResponseError("IPA answer is not a JSON object")
+        return {
+            str(word).lower(): ipa.strip().strip("/[]")
+            for word, ipa in answer.items()
+            if isinstance(ipa, str) and ipa.strip()
+        }
+
+    def _build_audio_part(
+        self,
+        audio: Union[DecodedAudio, EncodedAudio],
+    ) -> Tuple[Any, Optional[Any]]:
+        """Build the audio part of the request.
+        
+        Clips up to ``GEMINI_INLINE_AUDIO_MAX_BYTES`` are sent inline with the
+        request; only larger recordings go through the file API.
+        
+        Returns:
+            Tuple of (content part, uploaded file or None)
+        """
+        mime_type = "audio/wav"
+        if isinstance(audio, EncodedAudio):
+            audio_bytes = audio.data
+            mime_type = audio.mime_type
+        else:
+            audio_bytes = audio.to_wav_bytes()
+        
+        if len(audio_bytes) <= settings.GEMINI_INLINE_AUDIO_MAX_BYTES:
+            logger.debug(f"Sending audio inline ({len(audio_bytes) / 1024:.1f} KB, {mime_type})")
+            return {"mime_type": mime_type, "data": audio_bytes}, None
+        
+        audio_file = genai.upload_file(
+            path=io.BytesIO(audio_bytes),
+            mime_type=mime_type,
+            display_name=f"{UPLOAD_DISPLAY_NAME_PREFIX}{time.time_ns()}",
+        )
+        logger.debug(f"Uploaded audio file: {audio_file.uri}")
+        return audio_file, audio_file
+
+    @staticmethod
+    def _build_sentence_prompt(target_sentence: str) -> str:
+        """Per-call part of the evaluation prompt (sent fresh every time)."""
+        return (
+            f"Prompt version: {PROMPT_VERSION}\n\n"
+            f"TARGET SENTENCE (what they should say):\n"
+            f'"{target_sentence}"'
+        )
+
+    def _build_evaluation_prompts(self, target_sentence: str) -> Tuple[str, str]:
+        """Build the full (system prompt, evaluation prompt) pair for one sentence."""
+        evaluation_prompt = (
+            f"{EVALUATION_INSTRUCTIONS}\n\n{EVALUATION_RESPONSE_SCHEMA}\n\n"
+            f"{self._build_sentence_prompt(target_sentence)}"
+        )
+        return EVALUATION_SYSTEM_PROMPT, evaluation_prompt
+
+    @staticmethod
+    def _parse_evaluation_text(response_text: str) -> PronunciationEvaluation:
+        """Parse and validate the model's JSON answer in one pass.
+        
+        Markdown code fences are still tolerated in case the model ignores
+        JSON mode.
+        
+        Raises:
+            InvalidAIResponseError: If the text is not valid JSON or does not
+                match ``PronunciationEvaluation``
+        """
+        metrics.increment("gemini_responses_total")
+        response_text = response_text.strip()
+        
+        # Remove markdown code blocks if present
+        if response_text.startswith("```json"):
+            response_text = response_text[7:]
+        if response_text.startswith("```"):
+            response_text = response_text[3:]
+        if response_text.endswith("```"):
+            response_text = response_text[:-3]
+        
+        try:
+            return PronunciationEvaluation.model_validate_json(response_text.strip())
+        except ValidationError as e:
+            invalid_json = any(err["type"] == "json_invalid" for err in e.errors())
+            reason = "invalid_json" if invalid_json else "schema_mismatch"
+            metrics.increment("gemini_parse_failures_total", reason=reason)
+            logger.error(f"Invalid Gemini evaluation response ({reason}): {e}")
+            logger.error(f"Response text: {response_text}")
+            raise InvalidAIResponseError(f"Invalid JSON response from AI: {e}") from None
+
+    async def evaluate_pronunciation_with_audio_async(
+        self,
+        target_sentence: str,
+        audio: Union[DecodedAudio, EncodedAudio],
+    ) -> PronunciationEvaluation:
+        """Evaluate pronunciation directly from audio using Gemini.
+        
+        Uses the SDK's ``generate_content_async`` so the event loop is never
+        blocked, and goes through ``gemini_call_limiter``: at most
+        ``GEMINI_MAX_CONCURRENCY`` calls in flight, started at no more than
+        ``GEMINI_REQUESTS_PER_MINUTE``. Excess calls wait up to
+        ``GEMINI_QUEUE_TIMEOUT_SECONDS`` for a slot.
+        
+        The model is constrained to JSON matching ``PronunciationEvaluation``;
+        an answer that still fails validation is re-requested up to
+        ``GEMINI_PARSE_ATTEMPTS`` times in total.
+        
+        The static prompt is served from ``evaluation_prompt_cache`` (context
+        caching) when available, so only the target sentence is sent fresh.
+        
+        Transient upstream errors (5xx, 429, timeouts) are retried with
+        jittered exponential backoff; slow calls can be hedged with a second
+        attempt once the observed p95 latency is exceeded; and while the
+        upstream error rate is high ``gemini_circuit`` rejects calls
+        immediately.
+        
+        Args:
+            target_sentence: The correct sentence to compare against
+            audio: Decoded or model-ready encoded audio
             
-            # Parse JSON response
-            evaluation_result = json.loads(response_text)
+        Returns:
+            Validated evaluation (scores and feedback)
             
-            # Clean up uploaded file
+        Raises:
+            GeminiUnavailableError: If the AI service is saturated or failing
+            Exception: If evaluation fails
+        """
+        if gemini_circuit.is_open():
+            metrics.increment("gemini_circuit_rejections_total")
+            raise GeminiUnavailableError(
+                "AI service is temporarily unavailable", retry_after=gemini_circuit.retry_after()
+            )
+        
+        try:
+            # Only large clips hit the (blocking) file API
+            audio_part, uploaded_file = await self._with_retry(
+                lambda: asyncio.to_thread(self._build_audio_part, audio)
+            )
             try:
-                genai.delete_file(audio_file.name)
-                logger.info(f"Deleted uploaded audio file from Gemini")
-            except Exception as e:
-                logger.warning(f"Could not delete uploaded file: {e}")
-            
-            logger.info(f"Successfully evaluated pronunciation for: {target_sentence}")
-            return evaluation_result
-            
-        except json.JSONDecodeError as e:
-            logger.error(f"Failed to parse Gemini response as JSON: {e}")
-            logger.error(f"Response text: {response_text}")
-            raise Exception(f"Invalid JSON response from AI: {e}")
+                for attempt in range(1, settings.GEMINI_PARSE_ATTEMPTS + 1):
+                    model, contents = await self._evaluation_request(target_sentence, audio_part)
+                    try:
+                        response = await self._call_with_resilience(model, contents)
+                    except google_exceptions.NotFound:
+                        if model is self.model:
+                            raise
+                        # The context cache expired or was deleted server-side
+                        logger.warning("Context cache missing upstream, resending full prompt")
+                        evaluation_prompt_cache.invalidate()
+                        model, contents = self._uncached_request(target_sentence, audio_part)
+                        response = await self._call_with_resilience(model, contents)
+                    try:
+                        evaluation = self._parse_evaluation_text(response.text)
+                        break
+                    except InvalidAIResponseError:
+                        # The call was paid for but its output is unusable
+                        metrics.increment("gemini_wasted_calls_total")
+                        if attempt == settings.GEMINI_PARSE_ATTEMPTS:
+                            raise
+            finally:
+                if uploaded_file is not None:
+                    schedule_remote_file_cleanup(uploaded_file.name)
         except Exception as e:
-            logger.error(f"Error evaluating pronunciation: {e}")
-            raise Exception(f"Pronunciation evaluation failed: {e}")
+            raise _call_error(e) from e
+        
+        logger.info(f"Successfully evaluated pronunciation for: {target_sentence} (prompt {PROMPT_VERSION})")
+        return evaluation
+
+    async def stream_pronunciation_evaluation(
+        self,
+        target_sentence: str,
+        audio: Union[DecodedAudio, EncodedAudio],
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        """Streaming variant of ``evaluate_pronunciation_with_audio_async``.
+        
+        Uses ``generate_content_async(stream=True)`` and an incremental JSON
+        parser to yield ``(field, value)`` for each top-level field as soon as
+        it is complete, then ``(EVALUATION_COMPLETE, PronunciationEvaluation)``
+        with the validated full answer.
+        
+        JSON mode is used without a response schema here: with a schema the
+        API orders properties alphabetically, whereas the prompt's order puts
+        ``overall_score`` and ``breakdown`` first. The final answer is still
+        validated against ``PronunciationEvaluation``.
+        
+        Only failures before the first chunk are retried, since streamed
+        fields may already have reached the client.
+        
+        Raises:
+            GeminiUnavailableError: If the AI service is saturated or failing
+            Exception: If evaluation fails
+        """
+        if gemini_circuit.is_open():
+            metrics.increment("gemini_circuit_rejections_total")
+            raise GeminiUnavailableError(
+                "AI service is temporarily unavailable", retry_after=gemini_circuit.retry_after()
+            )
+        
+        try:
+            audio_part, uploaded_file = await self._with_retry(
+                lambda: asyncio.to_thread(self._build_audio_part, audio)
+            )
+            try:
+                model, contents = await self._evaluation_request(target_sentence, audio_part)
+                parser = IncrementalJSONObjectParser()
+                text_parts: list[str] = []
+                attempt = 0
+                while True:
+                    try:
+                        async for text in self._stream_once(model, contents):
+                            text_parts.append(text)
+                            for field, value in parser.feed(text):
+                                yield field, value
+                        break
+                    except Exception as e:
+                        attempt += 1
+                        if text_parts or attempt >= settings.GEMINI_RETRY_ATTEMPTS:
+                            raise
+                        if isinstance(e, google_exceptions.NotFound) and model is not self.model:
+                            logger.warning("Context cache missing upstream, resending full prompt")
+                            evaluation_prompt_cache.invalidate()
+                            model, contents = self._uncached_request(target_sentence, audio_part)
+                        elif is_retryable_error(e):
+                            metrics.increment("gemini_retries_total")
+                            await asyncio.sleep(backoff_delay(
+                                attempt - 1,
+                                settings.GEMINI_RETRY_BASE_DELAY_SECONDS,
+                                settings.GEMINI_RETRY_MAX_DELAY_SECONDS,
+                            ))
+                        else:
+                            raise
+                
+                try:
+                    evaluation = self._parse_evaluation_text("".join(text_parts))
+                except InvalidAIResponseError:
+                    metrics.increment("gemini_wasted_calls_total")
+                    raise
+            finally:
+                if uploaded_file is not None:
+                    schedule_remote_file_cleanup(uploaded_file.name)
+        except Exception as e:
+            raise _call_error(e) from e
+        
+        logger.info(f"Successfully streamed evaluation for: {target_sentence} (prompt {PROMPT_VERSION})")
+        yield EVALUATION_COMPLETE, evaluation
+
+    async def _evaluation_request(
+        self, target_sentence: str, audio_part: Any
+    ) -> Tuple[genai.GenerativeModel, list]:
+        """Pick the model and contents for one evaluation call.
+        
+        With a live context cache only the per-sentence prompt and the audio
+        are sent; otherwise the full prompt goes with every call.
+        """
+        if settings.GEMINI_CONTEXT_CACHE_ENABLED:
+            cached = await asyncio.to_thread(evaluation_prompt_cache.get)
+            if cached is not None:
+                # No base generation config: the SDK merges the per-call config
+                # on top of it, so a base schema would also constrain streaming
+                model = genai.GenerativeModel.from_cached_content(cached)
+                return model, [self._build_sentence_prompt(target_sentence), audio_part]
+        return self._uncached_request(target_sentence, audio_part)
+
+    def _uncached_request(self, target_sentence: str, audio_part: Any) -> Tuple[genai.GenerativeModel, list]:
+        system_prompt, evaluation_prompt = self._build_evaluation_prompts(target_sentence)
+        return self.model, [system_prompt, evaluation_prompt, audio_part]
+
+    async def _call_with_resilience(self, model: genai.GenerativeModel, contents: list) -> Any:
+        return await self._with_retry(
+            lambda: hedged(
+                lambda: self._generate_once(model, contents),
+                delay=self._hedge_delay(),
+                on_hedge=lambda: metrics.increment("gemini_hedged_requests_total"),
+            )
+        )
+
+    async def _stream_once(self, model: genai.GenerativeModel, contents: list) -> AsyncIterator[str]:
+        """One streaming model call, yielding text chunks (same bookkeeping as ``_generate_once``)."""
+        gemini_circuit.before_call()
+        async with gemini_call_limiter.slot(timeout=settings.GEMINI_QUEUE_TIMEOUT_SECONDS):
+            started = time.monotonic()
+            try:
+                response = await model.generate_content_async(
+                    contents, generation_config=EVALUATION_STREAM_CONFIG, stream=True
+                )
+                async for chunk in response:
+                    yield chunk.text
+            except Exception as e:
+                if is_retryable_error(e):
+                    gemini_circuit.record_failure()
+                else:
+                    gemini_circuit.record_success()
+                raise
+            gemini_latency.record(time.monotonic() - started)
+            gemini_circuit.record_success()
+            _record_token_usage(response)
+
+    async def _generate_once(self, model: genai.GenerativeModel, contents: list) -> Any:
+        """One model call: circuit check, limiter slot, latency and outcome tracking."""
+        gemini_circuit.before_call()
+        async with gemini_call_limiter.slot(timeout=settings.GEMINI_QUEUE_TIMEOUT_SECONDS):
+            started = time.monotonic()
+            try:
+                response = await model.generate_content_async(
+                    contents, generation_config=EVALUATION_GENERATION_CONFIG
+                )
+            except Exception as e:
+                if is_retryable_error(e):
+                    gemini_circuit.record_failure()
+                else:
+                    # The upstream answered; a bad request is not a sign of an outage
+                    gemini_circuit.record_success()
+                raise
+            gemini_latency.record(time.monotonic() - started)
+            gemini_circuit.record_success()
+            _record_token_usage(response)
+            return response
+
+    async def _with_retry(self, call: Callable[[], Awaitable[Any]]) -> Any:
+        def _log_retry(attempt: int, error: BaseException) -> None:
+            metrics.increment("gemini_retries_total")
+            logger.warning(f"Retrying Gemini call (attempt {attempt + 1}) after: {error}")
+
+        return await retry_async(
+            call,
+            is_retryable=is_retryable_error,
+            attempts=settings.GEMINI_RETRY_ATTEMPTS,
+            base_delay=settings.GEMINI_RETRY_BASE_DELAY_SECONDS,
+            max_delay=settings.GEMINI_RETRY_MAX_DELAY_SECONDS,
+            on_retry=_log_retry,
+        )
+
+    @staticmethod
+    def _hedge_delay() -> Optional[float]:
+        """p95 latency once enough samples exist, if hedging is enabled."""
+        if not settings.GEMINI_HEDGE_ENABLED or len(gemini_latency) < settings.GEMINI_HEDGE_MIN_SAMPLES:
+            return None
+        return gemini_latency.percentile(95)
 
 
-__all__ = ["GeminiService"]
+__all__ = [
+    "GeminiService",
+    "PROMPT_VERSION",
+    "gemini_call_limiter",
+    "gemini_circuit",
+    "is_retryable_error",
+]
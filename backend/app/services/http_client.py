@@ -0,0 +1,69 @@
+"""Shared asynchronous HTTP client for upstream calls (Google Drive).
+
+One pooled ``httpx.AsyncClient`` per process keeps connections alive across
+requests and never blocks the event loop. It is opened in the application
+startup hook and closed on shutdown; code running outside the app (tests,
+scripts) gets a lazily created client.
+"""
+
+import logging
+from typing import Optional
+
+import httpx
+
+from app.core.config import settings
+
+try:
+    import h2  # noqa: F401
+    H2_AVAILABLE = True
+except ImportError:
+    H2_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+class SharedHTTPClient:
+    """Owns the process-wide ``httpx.AsyncClient``."""
+
+    def __init__(self) -> None:
+        self._client: Optional[httpx.AsyncClient] = None
+
+    @staticmethod
+    def _create() -> httpx.AsyncClient:
+        http2 = settings.HTTP_CLIENT_HTTP2 and H2_AVAILABLE
+        if settings.HTTP_CLIENT_HTTP2 and not H2_AVAILABLE:
+            logger.info("h2 not installed - upstream HTTP client uses HTTP/1.1")
+        return httpx.AsyncClient(
+            http2=http2,
+            follow_redirects=True,
+            timeout=httpx.Timeout(
+                settings.HTTP_CLIENT_READ_TIMEOUT_SECONDS,
+                connect=settings.HTTP_CLIENT_CONNECT_TIMEOUT_SECONDS,
+                pool=settings.HTTP_CLIENT_POOL_TIMEOUT_SECONDS,
+            ),
+            limits=httpx.Limits(
+                max_connections=settings.HTTP_CLIENT_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.HTTP_CLIENT_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=settings.HTTP_CLIENT_KEEPALIVE_EXPIRY_SECONDS,
+            ),
+        )
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = self._create()
+        return self._client
+
+    async def start(self) -> None:
+        self.client
+
+    async def stop(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+upstream_http = SharedHTTPClient()
+
+
+__all__ = ["H2_AVAILABLE", "SharedHTTPClient", "upstream_http"]
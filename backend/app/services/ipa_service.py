@@ -0,0 +1,186 @@
+"""Local IPA transcription for practice sentences.
+
+Words are looked up in the CMU dictionary through ``eng_to_ipa``; only the
+words it does not know are sent to a fallback (the Gemini model), and those
+answers are memoized in a persistent word-to-IPA cache so each unknown word
+is paid for once.
+"""
+
+import functools
+import logging
+import re
+import sqlite3
+import threading
+from collections.abc import Callable, Iterable
+from typing import Optional
+
+from app.core.config import settings
+
+try:
+    import eng_to_ipa
+    ENG_TO_IPA_AVAILABLE = True
+except ImportError:
+    ENG_TO_IPA_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Words (with inner apostrophes, e.g. "don't") that receive a transcription
+WORD_PATTERN = re.compile(r"[A-Za-z]+(?:'[A-Za-z]+)*")
+
+# ``eng_to_ipa`` marks words missing from the CMU dictionary with this suffix
+UNKNOWN_WORD_MARKER = "*"
+
+# Resolves words the dictionary does not know; returns word -> IPA
+IPAFallback = Callable[[list[str]], dict[str, str]]
+
+
+class IPAWordCache:
+    """Persistent word-to-IPA map in a local SQLite file."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._local = threading.local()
+        self._connect().execute(
+            "CREATE TABLE IF NOT EXISTS ipa_words ("
+            " word TEXT PRIMARY KEY,"
+            " ipa TEXT NOT NULL)"
+        )
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def get_many(self, words: Iterable[str]) -> dict[str, str]:
+        words = list(words)
+        found: dict[str, str] = {}
+        conn = self._connect()
+        # Stay below SQLite's bound-parameter limit
+        for start in range(0, len(words), 500):
+            chunk = words[start:start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            rows = conn.execute(
+                f"SELECT word, ipa FROM ipa_words WHERE word IN ({placeholders})", chunk
+            )
+            found.update(rows.fetchall())
+        return found
+
+    def set_many(self, entries: dict[str, str]) -> None:
+        if entries:
+            self._connect().executemany(
+                "INSERT OR REPLACE INTO ipa_words (word, ipa) VALUES (?, ?)", entries.items()
+            )
+
+
+class IPAService:
+    """Transcribe English text to IPA, dictionary first, fallback for the rest."""
+
+    def __init__(
+        self,
+        cache: Optional[IPAWordCache] = None,
+        fallback: Optional[IPAFallback] = None,
+    ) -> None:
+        self.cache = cache
+        self.fallback = fallback
+        self.dictionary_words = 0
+        self.cached_words = 0
+        self.fallback_words = 0
+        self.unresolved_words = 0
+
+    @staticmethod
+    def _dictionary_lookup(words: list[str]) -> dict[str, str]:
+        if not ENG_TO_IPA_AVAILABLE or not words:
+            return {}
+        converted = eng_to_ipa.convert(" ".join(words)).split(" ")
+        if len(converted) != len(words):
+            # Tokenization differed; fall back to one lookup per word
+            converted = [eng_to_ipa.convert(word) for word in words]
+        return {
+            word: ipa for word, ipa in zip(words, converted)
+            if ipa and not ipa.endswith(UNKNOWN_WORD_MARKER)
+        }
+
+    def transcribe_words(self, words: Iterable[str]) -> dict[str, str]:
+        """IPA for each distinct (lower-cased) word that could be resolved.
+
+        Lookup order: CMU dictionary, persistent cache, then one fallback
+        call for everything still missing (whose answers are cached).
+        """
+        pending = sorted({word.lower() for word in words})
+        resolved = self._dictionary_lookup(pending)
+        self.dictionary_words += len(resolved)
+        pending = [word for word in pending if word not in resolved]
+
+        if pending and self.cache is not None:
+            cached = self.cache.get_many(pending)
+            self.cached_words += len(cached)
+            resolved.update(cached)
+            pending = [word for word in pending if word not in cached]
+
+        if pending and self.fallback is not None:
+            try:
+                answered = {
+                    word: ipa for word, ipa in self.fallback(pending).items()
+                    if word in pending and ipa
+                }
+            except Exception as e:  # noqa: BLE001
+                logger.warning(f"IPA fallback failed for {len(pending)} words: {e}")
+                answered = {}
+            self.fallback_words += len(answered)
+            resolved.update(answered)
+            if self.cache is not None:
+                self.cache.set_many(answered)
+            pending = [word for word in pending if word not in answered]
+
+        self.unresolved_words += len(pending)
+        return resolved
+
+    def transcribe_many(self, texts: list[str]) -> list[str]:
+        """Transcribe several texts with a single fallback call for all of them.
+
+        Punctuation and spacing are kept; words that could not be resolved
+        are left as written.
+        """
+        vocabulary = self.transcribe_words(
+            word for text in texts for word in WORD_PATTERN.findall(text)
+        )
+        return [
+            WORD_PATTERN.sub(lambda match: vocabulary.get(match.group().lower(), match.group()), text)
+            for text in texts
+        ]
+
+    def transcribe(self, text: str) -> str:
+        """Transcribe one text to IPA."""
+        return self.transcribe_many([text])[0]
+
+
+def create_ipa_cache() -> Optional[IPAWordCache]:
+    """Persistent word cache at ``IPA_CACHE_PATH`` (None when disabled)."""
+    if not settings.IPA_CACHE_PATH:
+        return None
+    try:
+        return IPAWordCache(settings.IPA_CACHE_PATH)
+    except sqlite3.Error as e:
+        logger.warning(f"IPA word cache unavailable: {e}")
+        return None
+
+
+@functools.cache
+def shared_ipa_cache() -> Optional[IPAWordCache]:
+    """Process-wide word cache for request-time lookups, created on first use."""
+    if not ENG_TO_IPA_AVAILABLE:
+        logger.warning("eng_to_ipa not available - IPA comes from the model fallback only")
+    return create_ipa_cache()
+
+
+__all__ = [
+    "ENG_TO_IPA_AVAILABLE",
+    "IPAFallback",
+    "IPAService",
+    "IPAWordCache",
+    "create_ipa_cache",
+    "shared_ipa_cache",
+]
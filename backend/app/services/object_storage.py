@@ -0,0 +1,240 @@
+"""Object storage backends for recordings.
+
+``LocalObjectStorage`` keeps objects under a directory (single node);
+``S3ObjectStorage`` talks to any S3-compatible service (AWS S3, MinIO) so
+several backend nodes can share recordings. Keys are relative
+``/``-separated paths in both cases.
+
+Reads from S3 can be handed to the client as presigned URLs so audio bytes
+do not pass through the API process.
+"""
+
+import logging
+import os
+import tempfile
+from collections.abc import Iterator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Optional, Protocol
+
+from app.core.config import settings
+
+try:
+    import boto3
+    from botocore.config import Config as BotoConfig
+    from botocore.exceptions import ClientError
+    BOTO3_AVAILABLE = True
+except ImportError:
+    BOTO3_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+@dataclass(frozen=True)
+class StoredObject:
+    """One stored object as returned by ``ObjectStorage.list``."""
+
+    key: str
+    size: int
+    modified: float   # POSIX timestamp
+
+
+class ObjectStorage(Protocol):
+    """Minimal key/value blob store used by ``RecordingStore``."""
+
+    def exists(self, key: str) -> bool: ...
+
+    def put(self, key: str, data: bytes, content_type: str = "application/octet-stream") -> None: ...
+
+    def get(self, key: str) -> bytes: ...
+
+    def delete(self, key: str) -> None: ...
+
+    def touch(self, key: str, content_type: str = "application/octet-stream") -> None: ...
+
+    def list(self) -> Iterator[StoredObject]: ...
+
+    def local_path(self, key: str) -> Optional[Path]: ...
+
+    def presigned_url(self, key: str, expires_seconds: int) -> Optional[str]: ...
+
+
+class LocalObjectStorage:
+    """Objects as files below ``root``; writes are atomic (temp file + rename)."""
+
+    def __init__(self, root: str) -> None:
+        self.root = Path(root)
+
+    def _path(self, key: str) -> Path:
+        path = (self.root / key).resolve()
+        if self.root.resolve() not in path.parents:
+            raise ValueError(f"Invalid object key '{key}'")
+        return path
+
+    def exists(self, key: str) -> bool:
+        return self._path(key).is_file()
+
+    def put(self, key: str, data: bytes, content_type: str = "application/octet-stream") -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as tmp_file:
+                tmp_file.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+
+    def get(self, key: str) -> bytes:
+        return self._path(key).read_bytes()
+
+    def delete(self, key: str) -> None:
+        self._path(key).unlink(missing_ok=True)
+
+    def touch(self, key: str, content_type: str = "application/octet-stream") -> None:
+        os.utime(self._path(key))
+
+    def list(self) -> Iterator[StoredObject]:
+        if not self.root.is_dir():
+            return
+        for dirpath, _, filenames in os.walk(self.root):
+            for filename in filenames:
+                if filename.endswith(".tmp"):
+                    continue
+                path = Path(dirpath) / filename
+                stat = path.stat()
+                yield StoredObject(
+                    key=path.relative_to(self.root).as_posix(),
+                    size=stat.st_size,
+                    modified=stat.st_mtime,
+                )
+
+    def local_path(self, key: str) -> Optional[Path]:
+        return self._path(key)
+
+    def presigned_url(self, key: str, expires_seconds: int) -> Optional[str]:
+        # Served by the API itself (FileResponse)
+        return None
+
+
+class S3ObjectStorage:
+    """Objects in an S3 bucket, optionally below ``prefix``."""
+
+    def __init__(
+        self,
+        bucket: str,
+        client: Any,
+        prefix: str = "",
+        presign_client: Any = None,
+    ) -> None:
+        self.bucket = bucket
+        self.client = client
+        # URLs handed to browsers may need another host than the one the API
+        # reaches the service on (e.g. minio:9000 inside docker-compose)
+        self.presign_client = presign_client or client
+        self.prefix = prefix
+
+    def _key(self, key: str) -> str:
+        return f"{self.prefix}{key}"
+
+    def exists(self, key: str) -> bool:
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=self._key(key))
+            return True
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return False
+            raise
+
+    def put(self, key: str, data: bytes, content_type: str = "application/octet-stream") -> None:
+        self.client.put_object(Bucket=self.bucket, Key=self._key(key), Body=data, ContentType=content_type)
+
+    def get(self, key: str) -> bytes:
+        return self.client.get_object(Bucket=self.bucket, Key=self._key(key))["Body"].read()
+
+    def delete(self, key: str) -> None:
+        self.client.delete_object(Bucket=self.bucket, Key=self._key(key))
+
+    def touch(self, key: str, content_type: str = "application/octet-stream") -> None:
+        # Copying an object onto itself is the only way to refresh LastModified.
+        # REPLACE resets the stored metadata, so the content type is sent again
+        s3_key = self._key(key)
+        self.client.copy_object(
+            Bucket=self.bucket,
+            Key=s3_key,
+            CopySource={"Bucket": self.bucket, "Key": s3_key},
+            MetadataDirective="REPLACE",
+            ContentType=content_type,
+        )
+
+    def list(self) -> Iterator[StoredObject]:
+        paginator = self.client.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=self.prefix):
+            for item in page.get("Contents", []):
+                yield StoredObject(
+                    key=item["Key"][len(self.prefix):],
+                    size=item["Size"],
+                    modified=item["LastModified"].timestamp(),
+                )
+
+    def local_path(self, key: str) -> Optional[Path]:
+        return None
+
+    def presigned_url(self, key: str, expires_seconds: int) -> Optional[str]:
+        return self.presign_client.generate_presigned_url(
+            "get_object",
+            Params={"Bucket": self.bucket, "Key": self._key(key)},
+            ExpiresIn=expires_seconds,
+        )
+
+
+def create_s3_client(endpoint_url: Optional[str] = None) -> Any:
+    """boto3 S3 client configured from settings (``S3_ENDPOINT_URL`` for MinIO)."""
+    endpoint_url = endpoint_url or settings.S3_ENDPOINT_URL
+    return boto3.client(
+        "s3",
+        endpoint_url=endpoint_url,
+        region_name=settings.S3_REGION,
+        aws_access_key_id=settings.S3_ACCESS_KEY_ID,
+        aws_secret_access_key=settings.S3_SECRET_ACCESS_KEY,
+        config=BotoConfig(
+            signature_version="s3v4",
+            # MinIO and most self-hosted stand-ins need path-style addressing
+            s3={"addressing_style": "path" if endpoint_url else "auto"},
+            max_pool_connections=settings.S3_MAX_POOL_CONNECTIONS,
+        ),
+    )
+
+
+def create_object_storage(local_root: str) -> ObjectStorage:
+    """Storage selected by ``RECORDING_STORAGE_BACKEND`` (local | s3)."""
+    backend = settings.RECORDING_STORAGE_BACKEND
+    if backend == "s3":
+        if not BOTO3_AVAILABLE:
+            raise RuntimeError("RECORDING_STORAGE_BACKEND=s3 requires boto3")
+        if not settings.S3_BUCKET:
+            raise RuntimeError("RECORDING_STORAGE_BACKEND=s3 requires S3_BUCKET")
+        return S3ObjectStorage(
+            settings.S3_BUCKET,
+            create_s3_client(),
+            prefix=settings.S3_PREFIX,
+            presign_client=(
+                create_s3_client(settings.S3_PUBLIC_ENDPOINT_URL)
+                if settings.S3_PUBLIC_ENDPOINT_URL
+                else None
+            ),
+        )
+    if backend != "local":
+        logger.warning(f"Unknown RECORDING_STORAGE_BACKEND '{backend}', using local storage")
+    return LocalObjectStorage(local_root)
+
+
+__all__ = [
+    "BOTO3_AVAILABLE",
+    "LocalObjectStorage",
+    "ObjectStorage",
+    "S3ObjectStorage",
+    "StoredObject",
+    "create_object_storage",
+    "create_s3_client",
+]
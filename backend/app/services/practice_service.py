@@ -1,12 +1,13 @@
 """Service layer for practice/pronunciation feature."""
 
+from collections.abc import Collection
 from typing import Optional
 from sqlalchemy.orm import Session
-from sqlalchemy import func
 from fastapi import HTTPException, status
 
 from app.db.models_practice_sentence import PracticeSentence
 from app.db.models_practice_attempt import PracticeAttempt
+from app.services.sentence_index import sentence_index
 
 
 class PracticeService:
@@ -31,43 +32,77 @@ class PracticeService:
         )
         return sentence
 
-    def get_random_sentence(self, difficulty: Optional[str] = None) -> Optional[PracticeSentence]:
+    def get_sentences_by_ids(self, sentence_ids: list[int]) -> dict[int, PracticeSentence]:
+        """Lấy nhiều câu luyện tập trong một truy vấn.
+        
+        Args:
+            sentence_ids: Danh sách ID cần lấy (có thể trùng lặp)
+            
+        Returns:
+            Dict sentence_id -> PracticeSentence (ID không tồn tại bị bỏ qua)
+        """
+        sentences = (
+            self.db.query(PracticeSentence)
+            .filter(PracticeSentence.sentence_id.in_(set(sentence_ids)))
+            .all()
+        )
+        return {sentence.sentence_id: sentence for sentence in sentences}
+
+    def get_random_sentence(
+        self, difficulty: Optional[str] = None, exclude_ids: Optional[Collection[int]] = None
+    ) -> Optional[PracticeSentence]:
         """Lấy câu ngẫu nhiên, có thể lọc theo độ khó.
         
+        Chọn từ chỉ mục ID trong bộ nhớ rồi lấy câu theo khóa chính, không
+        dùng ``ORDER BY random()``.
+        
         Args:
             difficulty: Độ khó (beginner, intermediate, advanced) - optional
+            exclude_ids: ID các câu nên tránh (vd. vừa luyện) - optional
             
         Returns:
             PracticeSentence object ngẫu nhiên
         """
-        query = self.db.query(PracticeSentence)
-        
-        if difficulty:
-            query = query.filter(PracticeSentence.difficulty == difficulty)
-        
-        # Random order và lấy 1 câu
-        sentence = query.order_by(func.random()).first()
-        return sentence
+        return sentence_index.pick(self.db, difficulty=difficulty, exclude=exclude_ids)
 
     def get_random_sentence_by_topic(
-        self, topic: str, difficulty: Optional[str] = None
+        self,
+        topic: str,
+        difficulty: Optional[str] = None,
+        exclude_ids: Optional[Collection[int]] = None,
     ) -> Optional[PracticeSentence]:
         """Lấy câu ngẫu nhiên theo chủ đề và độ khó.
         
         Args:
             topic: Chủ đề cần lọc
             difficulty: Độ khó (optional)
+            exclude_ids: ID các câu nên tránh (vd. vừa luyện) - optional
             
         Returns:
             PracticeSentence object ngẫu nhiên theo topic
         """
-        query = self.db.query(PracticeSentence).filter(PracticeSentence.topic == topic)
-        
-        if difficulty:
-            query = query.filter(PracticeSentence.difficulty == difficulty)
+        return sentence_index.pick(self.db, difficulty=difficulty, topic=topic, exclude=exclude_ids)
+
+    def get_recent_sentence_ids(self, user_id: int, limit: int) -> set[int]:
+        """Lấy ID các câu user đã luyện trong ``limit`` lượt gần nhất.
         
-        sentence = query.order_by(func.random()).first()
-        return sentence
+        Args:
+            user_id: ID của user
+            limit: Số lượt gần nhất cần xét
+            
+        Returns:
+            Set các sentence_id
+        """
+        if limit <= 0:
+            return set()
+        rows = (
+            self.db.query(PracticeAttempt.sentence_id)
+            .filter(PracticeAttempt.user_id == user_id)
+            .order_by(PracticeAttempt.created_at.desc())
+            .limit(limit)
+            .all()
+        )
+        return {row.sentence_id for row in rows}
 
     def get_all_topics(self) -> list[str]:
         """Lấy danh sách tất cả các topics có trong database.
@@ -142,6 +177,45 @@ class PracticeService:
         
         return attempt
 
+    def save_attempts(self, attempts: list[dict]) -> list[PracticeAttempt]:
+        """Lưu nhiều kết quả luyện tập trong cùng một transaction.
+        
+        Hoặc tất cả được lưu, hoặc không attempt nào được lưu.
+        
+        Args:
+            attempts: Danh sách tham số giống ``save_attempt`` cho từng attempt
+            
+        Returns:
+            List PracticeAttempt đã được lưu, cùng thứ tự với ``attempts``
+        """
+        rows = [PracticeAttempt(**fields) for fields in attempts]
+        try:
+            self.db.add_all(rows)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        
+        for row in rows:
+            self.db.refresh(row)
+        return rows
+
+    def get_user_attempt(self, attempt_id: int, user_id: int) -> Optional[PracticeAttempt]:
+        """Lấy một attempt của user.
+        
+        Args:
+            attempt_id: ID của attempt
+            user_id: ID của user sở hữu attempt
+            
+        Returns:
+            PracticeAttempt hoặc None nếu không tồn tại / không thuộc về user
+        """
+        return (
+            self.db.query(PracticeAttempt)
+            .filter(PracticeAttempt.attempt_id == attempt_id, PracticeAttempt.user_id == user_id)
+            .first()
+        )
+
     def get_user_history(self, user_id: int, limit: int = 10) -> list[PracticeAttempt]:
         """Lấy lịch sử luyện tập của user.
         
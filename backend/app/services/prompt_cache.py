@@ -0,0 +1,119 @@
+"""Gemini context cache holding the static part of a prompt.
+
+The evaluation prompt is mostly static (role, rubric, response format); only
+the target sentence and the audio change per call. Registering the static
+part once as ``CachedContent`` means each evaluation only sends the per-call
+fields, which cuts input token cost and time-to-first-token.
+
+Explicit caching has a per-model minimum size. A prompt below it is never
+registered; callers then send the full prompt with the static part first,
+which the API's implicit caching can still reuse.
+"""
+
+import logging
+import threading
+import time
+from datetime import timedelta
+from typing import Any, Optional
+
+from google.generativeai import caching
+
+logger = logging.getLogger(__name__)
+
+# Rough size of a token in English prompt text, for the minimum-size check
+CHARS_PER_TOKEN = 4
+
+
+class PromptContextCache:
+    """Lazily created, automatically refreshed ``CachedContent``.
+
+    ``get`` returns the live cache entry, creating it on first use and
+    recreating it shortly before the TTL runs out. If creation fails (e.g. the
+    prompt is below the model's minimum cacheable size or caching is not
+    available for the API key) ``get`` returns None for
+    ``retry_after_failure_seconds`` so callers fall back to sending the full
+    prompt without hammering the API. A prompt estimated below ``min_tokens``
+    is never sent to the cache API at all.
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        display_name: str,
+        system_instruction: str,
+        contents: list[Any],
+        ttl_seconds: int,
+        refresh_margin_seconds: int = 60,
+        retry_after_failure_seconds: int = 300,
+        min_tokens: int = 0,
+    ) -> None:
+        self.model_name = model_name
+        self.display_name = display_name
+        self.system_instruction = system_instruction
+        self.contents = contents
+        self.ttl_seconds = ttl_seconds
+        self.refresh_margin_seconds = refresh_margin_seconds
+        self.retry_after_failure_seconds = retry_after_failure_seconds
+        self.min_tokens = min_tokens
+        self._size_logged = False
+        self._cached: Optional[caching.CachedContent] = None
+        self._expires_at = 0.0
+        self._disabled_until = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def estimated_tokens(self) -> int:
+        texts = [self.system_instruction, *(item for item in self.contents if isinstance(item, str))]
+        return sum(len(text) for text in texts) // CHARS_PER_TOKEN
+
+    @property
+    def is_cacheable(self) -> bool:
+        return self.estimated_tokens >= self.min_tokens
+
+    def get(self) -> Optional[caching.CachedContent]:
+        """Return a usable cache entry, or None to send the prompt uncached.
+
+        Blocking (may call the API); run it in a worker thread from async code.
+        """
+        if not self.is_cacheable:
+            if not self._size_logged:
+                self._size_logged = True
+                logger.info(
+                    f"Prompt '{self.display_name}' is ~{self.estimated_tokens} tokens, below the "
+                    f"{self.min_tokens}-token minimum for context caching; relying on implicit caching"
+                )
+            return None
+        with self._lock:
+            now = time.monotonic()
+            if self._cached is not None and now < self._expires_at - self.refresh_margin_seconds:
+                return self._cached
+            if now < self._disabled_until:
+                return None
+
+            try:
+                cached = caching.CachedContent.create(
+                    model=self.model_name,
+                    display_name=self.display_name,
+                    system_instruction=self.system_instruction,
+                    contents=self.contents,
+                    ttl=timedelta(seconds=self.ttl_seconds),
+                )
+            except Exception as e:
+                logger.warning(f"Could not create context cache '{self.display_name}': {e}")
+                self._cached = None
+                self._disabled_until = now + self.retry_after_failure_seconds
+                return None
+
+            logger.info(f"Created context cache {cached.name} ({self.display_name})")
+            self._cached = cached
+            self._expires_at = now + self.ttl_seconds
+            return cached
+
+    def invalidate(self) -> None:
+        """Forget the current entry (e.g. after the API reported it missing)."""
+        with self._lock:
+            self._cached = None
+            self._expires_at = 0.0
+
+
+__all__ = ["PromptContextCache"]
@@ -0,0 +1,222 @@
+"""Content-addressed, compressed storage for attempt recordings.
+
+Recordings are encoded (FLAC by default) and stored under a key derived
+from the SHA-256 of their PCM, sharded two levels deep
+(``ab/cd/abcd….flac``) so no directory grows past a few thousand entries.
+Identical recordings are stored once. The bytes live in an
+``ObjectStorage`` backend: local disk, or S3 when several nodes serve the API. ``PracticeAttempt.audio_file_path``
+holds the returned key, not a filesystem path.
+
+A background retention job deletes recordings older than
+``RECORDING_RETENTION_DAYS`` and, oldest first, whatever exceeds
+``RECORDING_QUOTA_BYTES``, then clears the keys of the affected attempts.
+"""
+
+import asyncio
+import hashlib
+import logging
+import re
+import time
+from pathlib import Path
+from typing import Optional
+
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.db.models import PracticeAttempt
+from app.db.session import SessionLocal
+from app.services.audio_service import AudioService, DecodedAudio
+from app.services.object_storage import ObjectStorage, create_object_storage
+
+logger = logging.getLogger(__name__)
+
+# File extension per stored format (Opus goes in an Ogg container)
+RECORDING_EXTENSIONS = {"wav": "wav", "flac": "flac", "opus": "ogg"}
+RECORDING_MEDIA_TYPES = {"wav": "audio/wav", "flac": "audio/flac", "ogg": "audio/ogg"}
+
+KEY_PATTERN = re.compile(r"^[0-9a-f]{2}/[0-9a-f]{2}/[0-9a-f]{64}\.(wav|flac|ogg)$")
+
+
+class RecordingStore:
+    """Content-addressed recordings kept in an ``ObjectStorage`` backend."""
+
+    def __init__(self, storage: ObjectStorage, output_format: str = "flac") -> None:
+        self.storage = storage
+        self.output_format = output_format
+        self._audio_service = AudioService()
+        # Extension the encoder actually produces (WAV when ffmpeg is missing),
+        # learned from the last encode so a dedup check costs one lookup
+        self._extension = RECORDING_EXTENSIONS.get(output_format, "wav")
+
+    @staticmethod
+    def content_hash(audio: DecodedAudio) -> str:
+        digest = hashlib.sha256()
+        digest.update(f"{audio.frame_rate}:{audio.channels}:{audio.sample_width}:".encode())
+        digest.update(audio.pcm)
+        return digest.hexdigest()
+
+    @staticmethod
+    def _check_key(key: str) -> str:
+        if not KEY_PATTERN.match(key):
+            raise ValueError(f"Invalid recording key '{key}'")
+        return key
+
+    def path_for(self, key: str) -> Optional[Path]:
+        """Local file of a recording, or None when the backend is remote."""
+        return self.storage.local_path(self._check_key(key))
+
+    def url_for(self, key: str) -> Optional[str]:
+        """Presigned download URL, or None when the API must serve the file."""
+        return self.storage.presigned_url(
+            self._check_key(key), settings.S3_PRESIGNED_URL_EXPIRES_SECONDS
+        )
+
+    @staticmethod
+    def media_type(key: str) -> str:
+        return RECORDING_MEDIA_TYPES[key.rsplit(".", 1)[-1]]
+
+    @staticmethod
+    def _key(content_hash: str, extension: str) -> str:
+        return f"{content_hash[:2]}/{content_hash[2:4]}/{content_hash}.{extension}"
+
+    def save(self, audio: DecodedAudio) -> str:
+        """Store a recording (once per distinct content) and return its key."""
+        content_hash = self.content_hash(audio)
+        key = self._key(content_hash, self._extension)
+        if self.storage.exists(key):
+            # Refresh the age so retention counts from the latest use
+            self.storage.touch(key, content_type=self.media_type(key))
+            metrics.increment("recording_store_dedup_hits_total")
+            return key
+
+        data, output_format, mime_type = self._audio_service.encode_audio(audio, self.output_format)
+        self._extension = RECORDING_EXTENSIONS[output_format]
+        key = self._key(content_hash, self._extension)
+        self.storage.put(key, data, content_type=mime_type)
+        metrics.increment("recording_store_bytes_written_total", len(data))
+        logger.info(
+            f"Stored recording {key} ({len(audio.pcm) / 1024:.1f} KB PCM -> {len(data) / 1024:.1f} KB)"
+        )
+        return key
+
+    def delete(self, key: str) -> None:
+        self.storage.delete(self._check_key(key))
+
+    def scan(self) -> list[tuple[str, int, float]]:
+        """Every stored recording as ``(key, size, mtime)``."""
+        return [
+            (item.key, item.size, item.modified)
+            for item in self.storage.list()
+            if KEY_PATTERN.match(item.key)
+        ]
+
+    def collect_garbage(
+        self, max_age_seconds: Optional[float], max_bytes: Optional[int], now: Optional[float] = None
+    ) -> list[str]:
+        """Delete expired recordings, then the oldest ones beyond ``max_bytes``.
+
+        Returns:
+            Keys of the deleted recordings
+        """
+        now = time.time() if now is None else now
+        entries = sorted(self.scan(), key=lambda entry: entry[2])
+        total = sum(size for _, size, _ in entries)
+        deleted = []
+        for key, size, mtime in entries:
+            expired = max_age_seconds is not None and now - mtime > max_age_seconds
+            over_quota = max_bytes is not None and total > max_bytes
+            if not (expired or over_quota):
+                # Entries are oldest first: nothing after this one qualifies
+                break
+            self.delete(key)
+            total -= size
+            deleted.append(key)
+        metrics.increment("recording_store_gc_deleted_total", len(deleted))
+        return deleted
+
+
+def clear_attempt_recordings(keys: list[str]) -> int:
+    """Unset ``audio_file_path`` of attempts whose recording was deleted."""
+    if not keys:
+        return 0
+    cleared = 0
+    db = SessionLocal()
+    try:
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            cleared += (
+                db.query(PracticeAttempt)
+                .filter(PracticeAttempt.audio_file_path.in_(chunk))
+                .update({PracticeAttempt.audio_file_path: None}, synchronize_session=False)
+            )
+        db.commit()
+    finally:
+        db.close()
+    return cleared
+
+
+class RecordingRetentionJob:
+    """Periodically runs ``RecordingStore.collect_garbage`` on the event loop's thread pool."""
+
+    def __init__(
+        self,
+        store: RecordingStore,
+        interval_seconds: float,
+        retention_days: Optional[float],
+        quota_bytes: Optional[int],
+    ) -> None:
+        self.store = store
+        self.interval_seconds = interval_seconds
+        self.retention_days = retention_days
+        self.quota_bytes = quota_bytes
+        self._task: Optional[asyncio.Task] = None
+
+    async def run_once(self) -> int:
+        """One GC pass; returns the number of recordings deleted."""
+        max_age = self.retention_days * 86400 if self.retention_days else None
+        deleted = await run_in_threadpool(
+            self.store.collect_garbage, max_age, self.quota_bytes or None
+        )
+        if deleted:
+            cleared = await run_in_threadpool(clear_attempt_recordings, deleted)
+            logger.info(f"Recording GC deleted {len(deleted)} files ({cleared} attempts updated)")
+        return len(deleted)
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except Exception as e:  # noqa: BLE001
+                logger.error(f"Recording GC failed: {e}")
+            await asyncio.sleep(self.interval_seconds)
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._loop(), name="recording-retention")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+
+recording_store = RecordingStore(
+    create_object_storage(settings.RECORDING_STORAGE_DIR), settings.RECORDING_FORMAT
+)
+recording_retention_job = RecordingRetentionJob(
+    recording_store,
+    interval_seconds=settings.RECORDING_GC_INTERVAL_SECONDS,
+    retention_days=settings.RECORDING_RETENTION_DAYS,
+    quota_bytes=settings.RECORDING_QUOTA_BYTES,
+)
+
+
+__all__ = [
+    "RecordingRetentionJob",
+    "RecordingStore",
+    "clear_attempt_recordings",
+    "recording_retention_job",
+    "recording_store",
+]
@@ -0,0 +1,146 @@
+"""Local store of reference (model) recordings for practice sentences.
+
+Reference audio used to be streamed from Google Drive on every play. The
+store keeps one pre-generated file per sentence on local disk, produced in
+bulk by a pluggable speech synthesizer, so playback never leaves the server.
+"""
+
+import io
+import logging
+import math
+import os
+import struct
+import tempfile
+import wave
+from pathlib import Path
+from typing import Optional, Protocol
+
+from app.core.config import settings
+
+try:
+    from gtts import gTTS
+    GTTS_AVAILABLE = True
+except ImportError:
+    GTTS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+class SpeechSynthesizer(Protocol):
+    """Turns a sentence into an audio file's bytes."""
+
+    extension: str
+    media_type: str
+
+    def synthesize(self, text: str) -> bytes: ...
+
+
+class GTTSSynthesizer:
+    """Google Translate text-to-speech (MP3) through ``gTTS``."""
+
+    extension = "mp3"
+    media_type = "audio/mpeg"
+
+    def __init__(self, lang: str = "en", tld: str = "com", slow: bool = False) -> None:
+        self.lang = lang
+        self.tld = tld
+        self.slow = slow
+
+    def synthesize(self, text: str) -> bytes:
+        if not GTTS_AVAILABLE:
+            raise RuntimeError("gTTS is not installed")
+        buffer = io.BytesIO()
+        gTTS(text=text, lang=self.lang, tld=self.tld, slow=self.slow).write_to_fp(buffer)
+        return buffer.getvalue()
+
+
+class FakeSynthesizer:
+    """Offline stand-in: a short WAV tone whose length follows the word count."""
+
+    extension = "wav"
+    media_type = "audio/wav"
+
+    def __init__(self, frame_rate: int = 16000, seconds_per_word: float = 0.3) -> None:
+        self.frame_rate = frame_rate
+        self.seconds_per_word = seconds_per_word
+
+    def synthesize(self, text: str) -> bytes:
+        frames = int(max(1, len(text.split())) * self.seconds_per_word * self.frame_rate)
+        samples = [
+            int(8000 * math.sin(2 * math.pi * 220 * i / self.frame_rate)) for i in range(frames)
+        ]
+        buffer = io.BytesIO()
+        with wave.open(buffer, "wb") as wav_file:
+            wav_file.setnchannels(1)
+            wav_file.setsampwidth(2)
+            wav_file.setframerate(self.frame_rate)
+            wav_file.writeframes(struct.pack(f"<{frames}h", *samples))
+        return buffer.getvalue()
+
+
+class ReferenceAudioStore:
+    """One reference file per sentence under ``root`` (``<sentence_id>.<ext>``)."""
+
+    def __init__(self, root: str, synthesizer: SpeechSynthesizer) -> None:
+        self.root = Path(root)
+        self.synthesizer = synthesizer
+
+    @property
+    def media_type(self) -> str:
+        return self.synthesizer.media_type
+
+    def path_for(self, sentence_id: int) -> Path:
+        return self.root / f"{sentence_id}.{self.synthesizer.extension}"
+
+    def get(self, sentence_id: int) -> Optional[Path]:
+        """Path of the stored file, or None if it was not generated yet."""
+        path = self.path_for(sentence_id)
+        return path if path.is_file() else None
+
+    def generate(self, sentence_id: int, text: str, overwrite: bool = False) -> Path:
+        """Synthesize and store the reference audio of one sentence.
+
+        The file is written to a temporary name and renamed, so readers never
+        see a partial file.
+        """
+        path = self.path_for(sentence_id)
+        if path.is_file() and not overwrite:
+            return path
+
+        data = self.synthesizer.synthesize(text)
+        self.root.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as tmp_file:
+                tmp_file.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+        logger.info(f"Generated reference audio for sentence {sentence_id} ({len(data)} bytes)")
+        return path
+
+
+def create_synthesizer(backend: Optional[str] = None) -> SpeechSynthesizer:
+    """Synthesizer ``backend`` (gtts | fake), by default ``REFERENCE_AUDIO_SYNTHESIZER``."""
+    backend = (backend or settings.REFERENCE_AUDIO_SYNTHESIZER).lower()
+    if backend == "fake":
+        return FakeSynthesizer()
+    if backend != "gtts":
+        logger.warning(f"Unknown REFERENCE_AUDIO_SYNTHESIZER '{backend}', using gtts")
+    if not GTTS_AVAILABLE:
+        logger.warning("gTTS not available - reference audio generation disabled")
+    return GTTSSynthesizer(lang=settings.REFERENCE_AUDIO_LANG, tld=settings.REFERENCE_AUDIO_TLD)
+
+
+reference_audio_store = ReferenceAudioStore(settings.REFERENCE_AUDIO_DIR, create_synthesizer())
+
+
+__all__ = [
+    "FakeSynthesizer",
+    "GTTSSynthesizer",
+    "ReferenceAudioStore",
+    "SpeechSynthesizer",
+    "create_synthesizer",
+    "reference_audio_store",
+]
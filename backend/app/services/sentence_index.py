@@ -0,0 +1,174 @@
+"""Process-local index of practice sentence ids for random selection.
+
+``ORDER BY random() LIMIT 1`` makes the database scan and sort every
+matching row on each "next sentence" click. Instead the ids are loaded once
+into compact ``array('l')`` buckets keyed by ``(difficulty, topic)`` (plus
+the "any difficulty" / "any topic" combinations), so a random pick is an
+array index followed by a primary-key lookup.
+
+The index is rebuilt lazily: after a commit that inserted, changed or
+deleted sentences in this process (SQLAlchemy session events), and at the
+latest ``SENTENCE_INDEX_TTL_SECONDS`` after the last build so changes made by
+other nodes or scripts are picked up too.
+"""
+
+import logging
+import random
+import threading
+import time
+from array import array
+from collections.abc import Collection
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.db.models_practice_sentence import PracticeSentence
+
+logger = logging.getLogger(__name__)
+
+# Bucket key component matching every difficulty / every topic
+ANY = "*"
+
+# Random draws tried before filtering a bucket for excluded ids
+EXCLUDE_DRAW_ATTEMPTS = 8
+
+_SESSION_FLAG = "practice_sentences_changed"
+
+
+class SentenceIndex:
+    """Sentence ids bucketed by ``(difficulty, topic)`` with ``ANY`` wildcards."""
+
+    def __init__(self, ttl_seconds: float) -> None:
+        self.ttl_seconds = ttl_seconds
+        self._buckets: dict[tuple[str, str], array] = {}
+        self._loaded_at: Optional[float] = None
+        self._lock = threading.Lock()
+        metrics.register_gauge("sentence_index_size", lambda: len(self._buckets.get((ANY, ANY), ())))
+
+    @property
+    def is_stale(self) -> bool:
+        return self._loaded_at is None or time.monotonic() - self._loaded_at > self.ttl_seconds
+
+    def invalidate(self) -> None:
+        self._loaded_at = None
+
+    def refresh(self, db: Session) -> None:
+        """Rebuild every bucket from one ``(id, difficulty, topic)`` query."""
+        rows = (
+            db.query(PracticeSentence.sentence_id, PracticeSentence.difficulty, PracticeSentence.topic)
+            .order_by(PracticeSentence.sentence_id)
+            .all()
+        )
+        buckets: dict[tuple[str, str], array] = {(ANY, ANY): array("l")}
+        for sentence_id, difficulty, topic in rows:
+            keys = [(ANY, ANY), (difficulty, ANY)]
+            # Sentences without a topic are never returned by a topic filter
+            if topic is not None:
+                keys += [(ANY, topic), (difficulty, topic)]
+            for key in keys:
+                buckets.setdefault(key, array("l")).append(sentence_id)
+        # Swapped in one assignment so readers never see a half-built index
+        self._buckets = buckets
+        self._loaded_at = time.monotonic()
+        metrics.increment("sentence_index_refreshes_total")
+        logger.debug(f"Sentence index rebuilt: {len(rows)} sentences, {len(buckets)} buckets")
+
+    def _ensure_fresh(self, db: Session) -> None:
+        if not self.is_stale:
+            return
+        with self._lock:
+            if self.is_stale:
+                self.refresh(db)
+
+    def ids(self, db: Session, difficulty: Optional[str] = None, topic: Optional[str] = None) -> array:
+        """All indexed ids matching the filters.
+
+        An empty ``difficulty`` means any, as does a ``topic`` of ``None``; an
+        empty ``topic`` only matches sentences whose topic is ``""``.
+
+        Blocking (may rebuild the index); call it from a worker thread in
+        async code.
+        """
+        self._ensure_fresh(db)
+        key = (difficulty or ANY, ANY if topic is None else topic)
+        return self._buckets.get(key, array("l"))
+
+    def pick_id(
+        self,
+        db: Session,
+        difficulty: Optional[str] = None,
+        topic: Optional[str] = None,
+        exclude: Optional[Collection[int]] = None,
+    ) -> Optional[int]:
+        """A random matching id, avoiding ``exclude`` unless nothing else matches."""
+        ids = self.ids(db, difficulty, topic)
+        if not ids:
+            return None
+        if not exclude:
+            return ids[random.randrange(len(ids))]
+
+        for _ in range(EXCLUDE_DRAW_ATTEMPTS):
+            sentence_id = ids[random.randrange(len(ids))]
+            if sentence_id not in exclude:
+                return sentence_id
+        # Small bucket dominated by recent sentences: filter it once
+        remaining = [sentence_id for sentence_id in ids if sentence_id not in exclude]
+        return random.choice(remaining or ids)
+
+    def pick(
+        self,
+        db: Session,
+        difficulty: Optional[str] = None,
+        topic: Optional[str] = None,
+        exclude: Optional[Collection[int]] = None,
+    ) -> Optional[PracticeSentence]:
+        """A random matching sentence loaded by primary key."""
+        sentence_id = self.pick_id(db, difficulty, topic, exclude)
+        if sentence_id is None:
+            return None
+        sentence = db.get(PracticeSentence, sentence_id)
+        if sentence is None:
+            # Deleted elsewhere since the last build: rebuild and draw again
+            self.invalidate()
+            sentence_id = self.pick_id(db, difficulty, topic, exclude)
+            sentence = db.get(PracticeSentence, sentence_id) if sentence_id is not None else None
+        return sentence
+
+
+def _is_sentence(instance: object) -> bool:
+    return isinstance(instance, PracticeSentence)
+
+
+@event.listens_for(Session, "after_flush")
+def _track_sentence_changes(session: Session, flush_context) -> None:
+    if any(map(_is_sentence, (*session.new, *session.dirty, *session.deleted))):
+        session.info[_SESSION_FLAG] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_bulk_sentence_changes(orm_execute_state) -> None:
+    if orm_execute_state.is_select:
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is not None and mapper.class_ is PracticeSentence:
+        orm_execute_state.session.info[_SESSION_FLAG] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_on_commit(session: Session) -> None:
+    if session.info.pop(_SESSION_FLAG, False):
+        sentence_index.invalidate()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_on_rollback(session: Session) -> None:
+    session.info.pop(_SESSION_FLAG, None)
+
+
+sentence_index = SentenceIndex(ttl_seconds=settings.SENTENCE_INDEX_TTL_SECONDS)
+
+
+__all__ = ["ANY", "SentenceIndex", "sentence_index"]
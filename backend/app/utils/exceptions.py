@@ -9,5 +9,25 @@ class GeminiAPIError(Exception):
     """Raised when the Gemini AI service returns an error or is unavailable."""
 
 
+class GeminiUnavailableError(GeminiAPIError):
+    """Raised when a Gemini call cannot be made right now and should be retried later."""
+
+    def __init__(self, message: str, retry_after: float = 1.0) -> None:
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class InvalidAIResponseError(GeminiAPIError):
+    """Raised when Gemini answers with output that does not match the expected schema."""
+
+
+class AudioRejectedError(Exception):
+    """Raised when a recording fails the pre-flight quality gate."""
+
+    def __init__(self, reason: str, message: str) -> None:
+        super().__init__(message)
+        self.reason = reason
+
+
 class SpeechRecognitionError(Exception):
     """Raised when speech recognition fails for the provided audio input."""
@@ -0,0 +1,58 @@
+"""Convert pydantic models to the schema dialect accepted by Gemini.
+
+Gemini's ``response_schema`` takes an OpenAPI subset: no ``$ref``/``$defs``,
+no ``anyOf``, no numeric bounds and no titles. ``to_gemini_schema`` inlines
+references, turns ``Optional[X]`` into ``X`` + ``nullable`` and drops every
+unsupported keyword. Model docstrings (the ``description`` of the root and
+of every ``$defs`` entry) are dropped too: they document the Python code, not
+the answer, and would only add input tokens. Field descriptions are kept.
+"""
+
+from typing import Any
+
+from pydantic import BaseModel
+
+SUPPORTED_KEYS = {"type", "format", "description", "nullable", "enum", "properties", "required", "items"}
+
+
+def _convert(node: dict[str, Any], defs: dict[str, Any]) -> dict[str, Any]:
+    if "$ref" in node:
+        target = defs[node["$ref"].split("/")[-1]]
+        merged = {**target, **{k: v for k, v in node.items() if k != "$ref"}}
+        return _convert(merged, defs)
+
+    if "anyOf" in node:
+        options = [option for option in node["anyOf"] if option.get("type") != "null"]
+        nullable = len(options) < len(node["anyOf"])
+        if len(options) != 1:
+            raise ValueError(f"Unsupported union in schema: {node['anyOf']}")
+        converted = _convert({**options[0], **{k: v for k, v in node.items() if k != "anyOf"}}, defs)
+        if nullable:
+            converted["nullable"] = True
+        return converted
+
+    schema: dict[str, Any] = {}
+    for key, value in node.items():
+        if key not in SUPPORTED_KEYS:
+            continue
+        if key == "properties":
+            schema[key] = {name: _convert(child, defs) for name, child in value.items()}
+        elif key == "items":
+            schema[key] = _convert(value, defs)
+        else:
+            schema[key] = value
+    return schema
+
+
+def to_gemini_schema(model: type[BaseModel]) -> dict[str, Any]:
+    """Return a Gemini-compatible response schema for a pydantic model."""
+    json_schema = model.model_json_schema()
+    defs = {name: _without_description(node) for name, node in json_schema.get("$defs", {}).items()}
+    return _convert(_without_description(json_schema), defs)
+
+
+def _without_description(node: dict[str, Any]) -> dict[str, Any]:
+    return {key: value for key, value in node.items() if key != "description"}
+
+
+__all__ = ["to_gemini_schema"]
@@ -0,0 +1,99 @@
+"""Incremental parser for a JSON object that arrives in chunks.
+
+Used to forward each top-level field of a streamed model answer as soon as its
+value is complete, long before the closing brace arrives.
+"""
+
+import json
+from collections.abc import Iterator
+from typing import Any, Optional
+
+
+class IncrementalJSONObjectParser:
+    """Emit ``(key, value)`` pairs of a top-level JSON object as they complete.
+
+    Feed text chunks with ``feed``; every call yields the members whose values
+    were finished by that chunk. Anything before the first ``{`` (e.g. a
+    markdown code fence) is ignored. Values are decoded with ``json.loads``
+    once their text span is closed, so the scanner only has to track string
+    and nesting state.
+    """
+
+    def __init__(self) -> None:
+        self._buffer = ""
+        self._pos = 0
+        self._started = False
+        self._finished = False
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._key: Optional[str] = None
+        self._key_start: Optional[int] = None
+        self._value_start: Optional[int] = None
+
+    @property
+    def finished(self) -> bool:
+        """True once the closing brace of the root object was seen."""
+        return self._finished
+
+    def feed(self, chunk: str) -> Iterator[tuple[str, Any]]:
+        self._buffer += chunk
+        while self._pos < len(self._buffer) and not self._finished:
+            char = self._buffer[self._pos]
+            position = self._pos
+            self._pos += 1
+
+            if not self._started:
+                if char == "{":
+                    self._started = True
+                    self._depth = 1
+                continue
+
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._depth == 1 and self._key is None and self._key_start is not None:
+                        self._key = json.loads(self._buffer[self._key_start:position + 1])
+                        self._key_start = None
+                continue
+
+            if char == '"':
+                self._in_string = True
+                if self._depth == 1 and self._key is None:
+                    self._key_start = position
+                elif self._depth == 1 and self._value_start is None:
+                    self._value_start = position
+            elif char in "{[":
+                if self._depth == 1 and self._value_start is None:
+                    self._value_start = position
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    member = self._complete(position)
+                    if member is not None:
+                        yield member
+                    self._finished = True
+            elif char == "," and self._depth == 1:
+                member = self._complete(position)
+                if member is not None:
+                    yield member
+            elif self._depth == 1 and self._key is not None and self._value_start is None:
+                if not char.isspace() and char != ":":
+                    # Bare literal: number, true, false or null
+                    self._value_start = position
+
+    def _complete(self, end: int) -> Optional[tuple[str, Any]]:
+        key, start = self._key, self._value_start
+        self._key = None
+        self._value_start = None
+        if key is None or start is None:
+            return None
+        return key, json.loads(self._buffer[start:end])
+
+
+__all__ = ["IncrementalJSONObjectParser"]
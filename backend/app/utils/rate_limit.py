@@ -0,0 +1,292 @@
+"""Asyncio rate limiting primitives (token bucket, concurrency limiter, admission control)."""
+
+import asyncio
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Optional
+
+
+class RateLimitTimeout(Exception):
+    """Raised when a permit could not be obtained before the deadline."""
+
+    def __init__(self, message: str, retry_after: float) -> None:
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at ``rate_per_minute``.
+
+    ``try_acquire`` is non-blocking; ``acquire`` waits (FIFO) for a token up to
+    a timeout. The bucket holds at most ``burst`` tokens.
+    """
+
+    def __init__(self, rate_per_minute: float, burst: int) -> None:
+        self.rate_per_second = rate_per_minute / 60.0
+        self.capacity = max(1, burst)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock: Optional[asyncio.Lock] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate_per_second)
+        self._updated = now
+
+    def wait_time(self, count: float = 1) -> float:
+        """Seconds until ``count`` tokens are available (0 if they are)."""
+        self._refill()
+        if self._tokens >= count:
+            return 0.0
+        if self.rate_per_second <= 0:
+            return float("inf")
+        return (count - self._tokens) / self.rate_per_second
+
+    def try_acquire(self, count: float = 1) -> bool:
+        """Take ``count`` tokens if they are available right now."""
+        self._refill()
+        if self._tokens >= count:
+            self._tokens -= count
+            return True
+        return False
+
+    def refund(self, count: float = 1) -> None:
+        """Return tokens taken for work that was rejected before it started."""
+        self._refill()
+        self._tokens = min(self.capacity, self._tokens + count)
+
+    def _get_lock(self) -> asyncio.Lock:
+        loop = asyncio.get_running_loop()
+        if self._lock is None or self._loop is not loop:
+            self._lock = asyncio.Lock()
+            self._loop = loop
+        return self._lock
+
+    async def acquire(self, timeout: float) -> None:
+        """Wait for a token.
+
+        Raises:
+            RateLimitTimeout: If no token becomes available within ``timeout``
+        """
+        deadline = time.monotonic() + timeout
+        async with self._get_lock():
+            while not self.try_acquire():
+                wait = self.wait_time()
+                remaining = deadline - time.monotonic()
+                if wait > remaining:
+                    raise RateLimitTimeout("Rate limit exceeded", retry_after=wait)
+                await asyncio.sleep(wait)
+
+
+class ConcurrencyLimiter:
+    """Caps in-flight calls and throttles their start rate with a token bucket."""
+
+    def __init__(self, max_concurrency: int, rate_per_minute: float, burst: int) -> None:
+        self.max_concurrency = max_concurrency
+        self.bucket = TokenBucket(rate_per_minute, burst)
+        self.in_flight = 0
+        self.waiting = 0
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._loop = loop
+        return self._semaphore
+
+    @asynccontextmanager
+    async def slot(self, timeout: float) -> AsyncIterator[None]:
+        """Hold one concurrency slot and one rate token for the ``with`` body.
+
+        Waiting for both counts against ``timeout``.
+
+        Raises:
+            RateLimitTimeout: If the slot could not be obtained in time
+        """
+        deadline = time.monotonic() + timeout
+        semaphore = self._get_semaphore()
+        self.waiting += 1
+        try:
+            try:
+                await asyncio.wait_for(semaphore.acquire(), timeout=timeout)
+            except asyncio.TimeoutError:
+                raise RateLimitTimeout("Too many concurrent calls", retry_after=1.0) from None
+            try:
+                await self.bucket.acquire(max(0.0, deadline - time.monotonic()))
+            except BaseException:
+                semaphore.release()
+                raise
+        finally:
+            self.waiting -= 1
+
+        self.in_flight += 1
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            semaphore.release()
+
+
+class _UserAdmission:
+    __slots__ = ("bucket", "in_flight", "last_used")
+
+    def __init__(self, rate_per_minute: float, burst: int) -> None:
+        self.bucket = TokenBucket(rate_per_minute, burst)
+        self.in_flight = 0
+        self.last_used = time.monotonic()
+
+
+class AdmissionController:
+    """Per-user and global admission control for expensive requests.
+
+    A request is admitted when its user has fewer than
+    ``user_max_concurrency`` requests in flight and a token left in their
+    bucket (``user_rate_per_minute``, ``user_burst``); both checks fail
+    immediately. Admitted requests then wait (FIFO) for one of
+    ``max_in_flight`` global slots, up to ``queue_timeout`` seconds; at most
+    ``max_waiting`` requests may wait at once.
+
+    Use ``slot(user_id)``, or ``acquire``/``release`` when the work outlives
+    the caller (e.g. a streaming response or a queued job). ``cost`` charges
+    several rate tokens for one request (one per batch item, at most
+    ``user_burst``); with ``hold_global=False`` only the per-user limits apply
+    and the caller takes global slots itself through ``acquire_global``.
+    """
+
+    def __init__(
+        self,
+        user_max_concurrency: int,
+        user_rate_per_minute: float,
+        user_burst: int,
+        max_in_flight: int,
+        max_waiting: int,
+        queue_timeout: float,
+    ) -> None:
+        self.user_max_concurrency = user_max_concurrency
+        self.user_rate_per_minute = user_rate_per_minute
+        self.user_burst = user_burst
+        self.max_in_flight = max_in_flight
+        self.max_waiting = max_waiting
+        self.queue_timeout = queue_timeout
+        self.in_flight = 0
+        self.waiting = 0
+        self._users: dict[int, _UserAdmission] = {}
+        self._last_sweep = time.monotonic()
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_in_flight)
+            self._loop = loop
+        return self._semaphore
+
+    def _user(self, user_id: int) -> _UserAdmission:
+        now = time.monotonic()
+        # Forget idle users once their bucket would have refilled completely
+        idle_after = 60.0 * self.user_burst / max(self.user_rate_per_minute, 1e-9)
+        if now - self._last_sweep > idle_after:
+            self._users = {
+                key: state for key, state in self._users.items()
+                if state.in_flight or now - state.last_used < idle_after
+            }
+            self._last_sweep = now
+        state = self._users.get(user_id)
+        if state is None:
+            state = self._users[user_id] = _UserAdmission(self.user_rate_per_minute, self.user_burst)
+        state.last_used = now
+        return state
+
+    def user_in_flight(self, user_id: int) -> int:
+        state = self._users.get(user_id)
+        return state.in_flight if state else 0
+
+    async def acquire(self, user_id: int, cost: int = 1, hold_global: bool = True) -> None:
+        """Admit one request of ``user_id``; pair with ``release``.
+
+        Raises:
+            ValueError: If ``cost`` exceeds ``user_burst``; such a request
+                could never be admitted, so callers must reject it first
+            RateLimitTimeout: If a per-user limit is hit, the wait queue is
+                full or no global slot freed up within ``queue_timeout``
+        """
+        cost = max(1, cost)
+        state = self._user(user_id)
+        if cost > state.bucket.capacity:
+            raise ValueError(f"Cost {cost} exceeds the per-user burst of {state.bucket.capacity}")
+        if state.in_flight >= self.user_max_concurrency:
+            raise RateLimitTimeout("Too many concurrent requests for this user", retry_after=1.0)
+        # Global rejections must not use up the user's per-minute quota
+        if hold_global and self._queue_full():
+            raise RateLimitTimeout("Admission queue is full", retry_after=self.queue_timeout)
+        if not state.bucket.try_acquire(cost):
+            raise RateLimitTimeout(
+                "Too many requests for this user", retry_after=state.bucket.wait_time(cost)
+            )
+
+        state.in_flight += 1
+        if not hold_global:
+            return
+        try:
+            await self.acquire_global()
+        except RateLimitTimeout:
+            state.in_flight -= 1
+            state.bucket.refund(cost)
+            raise
+        except BaseException:
+            state.in_flight -= 1
+            raise
+
+    def _queue_full(self) -> bool:
+        return self._get_semaphore().locked() and self.waiting >= self.max_waiting
+
+    async def acquire_global(self) -> None:
+        """Wait for one global slot only; pair with ``release_global``.
+
+        Raises:
+            RateLimitTimeout: If the wait queue is full or no slot freed up in time
+        """
+        if self._queue_full():
+            raise RateLimitTimeout("Admission queue is full", retry_after=self.queue_timeout)
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(self._get_semaphore().acquire(), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            raise RateLimitTimeout("Timed out waiting for admission", retry_after=1.0) from None
+        finally:
+            self.waiting -= 1
+        self.in_flight += 1
+
+    def release_global(self) -> None:
+        """Release a slot taken by ``acquire_global``."""
+        self.in_flight -= 1
+        self._get_semaphore().release()
+
+    def release(self, user_id: int, hold_global: bool = True) -> None:
+        """Release a request admitted by ``acquire`` (same ``hold_global``)."""
+        if hold_global:
+            self.release_global()
+        state = self._users.get(user_id)
+        if state is not None:
+            state.in_flight -= 1
+
+    @asynccontextmanager
+    async def slot(self, user_id: int, cost: int = 1, hold_global: bool = True) -> AsyncIterator[None]:
+        """Hold an admission for the ``with`` body.
+
+        Raises:
+            RateLimitTimeout: If the request is not admitted
+        """
+        await self.acquire(user_id, cost=cost, hold_global=hold_global)
+        try:
+            yield
+        finally:
+            self.release(user_id, hold_global=hold_global)
+
+
+__all__ = ["AdmissionController", "ConcurrencyLimiter", "RateLimitTimeout", "TokenBucket"]
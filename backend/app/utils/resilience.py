@@ -0,0 +1,244 @@
+"""Resilience primitives for calls to flaky upstream services.
+
+- ``retry_async``: jittered exponential backoff for retryable errors
+- ``LatencyTracker`` + ``hedged``: fire a backup attempt when the first one is
+  slower than the observed p95
+- ``CircuitBreaker``: fail fast while the upstream error rate is high
+"""
+
+import asyncio
+import logging
+import random
+import threading
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from typing import Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+CIRCUIT_CLOSED = "closed"
+CIRCUIT_OPEN = "open"
+CIRCUIT_HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an upstream whose circuit is open."""
+
+    def __init__(self, message: str, retry_after: float) -> None:
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def backoff_delay(attempt: int, base_delay: float, max_delay: float) -> float:
+    """Full-jitter exponential backoff for the given (0-based) retry number."""
+    return random.uniform(0, min(max_delay, base_delay * (2 ** attempt)))
+
+
+async def retry_async(
+    call: Callable[[], Awaitable[T]],
+    is_retryable: Callable[[BaseException], bool],
+    attempts: int,
+    base_delay: float,
+    max_delay: float,
+    on_retry: Optional[Callable[[int, BaseException], None]] = None,
+) -> T:
+    """Await ``call()`` up to ``attempts`` times, sleeping between retryable failures.
+
+    Non-retryable errors and the last failure are re-raised unchanged.
+    """
+    for attempt in range(attempts):
+        try:
+            return await call()
+        except Exception as e:
+            if attempt + 1 >= attempts or not is_retryable(e):
+                raise
+            if on_retry is not None:
+                on_retry(attempt + 1, e)
+            await asyncio.sleep(backoff_delay(attempt, base_delay, max_delay))
+    raise RuntimeError("retry_async called with attempts < 1")
+
+
+class LatencyTracker:
+    """Rolling window of call latencies used to pick the hedging delay."""
+
+    def __init__(self, window: int = 200) -> None:
+        self._samples: deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def percentile(self, pct: float) -> Optional[float]:
+        """Latency at percentile ``pct`` (0-100), or None without samples."""
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return None
+        index = min(len(samples) - 1, int(round(pct / 100 * (len(samples) - 1))))
+        return samples[index]
+
+
+async def hedged(
+    call: Callable[[], Awaitable[T]],
+    delay: Optional[float],
+    on_hedge: Optional[Callable[[], None]] = None,
+) -> T:
+    """Run ``call()``; if it has not finished after ``delay`` seconds, start a
+    second attempt and return whichever succeeds first.
+
+    With ``delay=None`` this is a plain ``await call()``. The losing attempt is
+    cancelled. If both fail, the first attempt's error is raised.
+    """
+    if delay is None:
+        return await call()
+
+    primary = asyncio.ensure_future(call())
+    try:
+        done, _ = await asyncio.wait({primary}, timeout=delay)
+    except BaseException:
+        primary.cancel()
+        raise
+    if done:
+        return primary.result()
+
+    if on_hedge is not None:
+        on_hedge()
+    backup = asyncio.ensure_future(call())
+    pending = {primary, backup}
+    first_error: Optional[BaseException] = None
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+                if first_error is None or task is primary:
+                    first_error = task.exception()
+        assert first_error is not None
+        raise first_error
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+class CircuitBreaker:
+    """Error-rate circuit breaker over a sliding time window.
+
+    The circuit opens when at least ``min_calls`` outcomes were recorded in the
+    last ``window_seconds`` and the failure ratio reaches ``failure_rate``.
+    After ``open_seconds`` a single trial call is let through (half-open); its
+    outcome closes the circuit again or re-opens it. A trial that never
+    reports back (e.g. cancelled) is replaced after another ``open_seconds``.
+    """
+
+    def __init__(
+        self,
+        failure_rate: float,
+        min_calls: int,
+        window_seconds: float,
+        open_seconds: float,
+    ) -> None:
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.window_seconds = window_seconds
+        self.open_seconds = open_seconds
+        self.state = CIRCUIT_CLOSED
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._trial_started_at = 0.0
+        self._outcomes: deque[tuple[float, bool]] = deque()
+        self._lock = threading.Lock()
+
+    def _prune(self, now: float) -> None:
+        cutoff = now - self.window_seconds
+        while self._outcomes and self._outcomes[0][0] < cutoff:
+            self._outcomes.popleft()
+
+    def is_open(self) -> bool:
+        """True while calls are rejected without a trial being due."""
+        return self.state == CIRCUIT_OPEN and self.retry_after() > 0
+
+    def retry_after(self) -> float:
+        """Seconds until the circuit will let a trial call through."""
+        if self.state != CIRCUIT_OPEN:
+            return 0.0
+        return max(0.0, self._opened_at + self.open_seconds - time.monotonic())
+
+    def before_call(self) -> None:
+        """Check whether a call may proceed.
+
+        Raises:
+            CircuitOpenError: If the circuit is open (or a trial call is already running)
+        """
+        with self._lock:
+            if self.state == CIRCUIT_CLOSED:
+                return
+            now = time.monotonic()
+            if self.state == CIRCUIT_OPEN and now - self._opened_at >= self.open_seconds:
+                self.state = CIRCUIT_HALF_OPEN
+                self._trial_in_flight = False
+            if self.state == CIRCUIT_HALF_OPEN and (
+                not self._trial_in_flight or now - self._trial_started_at >= self.open_seconds
+            ):
+                self._trial_in_flight = True
+                self._trial_started_at = now
+                return
+            retry_after = max(1.0, self._opened_at + self.open_seconds - now)
+            if self.state == CIRCUIT_HALF_OPEN:
+                retry_after = 1.0
+        raise CircuitOpenError("Circuit open", retry_after=retry_after)
+
+    def record_success(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            if self.state == CIRCUIT_HALF_OPEN:
+                logger.info("Circuit closed after successful trial call")
+                self.state = CIRCUIT_CLOSED
+                self._trial_in_flight = False
+                self._outcomes.clear()
+            self._outcomes.append((now, True))
+            self._prune(now)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            if self.state == CIRCUIT_HALF_OPEN:
+                self._open(now)
+                return
+            self._outcomes.append((now, False))
+            self._prune(now)
+            failures = sum(1 for _, ok in self._outcomes if not ok)
+            if (
+                self.state == CIRCUIT_CLOSED
+                and len(self._outcomes) >= self.min_calls
+                and failures / len(self._outcomes) >= self.failure_rate
+            ):
+                self._open(now)
+
+    def _open(self, now: float) -> None:
+        logger.warning(f"Circuit opened for {self.open_seconds}s")
+        self.state = CIRCUIT_OPEN
+        self._opened_at = now
+        self._trial_in_flight = False
+        self._outcomes.clear()
+
+
+__all__ = [
+    "CircuitBreaker",
+    "CircuitOpenError",
+    "LatencyTracker",
+    "backoff_delay",
+    "hedged",
+    "retry_async",
+    "CIRCUIT_CLOSED",
+    "CIRCUIT_OPEN",
+    "CIRCUIT_HALF_OPEN",
+]
@@ -0,0 +1,194 @@
+"""Helpers for streaming request bodies to temporary storage."""
+
+import io
+import os
+import tempfile
+from collections.abc import AsyncIterator, Callable
+from pathlib import Path
+from typing import BinaryIO, Optional, Union
+
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import FormData, Headers
+from starlette.formparsers import MultiPartParser
+
+# Room for boundaries, part headers and the small form fields around a file
+MULTIPART_OVERHEAD = 64 * 1024
+
+
+class UploadTooLargeError(Exception):
+    """Raised when an uploaded body exceeds the configured size limit."""
+
+
+def _remove_file(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+class SpooledUpload:
+    """Upload body kept in memory up to ``max_memory`` bytes, then on disk.
+
+    Unlike ``tempfile.SpooledTemporaryFile`` the on-disk file is named, so
+    large recordings can be handed to ffmpeg by path instead of being read
+    back into memory. ``discard`` deletes that file on close; pass a
+    background scheduler to keep the deletion off the request path.
+    """
+
+    def __init__(
+        self,
+        max_memory: int,
+        max_size: int,
+        suffix: str = "",
+        discard: Optional[Callable[[str], None]] = None,
+    ) -> None:
+        self.max_memory = max_memory
+        self.max_size = max_size
+        self.suffix = suffix
+        self.discard = discard or _remove_file
+        self.size = 0
+        self._file: BinaryIO = io.BytesIO()
+        self._path: Optional[str] = None
+
+    @property
+    def path(self) -> Optional[str]:
+        """Path of the on-disk file, or None while the body is in memory."""
+        return self._path
+
+    @property
+    def rolled(self) -> bool:
+        return self._path is not None
+
+    def write(self, chunk: bytes) -> None:
+        """Append a chunk, rolling over to disk once ``max_memory`` is exceeded.
+
+        Raises:
+            UploadTooLargeError: If the total size exceeds ``max_size``
+        """
+        self.size += len(chunk)
+        if self.size > self.max_size:
+            raise UploadTooLargeError(
+                f"Upload exceeds maximum size of {self.max_size} bytes"
+            )
+        if not self.rolled and self.size > self.max_memory:
+            self._rollover()
+        self._file.write(chunk)
+
+    def _rollover(self) -> None:
+        fd, path = tempfile.mkstemp(prefix="upload_", suffix=self.suffix)
+        disk_file = os.fdopen(fd, "w+b")
+        disk_file.write(self._file.getvalue())
+        self._file = disk_file
+        self._path = path
+
+    def as_audio_input(self) -> Union[BinaryIO, Path]:
+        """Return the body in a form accepted by ``AudioService``."""
+        self._file.flush()
+        if self._path:
+            return Path(self._path)
+        self._file.seek(0)
+        return self._file
+
+    def close(self) -> None:
+        """Release the buffer and delete the on-disk file if any."""
+        self._file.close()
+        if self._path:
+            self.discard(self._path)
+            self._path = None
+
+    def __enter__(self) -> "SpooledUpload":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+async def spool_stream(
+    chunks: AsyncIterator[bytes],
+    max_memory: int,
+    max_size: int,
+    suffix: str = "",
+    discard: Optional[Callable[[str], None]] = None,
+) -> SpooledUpload:
+    """Consume an async byte stream chunk by chunk into a ``SpooledUpload``.
+
+    Raises:
+        UploadTooLargeError: If the stream exceeds ``max_size``
+    """
+    spool = SpooledUpload(max_memory=max_memory, max_size=max_size, suffix=suffix, discard=discard)
+    try:
+        async for chunk in chunks:
+            if not chunk:
+                continue
+            if spool.rolled:
+                await run_in_threadpool(spool.write, chunk)
+            else:
+                spool.write(chunk)
+    except BaseException:
+        spool.close()
+        raise
+    return spool
+
+
+def check_content_length(headers: Headers, max_size: int) -> None:
+    """Reject a body whose declared length is already over ``max_size``.
+
+    Raises:
+        UploadTooLargeError: If ``Content-Length`` exceeds ``max_size``
+    """
+    content_length = headers.get("content-length", "")
+    if content_length.isdigit() and int(content_length) > max_size:
+        raise UploadTooLargeError(f"Upload exceeds maximum size of {max_size} bytes")
+
+
+async def limit_stream(chunks: AsyncIterator[bytes], max_size: int) -> AsyncIterator[bytes]:
+    """Pass ``chunks`` through, failing as soon as more than ``max_size`` bytes arrived.
+
+    Raises:
+        UploadTooLargeError: If the stream exceeds ``max_size``
+    """
+    received = 0
+    async for chunk in chunks:
+        received += len(chunk)
+        if received > max_size:
+            raise UploadTooLargeError(f"Upload exceeds maximum size of {max_size} bytes")
+        yield chunk
+
+
+async def parse_multipart(
+    headers: Headers,
+    chunks: AsyncIterator[bytes],
+    max_file_size: int,
+    max_files: int = 1,
+    max_fields: int = 5,
+) -> FormData:
+    """Parse a ``multipart/form-data`` body without accepting more than one file's worth.
+
+    ``Request.form()`` spools the whole body before the caller can check its
+    size; here the body is cut off while it streams in. Files are kept in
+    Starlette's ``UploadFile`` spools (memory, then disk), which callers can
+    read directly.
+
+    Raises:
+        UploadTooLargeError: If the body exceeds ``max_file_size`` plus
+            ``MULTIPART_OVERHEAD``
+        starlette.formparsers.MultiPartException: If the body is malformed
+            or has too many parts
+    """
+    max_size = max_file_size + MULTIPART_OVERHEAD
+    check_content_length(headers, max_size)
+    parser = MultiPartParser(
+        headers, limit_stream(chunks, max_size), max_files=max_files, max_fields=max_fields
+    )
+    return await parser.parse()
+
+
+__all__ = [
+    "MULTIPART_OVERHEAD",
+    "SpooledUpload",
+    "UploadTooLargeError",
+    "check_content_length",
+    "limit_stream",
+    "parse_multipart",
+    "spool_stream",
+]
@@ -0,0 +1,417 @@
+"""End-to-end load test for the practice API against local stand-ins.
+
+The harness:
+
+1. Points the app at local stand-ins: a SQLite file instead of Postgres
+   (or ``--database-url`` for a local Postgres), a tiny HTTP server instead of
+   Google Drive and the fake evaluator backend instead of Gemini.
+2. Seeds ``users`` and ``practice_sentences`` and mints access tokens with
+   ``create_access_token``.
+3. Starts the app with uvicorn and drives ``/practice/sentences/random/any``,
+   ``/practice/audio/{file_id}`` and ``/practice/evaluate`` at the requested
+   concurrency.
+4. Reports throughput, p50/p95/p99 latency and error rate per endpoint and
+   stores the report as ``benchmarks/results/<commit>.json``; the previous
+   report (or ``--baseline``) is printed alongside so regressions between
+   commits are visible.
+
+Usage (from ``backend/``)::
+
+    python -m benchmarks.load_test --requests 500 --concurrency 32
+    python -m benchmarks.load_test --endpoints evaluate --fake-latency-ms 0
+"""
+
+import argparse
+import asyncio
+import base64
+import io
+import json
+import math
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import wave
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Optional
+
+import httpx
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+API_PREFIX = "/api/v1/practice"
+ENDPOINTS = ("random_sentence", "drive_audio", "evaluate")
+
+SAMPLE_SENTENCES = [
+    ("I like green tea.", "beginner", "daily life"),
+    ("Could you tell me the way to the station?", "beginner", "travel"),
+    ("She has been working here for three years.", "intermediate", "work"),
+    ("The weather is getting warmer these days.", "intermediate", "daily life"),
+    ("Thorough preparation is the key to a successful presentation.", "advanced", "work"),
+    ("Technological breakthroughs rarely happen without collaboration.", "advanced", "technology"),
+]
+
+
+# ---------------------------------------------------------------------------
+# Stand-ins
+# ---------------------------------------------------------------------------
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_drive_stub(size_kb: int, latency_ms: float) -> tuple[ThreadingHTTPServer, str]:
+    """Serve ``/uc?export=download&id=...`` like Drive, with Range support."""
+    body = bytes(random.Random(0).getrandbits(8) for _ in range(size_kb * 1024))
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:  # noqa: N802
+            if latency_ms:
+                time.sleep(latency_ms / 1000)
+            start, end = 0, len(body) - 1
+            status = 200
+            range_header = self.headers.get("Range")
+            if range_header and range_header.startswith("bytes="):
+                first, _, last = range_header[6:].partition("-")
+                start = int(first or 0)
+                end = min(int(last), end) if last else end
+                status = 206
+            self.send_response(status)
+            self.send_header("Content-Type", "audio/mpeg")
+            self.send_header("Accept-Ranges", "bytes")
+            self.send_header("Content-Length", str(end - start + 1))
+            if status == 206:
+                self.send_header("Content-Range", f"bytes {start}-{end}/{len(body)}")
+            self.end_headers()
+            self.wfile.write(body[start:end + 1])
+
+        def log_message(self, *args: Any) -> None:
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", _free_port()), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}/uc?export=download"
+
+
+def make_recording(seconds: float, sample_rate: int = 16000) -> str:
+    """Base64 WAV with silence around a voiced-like tone, as the frontend sends."""
+    frames = bytearray()
+    total = int(seconds * sample_rate)
+    for i in range(total):
+        t = i / sample_rate
+        voiced = 0.2 * seconds < t < 0.8 * seconds
+        value = int(8000 * math.sin(2 * math.pi * 220 * t)) if voiced else 0
+        frames += value.to_bytes(2, "little", signed=True)
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(bytes(frames))
+    return base64.b64encode(buffer.getvalue()).decode()
+
+
+# ---------------------------------------------------------------------------
+# Seeding (runs after the environment is configured)
+# ---------------------------------------------------------------------------
+
+
+def seed_database(users: int, sentences: int) -> tuple[list[str], list[int], list[str]]:
+    """Create tables and seed rows; return (tokens, sentence ids, drive file ids)."""
+    from app.core.security import create_access_token, hash_password
+    from app.db.base import Base
+    from app.db.models_practice_attempt import PracticeAttempt
+    from app.db.models_practice_sentence import PracticeSentence
+    from app.db.models_user import User
+    from app.db.session import SessionLocal, engine
+
+    Base.metadata.create_all(engine)
+    db = SessionLocal()
+    try:
+        # Only rows created by earlier runs are removed (safe on a shared database)
+        old_users = db.query(User).filter(User.username.like("loadtest_%"))
+        old_sentences = db.query(PracticeSentence).filter(
+            PracticeSentence.audio_url.like("%/loadtest-%")
+        )
+        db.query(PracticeAttempt).filter(
+            PracticeAttempt.user_id.in_(old_users.with_entities(User.user_id).scalar_subquery())
+            | PracticeAttempt.sentence_id.in_(
+                old_sentences.with_entities(PracticeSentence.sentence_id).scalar_subquery()
+            )
+        ).delete(synchronize_session=False)
+        old_sentences.delete(synchronize_session=False)
+        old_users.delete(synchronize_session=False)
+        password_hash = hash_password("loadtest-password")
+        user_rows = [
+            User(username=f"loadtest_{i}", email=f"loadtest_{i}@example.com", password_hash=password_hash)
+            for i in range(users)
+        ]
+        sentence_rows = []
+        for i in range(sentences):
+            text, difficulty, topic = SAMPLE_SENTENCES[i % len(SAMPLE_SENTENCES)]
+            sentence_rows.append(PracticeSentence(
+                sentence_text=text,
+                difficulty=difficulty,
+                topic=topic,
+                audio_url=f"https://drive.google.com/file/d/loadtest-{i}/view",
+            ))
+        db.add_all(user_rows + sentence_rows)
+        db.commit()
+        tokens = [create_access_token(str(user.user_id)) for user in user_rows]
+        sentence_ids = [sentence.sentence_id for sentence in sentence_rows]
+    finally:
+        db.close()
+    return tokens, sentence_ids, [f"loadtest-{i}" for i in range(sentences)]
+
+
+# ---------------------------------------------------------------------------
+# Load generation and reporting
+# ---------------------------------------------------------------------------
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of ``values`` (0 for an empty list)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize(samples: list[tuple[float, int]], wall_seconds: float) -> dict[str, Any]:
+    """Aggregate ``(latency_seconds, status)`` samples; status 0 means a transport error."""
+    latencies_ms = [latency * 1000 for latency, _ in samples]
+    errors = sum(1 for _, status in samples if not 200 <= status < 300)
+    statuses: dict[str, int] = {}
+    for _, status in samples:
+        statuses[str(status)] = statuses.get(str(status), 0) + 1
+    return {
+        "requests": len(samples),
+        "errors": errors,
+        "error_rate": round(errors / len(samples), 4) if samples else 0.0,
+        "throughput_rps": round(len(samples) / wall_seconds, 2) if wall_seconds else 0.0,
+        "latency_ms": {
+            "mean": round(sum(latencies_ms) / len(latencies_ms), 2) if latencies_ms else 0.0,
+            "p50": round(percentile(latencies_ms, 50), 2),
+            "p95": round(percentile(latencies_ms, 95), 2),
+            "p99": round(percentile(latencies_ms, 99), 2),
+            "max": round(max(latencies_ms), 2) if latencies_ms else 0.0,
+        },
+        "statuses": statuses,
+    }
+
+
+async def run_endpoint(
+    client: httpx.AsyncClient,
+    endpoint: str,
+    requests_total: int,
+    concurrency: int,
+    tokens: list[str],
+    sentence_ids: list[int],
+    file_ids: list[str],
+    recording: str,
+    seed: int,
+) -> dict[str, Any]:
+    rng = random.Random(seed)
+    plan = []
+    for _ in range(requests_total):
+        headers = {"Authorization": f"Bearer {rng.choice(tokens)}"}
+        if endpoint == "random_sentence":
+            plan.append(("GET", f"{API_PREFIX}/sentences/random/any", headers, None))
+        elif endpoint == "drive_audio":
+            if rng.random() < 0.5:
+                headers["Range"] = "bytes=0-65535"
+            plan.append(("GET", f"{API_PREFIX}/audio/{rng.choice(file_ids)}", headers, None))
+        else:
+            body = {"sentence_id": rng.choice(sentence_ids), "audio_data": recording}
+            plan.append(("POST", f"{API_PREFIX}/evaluate", headers, body))
+
+    samples: list[tuple[float, int]] = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def issue(method: str, url: str, headers: dict[str, str], body: Optional[dict]) -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                response = await client.request(method, url, headers=headers, json=body)
+                await response.aread()
+                status = response.status_code
+            except httpx.HTTPError:
+                status = 0
+            samples.append((time.perf_counter() - started, status))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(issue(*request) for request in plan))
+    return summarize(samples, time.perf_counter() - started)
+
+
+def wait_for_server(base_url: str, process: subprocess.Popen, timeout: float = 60) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Server exited with code {process.returncode}")
+        try:
+            if httpx.get(f"{base_url}/health", timeout=1).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError("Server did not become healthy in time")
+
+
+def git_revision() -> tuple[str, bool]:
+    """Current commit hash and whether the work tree has uncommitted changes."""
+    try:
+        commit = subprocess.check_output(["git", "rev-parse", "HEAD"], cwd=BACKEND_DIR, text=True).strip()
+        dirty = bool(subprocess.check_output(
+            ["git", "status", "--porcelain", "--untracked-files=no"], cwd=BACKEND_DIR, text=True
+        ).strip())
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown", False
+    return commit, dirty
+
+
+def previous_report(current: Path) -> Optional[Path]:
+    reports = [path for path in RESULTS_DIR.glob("*.json") if path != current]
+    return max(reports, key=lambda path: path.stat().st_mtime) if reports else None
+
+
+def print_report(report: dict[str, Any], baseline: Optional[dict[str, Any]]) -> None:
+    print(f"\nCommit {report['commit'][:12]}{' (dirty)' if report['dirty'] else ''}")
+    header = f"{'endpoint':<16}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errors':>9}"
+    print(header)
+    print("-" * len(header))
+    for name, stats in report["endpoints"].items():
+        latency = stats["latency_ms"]
+        print(
+            f"{name:<16}{stats['throughput_rps']:>10.1f}{latency['p50']:>10.1f}"
+            f"{latency['p95']:>10.1f}{latency['p99']:>10.1f}{stats['error_rate']:>9.1%}"
+        )
+        previous = (baseline or {}).get("endpoints", {}).get(name)
+        if previous:
+            old = previous["latency_ms"]
+            print(
+                f"{'  vs ' + baseline['commit'][:8]:<16}{previous['throughput_rps']:>10.1f}"
+                f"{old['p50']:>10.1f}{old['p95']:>10.1f}{old['p99']:>10.1f}{previous['error_rate']:>9.1%}"
+            )
+
+
+def configure_environment(args: argparse.Namespace, workdir: Path, drive_url: str) -> dict[str, str]:
+    """Environment for both the seeding code in this process and the server."""
+    env = {
+        "DATABASE_URL": args.database_url or f"sqlite:///{workdir / 'loadtest.db'}",
+        "SECRET_KEY": os.environ.get("SECRET_KEY", "loadtest-secret-key"),
+        "ALGORITHM": os.environ.get("ALGORITHM", "HS256"),
+        "EVALUATOR_BACKEND": "fake",
+        "FAKE_EVALUATOR_LATENCY_MS": str(args.fake_latency_ms),
+        "FAKE_EVALUATOR_LATENCY_DISTRIBUTION": args.fake_latency_distribution,
+        "FAKE_EVALUATOR_ERROR_RATE": str(args.fake_error_rate),
+        "FAKE_EVALUATOR_SEED": str(args.seed),
+        "DRIVE_DOWNLOAD_URL": drive_url,
+        "DRIVE_AUDIO_CACHE_DIR": str(workdir / "drive_audio_cache"),
+        # Every request must exercise the full pipeline
+        "EVALUATION_CACHE_BACKEND": "none",
+        # A few seeded users generate all the traffic; only the global
+        # admission limits apply
+        "ADMISSION_USER_MAX_CONCURRENCY": str(args.concurrency),
+        "ADMISSION_USER_REQUESTS_PER_MINUTE": "1000000",
+        "ADMISSION_USER_BURST": "1000000",
+        "DEBUG": "False",
+    }
+    os.environ.update(env)
+    return {**os.environ, **env}
+
+
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--endpoints", nargs="+", choices=ENDPOINTS, default=list(ENDPOINTS))
+    parser.add_argument("--requests", type=int, default=200, help="requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--sentences", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--audio-seconds", type=float, default=3.0)
+    parser.add_argument("--fake-latency-ms", type=float, default=800.0)
+    parser.add_argument("--fake-latency-distribution", default="lognormal")
+    parser.add_argument("--fake-error-rate", type=float, default=0.0)
+    parser.add_argument("--drive-file-kb", type=int, default=256)
+    parser.add_argument("--drive-latency-ms", type=float, default=20.0)
+    parser.add_argument("--database-url", help="use this database instead of a temporary SQLite file")
+    parser.add_argument("--baseline", type=Path, help="report to compare against (default: previous one)")
+    parser.add_argument("--seed", type=int, default=42)
+    return parser.parse_args(argv)
+
+
+async def drive_load(args: argparse.Namespace, base_url: str, seeded: tuple) -> dict[str, Any]:
+    tokens, sentence_ids, file_ids = seeded
+    recording = make_recording(args.audio_seconds)
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    results = {}
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=120) as client:
+        for index, endpoint in enumerate(args.endpoints):
+            print(f"Running {endpoint}: {args.requests} requests at concurrency {args.concurrency}")
+            results[endpoint] = await run_endpoint(
+                client, endpoint, args.requests, args.concurrency,
+                tokens, sentence_ids, file_ids, recording, seed=args.seed + index,
+            )
+    return results
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    args = parse_args(argv)
+    drive_server, drive_url = start_drive_stub(args.drive_file_kb, args.drive_latency_ms)
+    with tempfile.TemporaryDirectory(prefix="loadtest-") as tmp:
+        env = configure_environment(args, Path(tmp), drive_url)
+        seeded = seed_database(args.users, args.sentences)
+
+        port = _free_port()
+        base_url = f"http://127.0.0.1:{port}"
+        server = subprocess.Popen(
+            [
+                sys.executable, "-m", "uvicorn", "main:app",
+                "--app-dir", str(BACKEND_DIR),
+                "--host", "127.0.0.1", "--port", str(port),
+                "--workers", str(args.workers), "--log-level", "warning",
+            ],
+            # Recordings saved by the app land in the temporary directory
+            cwd=tmp,
+            env=env,
+        )
+        try:
+            wait_for_server(base_url, server)
+            endpoints = asyncio.run(drive_load(args, base_url, seeded))
+        finally:
+            server.terminate()
+            server.wait(timeout=30)
+            drive_server.shutdown()
+
+    commit, dirty = git_revision()
+    report = {
+        "commit": commit,
+        "dirty": dirty,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "config": {key: str(value) for key, value in vars(args).items() if key != "baseline"},
+        "endpoints": endpoints,
+    }
+    RESULTS_DIR.mkdir(exist_ok=True)
+    output = RESULTS_DIR / f"{commit[:12]}{'-dirty' if dirty else ''}.json"
+    baseline_path = args.baseline or previous_report(output)
+    baseline = json.loads(baseline_path.read_text()) if baseline_path else None
+    output.write_text(json.dumps(report, indent=2))
+
+    print_report(report, baseline)
+    print(f"\nSaved {output.relative_to(BACKEND_DIR)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -13,10 +13,16 @@ from sqlalchemy.orm import Session
 
 from app.api import api_router
 from app.core.config import settings
+from app.core.logging import start_queue_logging, stop_queue_logging
+from app.core.metrics import metrics
 from app.db.base import Base
 from app.db.session import engine
 from app.database import get_db
 from app.schemas.common import ResponseModel
+from app.services.background_tasks import background_tasks, orphan_sweeper
+from app.services.evaluation_jobs import evaluation_job_queue
+from app.services.http_client import upstream_http
+from app.services.recording_store import recording_retention_job
 
 
 def create_app() -> FastAPI:
@@ -52,6 +58,7 @@ def create_app() -> FastAPI:
                 "data": None,
                
             },
+            headers=getattr(exc, "headers", None),
         )
 
     @app.exception_handler(RequestValidationError)
@@ -95,9 +102,28 @@ def create_app() -> FastAPI:
 
         # Create database tables (simple approach, no Alembic yet)
         Base.metadata.create_all(bind=engine)
+        await evaluation_job_queue.start()
+        await upstream_http.start()
+        if settings.RECORDING_GC_ENABLED:
+            await recording_retention_job.start()
+        await background_tasks.start()
+        await orphan_sweeper.start()
+        if settings.LOG_QUEUE_ENABLED:
+            start_queue_logging()
         print("🚀 FastAPI application started")
         print(f"📊 Database URL: {os.getenv('DATABASE_URL', 'Not set')}")
 
+    @app.on_event("shutdown")
+    async def shutdown_event() -> None:
+        """Application shutdown hook."""
+
+        await evaluation_job_queue.stop()
+        await upstream_http.stop()
+        await recording_retention_job.stop()
+        await orphan_sweeper.stop()
+        await background_tasks.stop()
+        stop_queue_logging()
+
     @app.get("/")
     async def root() -> dict[str, str]:
         return {
@@ -122,6 +148,11 @@ def create_app() -> FastAPI:
             "environment": os.getenv("ENVIRONMENT", "development"),
         }
 
+    @app.get("/metrics")
+    async def get_metrics() -> dict[str, float]:
+        """Return in-process counters and gauges (cache hits, queue depth, ...)."""
+        return metrics.snapshot()
+
     @app.get("/api/test")
     async def test_endpoint() -> dict[str, str]:
         return {
@@ -0,0 +1,11 @@
+"""Shared pytest configuration.
+
+Provides the minimum environment required to import ``app.core.config``
+so unit tests can run without a ``.env`` file or a running PostgreSQL.
+"""
+
+import os
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test.db")
+os.environ.setdefault("SECRET_KEY", "test-secret-key")
+os.environ.setdefault("ALGORITHM", "HS256")
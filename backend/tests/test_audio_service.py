@@ -0,0 +1,124 @@
+"""Tests for in-memory audio decoding in AudioService."""
+
+import io
+import math
+import struct
+import wave
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.services.audio_service import AudioService, DecodedAudio
+from app.utils.exceptions import AudioRejectedError
+
+
+def _wav_bytes(seconds: float = 0.5, frame_rate: int = 16000, channels: int = 1) -> bytes:
+    frames = int(seconds * frame_rate)
+    samples = []
+    for i in range(frames):
+        value = int(8000 * math.sin(2 * math.pi * 440 * i / frame_rate))
+        samples.extend([value] * channels)
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav_file:
+        wav_file.setnchannels(channels)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(frame_rate)
+        wav_file.writeframes(struct.pack(f"<{len(samples)}h", *samples))
+    return buffer.getvalue()
+
+
+def test_decode_audio_once_from_bytes() -> None:
+    audio = AudioService().decode_audio(_wav_bytes(seconds=0.5, channels=2))
+
+    assert isinstance(audio, DecodedAudio)
+    assert audio.channels == 2
+    assert audio.frame_rate == 16000
+    assert abs(audio.duration - 0.5) < 1e-6
+    assert AudioService().get_audio_metadata(audio)["duration"] == audio.duration
+
+
+def test_wav_round_trip_is_lossless() -> None:
+    audio = AudioService().decode_audio(_wav_bytes())
+    again = AudioService().decode_audio(audio.to_wav_bytes())
+
+    assert again == audio
+
+
+def test_prepare_for_model_downmixes_and_resamples(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "AUDIO_MODEL_FORMAT", "wav")
+    audio = AudioService().decode_audio(_wav_bytes(seconds=1.0, frame_rate=48000, channels=2))
+
+    encoded = AudioService().prepare_for_model(audio)
+    compact = AudioService().decode_audio(encoded.data)
+
+    assert encoded.mime_type == "audio/wav"
+    assert compact.channels == 1
+    assert compact.frame_rate == 16000
+    assert abs(compact.duration - 1.0) < 0.01
+    assert encoded.compression_ratio > 5
+
+
+def _tone_with_silence(lead: float, speech: float, pause: float, tail: float) -> DecodedAudio:
+    rate = 16000
+
+    def tone(seconds: float) -> list[int]:
+        return [int(8000 * math.sin(2 * math.pi * 220 * i / rate)) for i in range(int(seconds * rate))]
+
+    def silence(seconds: float) -> list[int]:
+        return [0] * int(seconds * rate)
+
+    samples = silence(lead) + tone(speech) + silence(pause) + tone(speech) + silence(tail)
+    return DecodedAudio(
+        pcm=struct.pack(f"<{len(samples)}h", *samples),
+        frame_rate=rate,
+        channels=1,
+        sample_width=2,
+    )
+
+
+def test_trim_silence_removes_edges_and_caps_pauses(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "VAD_PADDING_MS", 100)
+    monkeypatch.setattr(settings, "VAD_MAX_PAUSE_MS", 400)
+    audio = _tone_with_silence(lead=2.0, speech=1.0, pause=2.0, tail=1.5)
+
+    trimmed = AudioService().trim_silence(audio)
+
+    # 2 x 1s speech + (100ms pad + 400ms pause + 100ms pad) + 100ms per edge
+    assert audio.duration == 7.5
+    assert abs(trimmed.duration - 2.8) < 0.05
+
+
+def test_trim_silence_keeps_all_silent_audio() -> None:
+    audio = DecodedAudio(pcm=b"\x00\x00" * 16000, frame_rate=16000, channels=1, sample_width=2)
+
+    assert AudioService().trim_silence(audio) is audio
+
+
+def _rejection_reason(audio: DecodedAudio, sentence: str = "I like green tea") -> str:
+    try:
+        AudioService().preflight_check(audio, sentence)
+    except AudioRejectedError as e:
+        return e.reason
+    return "accepted"
+
+
+def test_preflight_accepts_normal_recording() -> None:
+    audio = _tone_with_silence(lead=0.3, speech=1.0, pause=0.3, tail=0.3)
+
+    assert _rejection_reason(audio) == "accepted"
+
+
+def test_preflight_rejects_unusable_recordings() -> None:
+    rate = 16000
+    silent = DecodedAudio(pcm=b"\x00\x00" * rate * 2, frame_rate=rate, channels=1, sample_width=2)
+    clipped = DecodedAudio(
+        pcm=struct.pack("<h", 32767) * rate * 2, frame_rate=rate, channels=1, sample_width=2
+    )
+    blip = _tone_with_silence(lead=0.3, speech=0.15, pause=0.0, tail=0.3)
+    long = _tone_with_silence(lead=0.0, speech=10.0, pause=0.0, tail=0.0)
+
+    before = metrics.get("audio_rejections_total", reason="silent")
+    assert _rejection_reason(silent) == "silent"
+    assert metrics.get("audio_rejections_total", reason="silent") == before + 1
+    assert _rejection_reason(clipped) == "clipped"
+    assert _rejection_reason(blip) == "too_short"
+    assert _rejection_reason(long) == "too_long"
@@ -0,0 +1,72 @@
+"""Tests for the background cleanup runner and orphan sweeper."""
+
+import asyncio
+
+import pytest
+from starlette.concurrency import run_in_threadpool
+
+from app.services.background_tasks import BackgroundTaskRunner, OrphanSweeper
+
+
+class _FlakyHandler:
+    def __init__(self, failures: int) -> None:
+        self.failures = failures
+        self.calls: list[str] = []
+
+    def __call__(self, target: str) -> None:
+        self.calls.append(target)
+        if len(self.calls) <= self.failures:
+            raise OSError("temporarily unavailable")
+
+
+def _runner(**overrides) -> BackgroundTaskRunner:
+    options = {"workers": 2, "max_queue_size": 10, "max_attempts": 3, "retry_base_delay": 0.01}
+    options.update(overrides)
+    return BackgroundTaskRunner(**options)
+
+
+@pytest.mark.asyncio
+async def test_task_is_retried_until_it_succeeds() -> None:
+    runner = _runner()
+    handler = _FlakyHandler(failures=2)
+    runner.register("delete", handler)
+    await runner.start()
+
+    # Submitted from a worker thread, as sync request code does
+    await run_in_threadpool(runner.submit, "delete", "file-1")
+    await runner.stop()
+
+    assert handler.calls == ["file-1"] * 3
+    assert runner.failures == []
+
+
+@pytest.mark.asyncio
+async def test_exhausted_task_is_recorded_and_swept() -> None:
+    runner = _runner(max_attempts=2)
+    handler = _FlakyHandler(failures=2)
+    runner.register("delete", handler)
+    sweeper = OrphanSweeper(runner, interval_seconds=60)
+    sweeper.add_scanner(lambda: [("delete", "never-recorded")])
+    await runner.start()
+
+    runner.submit("delete", "file-1")
+    await runner.stop()
+    assert [(failed.target, failed.attempts) for failed in runner.failures] == [("file-1", 2)]
+
+    assert await sweeper.sweep_once() == 2
+    assert runner.failures == []
+    assert sorted(handler.calls[2:]) == ["file-1", "never-recorded"]
+
+
+@pytest.mark.asyncio
+async def test_queue_overflow_is_recorded_not_blocking() -> None:
+    runner = _runner(workers=0, max_queue_size=1)
+    runner.register("delete", lambda target: None)
+    await runner.start()
+
+    runner.submit("delete", "a")
+    runner.submit("delete", "b")
+
+    assert [(failed.target, failed.error) for failed in runner.failures] == [("b", "queue full")]
+    await asyncio.wait_for(runner.stop(timeout=0.01), timeout=1)
+    assert {failed.target for failed in runner.failures} == {"a", "b"}
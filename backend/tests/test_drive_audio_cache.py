@@ -0,0 +1,103 @@
+"""Tests for the on-disk Drive audio cache."""
+
+import asyncio
+
+import pytest
+
+from app.services.drive_audio_cache import DriveAudioCache, UpstreamError
+
+
+class _Drive:
+    def __init__(self, files: dict[str, bytes], delay: float = 0.0) -> None:
+        self.files = files
+        self.delay = delay
+        self.downloads: list[str] = []
+
+    async def __call__(self, file_id: str, destination: str):
+        self.downloads.append(file_id)
+        await asyncio.sleep(self.delay)
+        if file_id not in self.files:
+            raise UpstreamError("missing", status_code=404)
+        with open(destination, "wb") as out:
+            out.write(self.files[file_id])
+        return "audio/mpeg", None
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_download(tmp_path) -> None:
+    drive = _Drive({"abc": b"x" * 100}, delay=0.1)
+    cache = DriveAudioCache(str(tmp_path), max_bytes=1000, downloader=drive)
+
+    entries = await asyncio.gather(*(cache.get("abc") for _ in range(5)))
+    again = await cache.get("abc")
+
+    assert drive.downloads == ["abc"]
+    assert {entry.etag for entry in entries} == {again.etag}
+    assert again.path.read_bytes() == b"x" * 100
+    assert (cache.misses, cache.hits, cache.bytes_saved) == (1, 5, 500)
+
+
+@pytest.mark.asyncio
+async def test_least_recently_used_files_are_evicted(tmp_path) -> None:
+    drive = _Drive({"a": b"1" * 40, "b": b"2" * 40, "c": b"3" * 40})
+    cache = DriveAudioCache(str(tmp_path), max_bytes=100, downloader=drive)
+
+    await cache.get("a")
+    await cache.get("b")
+    await cache.get("a")
+    await cache.get("c")
+
+    assert not (tmp_path / "b").exists()
+    assert (tmp_path / "a").exists() and (tmp_path / "c").exists()
+    assert cache.total_bytes == 80
+    # The index is rebuilt from disk after a restart
+    restarted = DriveAudioCache(str(tmp_path), max_bytes=100, downloader=drive)
+    await restarted.get("a")
+    assert drive.downloads == ["a", "b", "c"]
+
+
+@pytest.mark.asyncio
+async def test_invalid_ids_and_upstream_errors(tmp_path) -> None:
+    cache = DriveAudioCache(str(tmp_path), max_bytes=100, downloader=_Drive({}))
+
+    with pytest.raises(ValueError):
+        await cache.get("../etc/passwd")
+    with pytest.raises(UpstreamError):
+        await cache.get("missing")
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.asyncio
+async def test_cancelled_requester_does_not_fail_shared_download(tmp_path) -> None:
+    drive = _Drive({"abc": b"x" * 100}, delay=0.1)
+    cache = DriveAudioCache(str(tmp_path), max_bytes=1000, downloader=drive)
+
+    first = asyncio.create_task(cache.get("abc"))
+    await asyncio.sleep(0.01)
+    second = asyncio.create_task(cache.get("abc"))
+    await asyncio.sleep(0.01)
+    first.cancel()
+
+    entry = await second
+    with pytest.raises(asyncio.CancelledError):
+        await first
+    assert entry.path.read_bytes() == b"x" * 100
+    assert drive.downloads == ["abc"]
+    assert (await cache.get("abc")).etag == entry.etag
+
+
+@pytest.mark.asyncio
+async def test_size_limit_covers_files_cached_by_other_workers(tmp_path) -> None:
+    drive = _Drive({"a": b"1" * 40, "b": b"2" * 40, "c": b"3" * 40})
+    worker_1 = DriveAudioCache(str(tmp_path), max_bytes=100, downloader=drive)
+    worker_2 = DriveAudioCache(str(tmp_path), max_bytes=100, downloader=drive)
+
+    await worker_1.get("a")
+    await worker_2.get("b")
+    await worker_1.get("c")
+
+    assert not (tmp_path / "a").exists()
+    assert worker_1.total_bytes == 80
+    # worker_2 no longer finds "a" on disk and downloads it again
+    await worker_2.get("a")
+    assert sum(path.stat().st_size for path in tmp_path.iterdir() if path.suffix != ".json") <= 100
@@ -0,0 +1,89 @@
+"""Tests for batch evaluation with partial failures."""
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.core.config import settings
+from app.db.base import Base
+from app.db.models_practice_attempt import PracticeAttempt
+from app.db.models_practice_sentence import PracticeSentence
+from app.db.models_user import User
+from app.services import evaluation_service as evaluation_module
+from app.services.audio_service import DecodedAudio
+from app.services.evaluation_service import EvaluationService
+from app.services.fake_evaluator import FakeEvaluator
+
+
+@pytest.fixture
+def db(monkeypatch):
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    session.add(User(user_id=1, username="student", email="s@example.com", password_hash="x"))
+    session.add_all([
+        PracticeSentence(sentence_id=1, sentence_text="Hello world"),
+        PracticeSentence(sentence_id=2, sentence_text="Good morning"),
+    ])
+    session.commit()
+
+    monkeypatch.setattr(settings, "SAVE_ATTEMPT_AUDIO", False)
+    monkeypatch.setattr(evaluation_module, "create_evaluator", lambda: FakeEvaluator())
+    monkeypatch.setattr(EvaluationService, "_cached_evaluation", staticmethod(lambda key: None))
+    monkeypatch.setattr(evaluation_module.evaluation_cache, "set", lambda key, value: None)
+    monkeypatch.setattr(
+        evaluation_module.AudioService, "prepare_for_model", lambda self, audio: audio
+    )
+
+    def _decode(audio_service, audio_data, sentence_id, target_sentence):
+        if audio_data == "broken":
+            raise ValueError("not audio")
+        return DecodedAudio(pcm=audio_data.encode(), frame_rate=16000, channels=1, sample_width=2), audio_data
+
+    monkeypatch.setattr(EvaluationService, "_decode", staticmethod(_decode))
+    yield session
+    session.close()
+
+
+@pytest.mark.asyncio
+async def test_batch_reports_partial_failures_in_order(db) -> None:
+    response = await EvaluationService(db).evaluate_batch(
+        user_id=1,
+        items=[(1, "aaaa"), (99, "bbbb"), (2, "broken"), (2, "cccc")],
+    )
+
+    assert (response.total, response.succeeded, response.failed) == (4, 2, 2)
+    assert [item.index for item in response.results] == [0, 1, 2, 3]
+    assert [item.success for item in response.results] == [True, False, False, True]
+    assert response.results[1].error_status == 404
+    assert response.results[2].error_status == 400
+    assert response.results[3].result.target_sentence == "Good morning"
+    assert db.query(PracticeAttempt).count() == 2
+
+
+@pytest.mark.asyncio
+async def test_batch_persists_nothing_when_transaction_fails(db, monkeypatch) -> None:
+    def _fail(self, attempts):
+        raise RuntimeError("database down")
+
+    monkeypatch.setattr(evaluation_module.PracticeService, "save_attempts", _fail)
+
+    response = await EvaluationService(db).evaluate_batch(user_id=1, items=[(1, "aaaa"), (2, "bbbb")])
+
+    assert response.succeeded == 0
+    assert all(item.error_status == 500 for item in response.results)
+    assert db.query(PracticeAttempt).count() == 0
+
+
+@pytest.mark.asyncio
+async def test_batch_rejects_too_many_items(db, monkeypatch) -> None:
+    monkeypatch.setattr(settings, "EVALUATION_BATCH_MAX_ITEMS", 1)
+
+    with pytest.raises(HTTPException) as exc_info:
+        await EvaluationService(db).evaluate_batch(user_id=1, items=[(1, "a"), (2, "b")])
+
+    assert exc_info.value.status_code == 422
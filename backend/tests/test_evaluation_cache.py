@@ -0,0 +1,57 @@
+"""Tests for the content-addressed evaluation result cache."""
+
+from app.services.audio_service import DecodedAudio
+from app.services.evaluation_cache import (
+    EvaluationCache,
+    MemoryCacheBackend,
+    SQLiteCacheBackend,
+)
+
+
+def _audio(pcm: bytes = b"\x01\x00" * 100) -> DecodedAudio:
+    return DecodedAudio(pcm=pcm, frame_rate=16000, channels=1, sample_width=2)
+
+
+def test_key_depends_on_audio_sentence_and_prompt_version() -> None:
+    key = EvaluationCache.make_key(_audio(), 1, "v1")
+
+    assert key == EvaluationCache.make_key(_audio(), 1, "v1")
+    assert key != EvaluationCache.make_key(_audio(b"\x02\x00" * 100), 1, "v1")
+    assert key != EvaluationCache.make_key(_audio(), 2, "v1")
+    assert key != EvaluationCache.make_key(_audio(), 1, "v2")
+
+
+def test_memory_backend_counts_hits_and_evicts_lru() -> None:
+    cache = EvaluationCache(MemoryCacheBackend(max_entries=2, ttl_seconds=60))
+    cache.set("a", {"overall_score": 1})
+    cache.set("b", {"overall_score": 2})
+    assert cache.get("a") == {"overall_score": 1}
+    cache.set("c", {"overall_score": 3})
+
+    assert cache.get("b") is None
+    assert cache.get("c") == {"overall_score": 3}
+    assert (cache.hits, cache.misses) == (2, 1)
+
+
+def test_sqlite_backend_is_shared_and_expires(tmp_path) -> None:
+    path = str(tmp_path / "cache.sqlite3")
+    writer = SQLiteCacheBackend(path, max_entries=10, ttl_seconds=60)
+    reader = SQLiteCacheBackend(path, max_entries=10, ttl_seconds=60)
+    writer.set("k", {"overall_score": 7.5, "score_label": "Tốt"})
+
+    assert reader.get("k") == {"overall_score": 7.5, "score_label": "Tốt"}
+
+    expired = SQLiteCacheBackend(path, max_entries=10, ttl_seconds=-1)
+    expired.set("old", {"overall_score": 1})
+    assert reader.get("old") is None
+
+
+def test_sqlite_backend_evicts_least_recently_used(tmp_path) -> None:
+    backend = SQLiteCacheBackend(str(tmp_path / "cache.sqlite3"), max_entries=2, ttl_seconds=60)
+    backend.set("a", {"n": 1})
+    backend.set("b", {"n": 2})
+    backend.get("a")
+    backend.set("c", {"n": 3})
+
+    assert backend.get("b") is None
+    assert backend.get("a") == {"n": 1}
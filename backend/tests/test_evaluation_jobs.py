@@ -0,0 +1,110 @@
+"""Tests for the asynchronous evaluation job queue."""
+
+import asyncio
+import time
+from datetime import datetime, timezone
+
+import pytest
+from fastapi import HTTPException
+
+from app.schemas.practice import EvaluationResponse, ScoreBreakdown
+from app.services import evaluation_jobs
+from app.services.evaluation_jobs import (
+    JOB_FAILED,
+    JOB_SUCCEEDED,
+    EvaluationJobQueue,
+    QueueFullError,
+)
+
+
+async def _fake_response(job) -> EvaluationResponse:
+    return EvaluationResponse(
+        attempt_id=1,
+        sentence_id=job.sentence_id,
+        target_sentence="Hello world",
+        transcription="hello world",
+        overall_score=8.5,
+        score_label="Tốt",
+        breakdown=ScoreBreakdown(
+            phoneme_accuracy=8, word_stress=8, intonation=9, fluency=8, clarity=9
+        ),
+        transcription_comparison=[],
+        strengths=[],
+        improvements=[],
+        suggestions=[],
+        focus_phonemes=[],
+        encouragement="Cố lên!",
+        practiced_at=datetime.now(timezone.utc),
+    )
+
+
+@pytest.mark.asyncio
+async def test_job_succeeds_and_releases_audio(monkeypatch) -> None:
+    queue = EvaluationJobQueue(workers=2, max_queue_size=10, result_ttl_seconds=60)
+    monkeypatch.setattr(EvaluationJobQueue, "_evaluate", staticmethod(_fake_response))
+    finished = []
+    await queue.start()
+    try:
+        job = queue.submit(
+            user_id=1, sentence_id=7, audio_data="AAAA", on_finish=lambda: finished.append(1)
+        )
+        await asyncio.wait_for(job.done.wait(), timeout=2)
+    finally:
+        await queue.stop()
+
+    assert job.status == JOB_SUCCEEDED
+    assert finished == [1]
+    assert job.result.sentence_id == 7
+    assert job.audio_data is None
+    assert queue.get(job.job_id, user_id=1) is job
+    assert queue.get(job.job_id, user_id=2) is None
+
+
+@pytest.mark.asyncio
+async def test_job_failure_keeps_http_status(monkeypatch) -> None:
+    async def _raise(job):
+        raise HTTPException(status_code=404, detail="missing")
+
+    queue = EvaluationJobQueue(workers=1, max_queue_size=10, result_ttl_seconds=60)
+    monkeypatch.setattr(EvaluationJobQueue, "_evaluate", staticmethod(_raise))
+    await queue.start()
+    try:
+        job = queue.submit(user_id=1, sentence_id=7, audio_data="AAAA")
+        await asyncio.wait_for(job.done.wait(), timeout=2)
+    finally:
+        await queue.stop()
+
+    assert job.status == JOB_FAILED
+    assert job.error == "missing"
+    assert job.error_status == 404
+
+
+@pytest.mark.asyncio
+async def test_submit_rejects_when_queue_full() -> None:
+    queue = EvaluationJobQueue(workers=0, max_queue_size=1, result_ttl_seconds=60)
+    with pytest.raises(QueueFullError):
+        queue.submit(user_id=1, sentence_id=1, audio_data="AAAA")
+
+    await queue.start()
+    queue.submit(user_id=1, sentence_id=1, audio_data="AAAA")
+    with pytest.raises(QueueFullError):
+        queue.submit(user_id=1, sentence_id=2, audio_data="AAAA")
+    await queue.stop()
+
+
+@pytest.mark.asyncio
+async def test_expired_results_are_purged_without_new_submissions(monkeypatch) -> None:
+    queue = EvaluationJobQueue(workers=1, max_queue_size=10, result_ttl_seconds=60)
+    monkeypatch.setattr(EvaluationJobQueue, "_evaluate", staticmethod(_fake_response))
+    await queue.start()
+    try:
+        job = queue.submit(user_id=1, sentence_id=7, audio_data="AAAA")
+        await asyncio.wait_for(job.done.wait(), timeout=2)
+    finally:
+        await queue.stop()
+    assert queue.get(job.job_id, user_id=1) is job
+
+    now = time.monotonic() + 61
+    monkeypatch.setattr(evaluation_jobs.time, "monotonic", lambda: now)
+    assert queue.get(job.job_id, user_id=1) is None
+    assert queue._jobs == {}
@@ -0,0 +1,68 @@
+"""Tests for the offline fake evaluator backend."""
+
+import pytest
+
+from app.core.config import settings
+from app.services import evaluation_service
+from app.services.audio_service import DecodedAudio
+from app.services.evaluation_service import create_evaluator
+from app.services.evaluator import EVALUATION_COMPLETE
+from app.services.fake_evaluator import FakeEvaluator, default_evaluation
+from app.services.gemini_service import GeminiService
+from app.utils.exceptions import GeminiUnavailableError
+
+
+def _audio(fill: bytes = b"\x01\x00") -> DecodedAudio:
+    return DecodedAudio(pcm=fill * 1600, frame_rate=16000, channels=1, sample_width=2)
+
+
+@pytest.mark.asyncio
+async def test_responses_are_deterministic_per_recording() -> None:
+    evaluator = FakeEvaluator(seed=1)
+
+    first = await evaluator.evaluate_pronunciation_with_audio_async("I like green tea.", _audio())
+    again = await FakeEvaluator(seed=2).evaluate_pronunciation_with_audio_async("I like green tea.", _audio())
+    other = await evaluator.evaluate_pronunciation_with_audio_async("I like green tea.", _audio(b"\x02\x00"))
+
+    assert first == again
+    assert first != other
+    assert [c.word for c in first.transcription_comparison] == ["I", "like", "green", "tea"]
+
+
+@pytest.mark.asyncio
+async def test_canned_responses_and_streaming() -> None:
+    canned = [default_evaluation("Hello", seed) for seed in range(3)]
+    evaluator = FakeEvaluator(canned_responses=canned)
+
+    events = [item async for item in evaluator.stream_pronunciation_evaluation("Hello", _audio())]
+
+    assert events[-1][0] == EVALUATION_COMPLETE
+    assert events[-1][1] in canned
+    assert dict(events[:-1]) == events[-1][1].model_dump()
+
+
+@pytest.mark.asyncio
+async def test_simulated_failures() -> None:
+    with pytest.raises(GeminiUnavailableError):
+        await FakeEvaluator(unavailable_rate=1.0).evaluate_pronunciation_with_audio_async("Hi", _audio())
+    with pytest.raises(Exception, match="simulated error"):
+        await FakeEvaluator(error_rate=1.0).evaluate_pronunciation_with_audio_async("Hi", _audio())
+
+
+def test_latency_distributions() -> None:
+    evaluator = FakeEvaluator(latency_ms=100, latency_distribution="uniform", latency_spread=0.5, seed=3)
+    samples = [evaluator.sample_latency() for _ in range(200)]
+
+    assert all(0.05 <= s <= 0.15 for s in samples)
+    assert FakeEvaluator(latency_ms=100).sample_latency() == pytest.approx(0.1)
+
+
+def test_backend_selected_from_settings(monkeypatch) -> None:
+    monkeypatch.setattr(evaluation_service, "_fake_evaluator", None)
+    monkeypatch.setattr(settings, "EVALUATOR_BACKEND", "fake")
+    assert isinstance(create_evaluator(), FakeEvaluator)
+    assert create_evaluator() is create_evaluator()
+
+    monkeypatch.setattr(settings, "EVALUATOR_BACKEND", "gemini")
+    monkeypatch.setattr(settings, "GEMINI_API_KEY", "test-key")
+    assert isinstance(create_evaluator(), GeminiService)
@@ -0,0 +1,241 @@
+"""Tests for GeminiService request building (no network access)."""
+
+import json
+from types import SimpleNamespace
+
+import pytest
+from google.api_core import exceptions as google_exceptions
+
+from app.core.config import settings
+from app.services import gemini_service
+from app.services.audio_service import DecodedAudio
+from app.services.gemini_service import GeminiService
+from app.core.metrics import metrics
+from app.utils.exceptions import GeminiUnavailableError, InvalidAIResponseError
+from app.utils.resilience import CircuitBreaker
+
+VALID_EVALUATION = json.dumps({
+    "transcription": "hello world",
+    "overall_score": 8,
+    "score_label": "Tốt",
+    "breakdown": {
+        "phoneme_accuracy": 8, "word_stress": 8, "intonation": 7, "fluency": 8, "clarity": 9
+    },
+    "transcription_comparison": [
+        {"word": "hello", "student_said": "hello", "status": "correct", "phonetic_issue": None}
+    ],
+    "strengths": [],
+    "improvements": [],
+    "suggestions": [],
+    "focus_phonemes": [],
+    "encouragement": "Cố lên!",
+})
+
+
+@pytest.fixture(autouse=True)
+def no_context_cache(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "GEMINI_CONTEXT_CACHE_ENABLED", False)
+
+
+@pytest.fixture
+def service() -> GeminiService:
+    # Bypass __init__ so no API key or model is needed
+    return GeminiService.__new__(GeminiService)
+
+
+def _audio(seconds: float) -> DecodedAudio:
+    frames = int(16000 * seconds)
+    return DecodedAudio(pcm=b"\x00\x00" * frames, frame_rate=16000, channels=1, sample_width=2)
+
+
+def test_short_clip_is_sent_inline(service, monkeypatch) -> None:
+    def _fail_upload(**kwargs):
+        raise AssertionError("file API must not be used for short clips")
+
+    monkeypatch.setattr(gemini_service.genai, "upload_file", _fail_upload)
+    part, uploaded = service._build_audio_part(_audio(1.0))
+
+    assert uploaded is None
+    assert part["mime_type"] == "audio/wav"
+    assert part["data"][:4] == b"RIFF"
+
+
+def test_large_clip_uses_file_api(service, monkeypatch) -> None:
+    uploaded_file = SimpleNamespace(name="files/abc", uri="https://example/files/abc")
+    monkeypatch.setattr(gemini_service.genai, "upload_file", lambda **kwargs: uploaded_file)
+    monkeypatch.setattr(settings, "GEMINI_INLINE_AUDIO_MAX_BYTES", 1024)
+
+    part, uploaded = service._build_audio_part(_audio(1.0))
+
+    assert part is uploaded_file
+    assert uploaded is uploaded_file
+
+
+@pytest.mark.asyncio
+async def test_transient_errors_are_retried(service, monkeypatch) -> None:
+    calls = []
+
+    async def _generate(contents, generation_config=None):
+        calls.append(contents)
+        if len(calls) < 3:
+            raise google_exceptions.ServiceUnavailable("overloaded")
+        return SimpleNamespace(text=VALID_EVALUATION)
+
+    service.model = SimpleNamespace(generate_content_async=_generate)
+    monkeypatch.setattr(settings, "GEMINI_RETRY_BASE_DELAY_SECONDS", 0.001)
+    monkeypatch.setattr(gemini_service, "gemini_circuit", _closed_circuit())
+
+    result = await service.evaluate_pronunciation_with_audio_async("Hello", _audio(0.5))
+
+    assert result.overall_score == 8
+    assert len(calls) == 3
+
+
+@pytest.mark.asyncio
+async def test_invalid_output_is_requested_again(service, monkeypatch) -> None:
+    answers = iter(['{"overall_score": 8}', VALID_EVALUATION])
+
+    async def _generate(contents, generation_config=None):
+        assert generation_config["response_mime_type"] == "application/json"
+        return SimpleNamespace(text=next(answers))
+
+    service.model = SimpleNamespace(generate_content_async=_generate)
+    monkeypatch.setattr(gemini_service, "gemini_circuit", _closed_circuit())
+    wasted = metrics.get("gemini_wasted_calls_total")
+    mismatches = metrics.get("gemini_parse_failures_total", reason="schema_mismatch")
+
+    result = await service.evaluate_pronunciation_with_audio_async("Hello", _audio(0.5))
+
+    assert result.breakdown.clarity == 9
+    assert metrics.get("gemini_wasted_calls_total") == wasted + 1
+    assert metrics.get("gemini_parse_failures_total", reason="schema_mismatch") == mismatches + 1
+
+
+def test_fenced_json_is_parsed_and_validated() -> None:
+    result = GeminiService._parse_evaluation_text(f"```json\n{VALID_EVALUATION}\n```")
+
+    assert result.transcription == "hello world"
+    with pytest.raises(InvalidAIResponseError):
+        GeminiService._parse_evaluation_text("not json")
+
+
+@pytest.mark.asyncio
+async def test_open_circuit_fails_fast(service, monkeypatch) -> None:
+    circuit = _closed_circuit()
+    for _ in range(circuit.min_calls):
+        circuit.record_failure()
+    monkeypatch.setattr(gemini_service, "gemini_circuit", circuit)
+
+    with pytest.raises(GeminiUnavailableError) as exc_info:
+        await service.evaluate_pronunciation_with_audio_async("Hello", _audio(0.5))
+    assert exc_info.value.retry_after > 0
+
+
+def _closed_circuit() -> CircuitBreaker:
+    return CircuitBreaker(failure_rate=0.5, min_calls=4, window_seconds=60, open_seconds=30)
+
+
+@pytest.mark.asyncio
+async def test_cached_prompt_sends_only_sentence(service, monkeypatch) -> None:
+    sent = []
+
+    async def _generate(contents, generation_config=None):
+        sent.append(contents)
+        return SimpleNamespace(text=VALID_EVALUATION)
+
+    cached = SimpleNamespace(name="cachedContents/abc")
+    monkeypatch.setattr(settings, "GEMINI_CONTEXT_CACHE_ENABLED", True)
+    monkeypatch.setattr(gemini_service.evaluation_prompt_cache, "get", lambda: cached)
+    monkeypatch.setattr(
+        gemini_service.genai.GenerativeModel,
+        "from_cached_content",
+        lambda cached_content: SimpleNamespace(generate_content_async=_generate),
+    )
+    monkeypatch.setattr(gemini_service, "gemini_circuit", _closed_circuit())
+
+    await service.evaluate_pronunciation_with_audio_async("Hello", _audio(0.5))
+
+    prompt, audio_part = sent[0]
+    assert '"Hello"' in prompt
+    assert gemini_service.PROMPT_VERSION in prompt
+    assert gemini_service.EVALUATION_INSTRUCTIONS not in prompt
+    assert gemini_service.EVALUATION_RESPONSE_SCHEMA not in prompt
+    assert audio_part["mime_type"] == "audio/wav"
+
+
+class _FakeStream:
+    def __init__(self, chunks):
+        self._chunks = chunks
+        self.usage_metadata = None
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for chunk in self._chunks:
+            yield SimpleNamespace(text=chunk)
+
+
+@pytest.mark.asyncio
+async def test_stream_yields_fields_then_validated_evaluation(service, monkeypatch) -> None:
+    text = VALID_EVALUATION
+
+    async def _generate(contents, generation_config=None, stream=False):
+        assert stream
+        return _FakeStream([text[i:i + 16] for i in range(0, len(text), 16)])
+
+    service.model = SimpleNamespace(generate_content_async=_generate)
+    monkeypatch.setattr(gemini_service, "gemini_circuit", _closed_circuit())
+
+    events = [
+        item async for item in service.stream_pronunciation_evaluation("Hello", _audio(0.5))
+    ]
+
+    fields = [field for field, _ in events]
+    assert fields[:4] == ["transcription", "overall_score", "score_label", "breakdown"]
+    assert fields[-1] == gemini_service.EVALUATION_COMPLETE
+    assert events[-1][1].encouragement == "Cố lên!"
+
+
+@pytest.mark.asyncio
+async def test_cached_stream_is_not_schema_constrained(service, monkeypatch) -> None:
+    requests = []
+
+    async def _generate(self, contents, generation_config=None, stream=False):
+        requests.append(self._prepare_request(
+            contents=contents, generation_config=generation_config, tools=None, tool_config=None
+        ))
+        return _FakeStream([VALID_EVALUATION])
+
+    cached = SimpleNamespace(name="cachedContents/abc", model=gemini_service.GEMINI_MODEL_NAME)
+    monkeypatch.setattr(settings, "GEMINI_CONTEXT_CACHE_ENABLED", True)
+    monkeypatch.setattr(gemini_service.evaluation_prompt_cache, "get", lambda: cached)
+    monkeypatch.setattr(gemini_service.genai.GenerativeModel, "generate_content_async", _generate)
+    monkeypatch.setattr(gemini_service, "gemini_circuit", _closed_circuit())
+    service.model = None
+
+    events = [item async for item in service.stream_pronunciation_evaluation("Hello", _audio(0.5))]
+
+    request = requests[0]
+    assert request.cached_content == "cachedContents/abc"
+    assert request.generation_config.response_mime_type == "application/json"
+    assert "response_schema" not in request.generation_config
+    assert events[-1][0] == gemini_service.EVALUATION_COMPLETE
+
+
+def test_response_schema_keeps_field_descriptions_only() -> None:
+    schema = gemini_service.EVALUATION_GENERATION_CONFIG["response_schema"]
+
+    assert "description" not in schema
+    assert schema["properties"]["transcription"]["description"] == "What the student said"
+    # Referenced models contribute their fields, not their docstrings
+    comparison = schema["properties"]["transcription_comparison"]
+    assert "description" not in comparison["items"]
+    assert "word" in comparison["items"]["properties"]
+
+
+def test_default_prompt_is_large_enough_to_cache() -> None:
+    cache = gemini_service.evaluation_prompt_cache
+
+    assert cache.min_tokens == settings.GEMINI_CONTEXT_CACHE_MIN_TOKENS
+    assert cache.is_cacheable, f"{cache.estimated_tokens} < {cache.min_tokens} estimated tokens"
@@ -0,0 +1,68 @@
+"""Tests for the shared upstream HTTP client and the uncached Drive proxy."""
+
+import asyncio
+
+import httpx
+import pytest
+from starlette.requests import Request
+
+from app.api.v1 import practice
+from app.core.config import settings
+from app.services.http_client import SharedHTTPClient
+
+
+@pytest.mark.asyncio
+async def test_shared_client_is_reused_and_recreated_after_stop() -> None:
+    shared = SharedHTTPClient()
+    await shared.start()
+    first = shared.client
+
+    assert shared.client is first
+    await shared.stop()
+    assert first.is_closed
+    assert shared.client is not first
+    await shared.stop()
+
+
+class _EndlessStream(httpx.AsyncByteStream):
+    def __init__(self) -> None:
+        self.closed = False
+
+    async def __aiter__(self):
+        while True:
+            yield b"x" * 1024
+            await asyncio.sleep(0)
+
+    async def aclose(self) -> None:
+        self.closed = True
+
+
+@pytest.mark.asyncio
+async def test_proxy_closes_upstream_when_client_disconnects(monkeypatch) -> None:
+    upstream = _EndlessStream()
+    transport = httpx.MockTransport(
+        lambda request: httpx.Response(200, headers={"Content-Type": "audio/mpeg"}, stream=upstream)
+    )
+    shared = SharedHTTPClient()
+    shared._client = httpx.AsyncClient(transport=transport)
+    monkeypatch.setattr(practice, "upstream_http", shared)
+    monkeypatch.setattr(settings, "DRIVE_AUDIO_CACHE_ENABLED", False)
+
+    request = Request({"type": "http", "method": "GET", "headers": [], "query_string": b""})
+    response = await practice.proxy_drive_audio("abc", request, current_user=None)
+
+    sent = []
+
+    async def receive():
+        # The browser goes away after the first chunks
+        while len(sent) < 3:
+            await asyncio.sleep(0.01)
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        sent.append(message)
+
+    await asyncio.wait_for(response({"type": "http", "asgi": {"spec_version": "2.3"}}, receive, send), 2)
+
+    assert upstream.closed
+    await shared.stop()
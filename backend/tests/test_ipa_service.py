@@ -0,0 +1,60 @@
+"""Tests for local IPA transcription and the backfill command."""
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.db.base import Base
+from app.db.models import PracticeSentence
+from app.scripts.backfill_ipa import backfill
+from app.services.ipa_service import IPAService, IPAWordCache
+
+
+class _Fallback:
+    def __init__(self) -> None:
+        self.calls: list[list[str]] = []
+
+    def __call__(self, words: list[str]) -> dict[str, str]:
+        self.calls.append(words)
+        return {word: f"<{word}>" for word in words}
+
+
+def test_model_is_only_asked_for_unknown_words_once(tmp_path) -> None:
+    cache = IPAWordCache(str(tmp_path / "ipa.sqlite3"))
+    fallback = _Fallback()
+
+    first = IPAService(cache, fallback).transcribe_many(["I like Qzxv tea.", "qzxv, again!"])
+    second = IPAService(IPAWordCache(cache.path), fallback).transcribe("Qzxv")
+
+    assert fallback.calls == [["qzxv"]]
+    assert first[0].endswith("<qzxv> ti.")
+    assert first[1].startswith("<qzxv>, ")
+    assert "like" not in first[0]
+    assert second == "<qzxv>"
+
+
+def test_unresolved_words_are_kept_without_fallback() -> None:
+    service = IPAService()
+
+    assert service.transcribe("Hello qzxv").endswith(" qzxv")
+    assert service.unresolved_words == 1
+
+
+def test_backfill_updates_empty_rows_in_batches() -> None:
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+    db.add_all([
+        PracticeSentence(sentence_id=1, sentence_text="Good morning"),
+        PracticeSentence(sentence_id=2, sentence_text="Thank you", phonetic_transcription="kept"),
+        PracticeSentence(sentence_id=3, sentence_text="See you later", phonetic_transcription=""),
+    ])
+    db.commit()
+
+    updated = backfill(db, IPAService(), batch_size=1)
+
+    rows = {row.sentence_id: row.phonetic_transcription for row in db.query(PracticeSentence)}
+    assert updated == 2
+    assert rows[2] == "kept"
+    assert rows[1] and rows[3] and "morning" not in rows[1]
+    db.close()
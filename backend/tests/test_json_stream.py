@@ -0,0 +1,32 @@
+"""Tests for the incremental JSON object parser."""
+
+import json
+
+from app.utils.json_stream import IncrementalJSONObjectParser
+
+
+def test_fields_are_emitted_as_soon_as_complete() -> None:
+    parser = IncrementalJSONObjectParser()
+
+    assert list(parser.feed('```json\n{"overall_score": 7.')) == []
+    assert list(parser.feed('5, "breakdown": {"fluency": 8')) == [("overall_score", 7.5)]
+    assert list(parser.feed('}, "tips": ["a, b", "}"')) == [("breakdown", {"fluency": 8})]
+    assert list(parser.feed('], "note": null}\n```')) == [("tips", ["a, b", "}"]), ("note", None)]
+    assert parser.finished
+
+
+def test_arbitrary_chunking_matches_json_loads() -> None:
+    document = {
+        "transcription": 'he said "hi" \\ {ok}',
+        "overall_score": 8,
+        "comparison": [{"word": "hi", "status": "correct", "issue": None}],
+        "done": True,
+    }
+    text = json.dumps(document, ensure_ascii=False, indent=2)
+
+    for size in (1, 2, 7, len(text)):
+        parser = IncrementalJSONObjectParser()
+        fields = []
+        for start in range(0, len(text), size):
+            fields.extend(parser.feed(text[start:start + size]))
+        assert dict(fields) == document
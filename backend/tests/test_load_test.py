@@ -0,0 +1,26 @@
+"""Tests for the load-test report helpers."""
+
+from benchmarks.load_test import percentile, summarize
+
+
+def test_percentile_uses_nearest_rank() -> None:
+    values = [float(v) for v in range(1, 101)]
+
+    assert percentile(values, 50) == 50
+    assert percentile(values, 95) == 95
+    assert percentile(values, 99) == 99
+    assert percentile([], 95) == 0.0
+
+
+def test_summary_counts_errors_and_throughput() -> None:
+    samples = [(0.010, 200)] * 8 + [(0.050, 503), (0.020, 0)]
+
+    summary = summarize(samples, wall_seconds=2.0)
+
+    assert summary["requests"] == 10
+    assert summary["errors"] == 2
+    assert summary["error_rate"] == 0.2
+    assert summary["throughput_rps"] == 5.0
+    assert summary["latency_ms"]["p50"] == 10.0
+    assert summary["latency_ms"]["max"] == 50.0
+    assert summary["statuses"] == {"200": 8, "503": 1, "0": 1}
@@ -0,0 +1,62 @@
+"""Tests for queued log output."""
+
+import logging
+from collections.abc import Iterator
+from contextlib import contextmanager
+from logging.handlers import QueueHandler
+
+from app.core.logging import get_logger, start_queue_logging, stop_queue_logging
+
+
+@contextmanager
+def bare_root_logger() -> Iterator[logging.Logger]:
+    """Root logger as the app leaves it: no handlers, WARNING level.
+
+    Used inside the test body because pytest attaches its capture handlers
+    to the root logger around each test phase.
+    """
+    root = logging.getLogger()
+    saved_handlers, saved_level = list(root.handlers), root.level
+    for handler in saved_handlers:
+        root.removeHandler(handler)
+    root.setLevel(logging.WARNING)
+    try:
+        yield root
+    finally:
+        stop_queue_logging()
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+        for handler in saved_handlers:
+            root.addHandler(handler)
+        root.setLevel(saved_level)
+
+
+def test_module_loggers_are_written_by_listener(capsys) -> None:
+    with bare_root_logger() as root:
+        start_queue_logging()
+        assert [type(handler) for handler in root.handlers] == [QueueHandler]
+
+        logging.getLogger("app.services.example").info("queued record")
+        stop_queue_logging()
+
+        assert "app.services.example - INFO - queued record" in capsys.readouterr().err
+        assert root.handlers == []
+        assert root.level == logging.WARNING
+
+
+def test_get_logger_handlers_move_behind_queue(capsys) -> None:
+    logger = get_logger("app.tests.configured")
+    own_handlers = list(logger.handlers)
+    try:
+        with bare_root_logger():
+            start_queue_logging()
+            assert logger.handlers == []
+
+            logger.info("written once")
+            stop_queue_logging()
+
+            assert capsys.readouterr().err.count("written once") == 1
+            assert logger.handlers == own_handlers
+    finally:
+        for handler in own_handlers:
+            logger.removeHandler(handler)
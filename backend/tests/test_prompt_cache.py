@@ -0,0 +1,79 @@
+"""Tests for the context cache wrapper around the static prompt."""
+
+from types import SimpleNamespace
+
+from app.services import prompt_cache
+from app.services.prompt_cache import PromptContextCache
+
+
+def _cache() -> PromptContextCache:
+    return PromptContextCache(
+        model_name="models/test",
+        display_name="test-v1",
+        system_instruction="system",
+        contents=["instructions"],
+        ttl_seconds=600,
+        refresh_margin_seconds=60,
+        retry_after_failure_seconds=30,
+    )
+
+
+def test_entry_is_reused_then_refreshed_before_expiry(monkeypatch) -> None:
+    now = [0.0]
+    created = []
+
+    def _create(**kwargs):
+        created.append(kwargs)
+        return SimpleNamespace(name=f"cachedContents/{len(created)}")
+
+    monkeypatch.setattr(prompt_cache.time, "monotonic", lambda: now[0])
+    monkeypatch.setattr(prompt_cache.caching.CachedContent, "create", _create)
+    cache = _cache()
+
+    first = cache.get()
+    now[0] = 500
+    assert cache.get() is first
+    now[0] = 545  # inside the refresh margin
+    assert cache.get().name == "cachedContents/2"
+    assert created[0]["display_name"] == "test-v1"
+
+
+def test_creation_failure_falls_back_for_a_while(monkeypatch) -> None:
+    now = [0.0]
+    attempts = []
+
+    def _create(**kwargs):
+        attempts.append(1)
+        raise RuntimeError("content too small to cache")
+
+    monkeypatch.setattr(prompt_cache.time, "monotonic", lambda: now[0])
+    monkeypatch.setattr(prompt_cache.caching.CachedContent, "create", _create)
+    cache = _cache()
+
+    assert cache.get() is None
+    now[0] = 10
+    assert cache.get() is None
+    assert len(attempts) == 1
+    now[0] = 31
+    cache.get()
+    assert len(attempts) == 2
+
+
+def test_prompt_below_minimum_size_is_never_registered(monkeypatch) -> None:
+    attempts = []
+    monkeypatch.setattr(
+        prompt_cache.caching.CachedContent, "create", lambda **kwargs: attempts.append(kwargs)
+    )
+    cache = PromptContextCache(
+        model_name="models/test",
+        display_name="test-v1",
+        system_instruction="s" * 2000,
+        contents=["i" * 1400],
+        ttl_seconds=600,
+        min_tokens=1024,
+    )
+
+    assert cache.estimated_tokens == 850
+    assert cache.get() is None
+    assert cache.get() is None
+    assert attempts == []
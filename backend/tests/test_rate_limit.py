@@ -0,0 +1,174 @@
+"""Tests for the asyncio rate limiting primitives."""
+
+import asyncio
+
+import pytest
+
+from app.core.config import settings
+from app.utils.rate_limit import AdmissionController, ConcurrencyLimiter, RateLimitTimeout, TokenBucket
+
+
+def test_token_bucket_allows_burst_then_blocks() -> None:
+    bucket = TokenBucket(rate_per_minute=60, burst=3)
+
+    assert [bucket.try_acquire() for _ in range(3)] == [True, True, True]
+    assert bucket.try_acquire() is False
+    assert 0 < bucket.wait_time() <= 1.0
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_acquire_times_out() -> None:
+    bucket = TokenBucket(rate_per_minute=1, burst=1)
+    await bucket.acquire(timeout=0.1)
+
+    with pytest.raises(RateLimitTimeout) as exc_info:
+        await bucket.acquire(timeout=0.1)
+    assert exc_info.value.retry_after > 0
+
+
+@pytest.mark.asyncio
+async def test_limiter_caps_concurrency() -> None:
+    limiter = ConcurrencyLimiter(max_concurrency=2, rate_per_minute=6000, burst=10)
+    peak = 0
+
+    async def call() -> None:
+        nonlocal peak
+        async with limiter.slot(timeout=2):
+            peak = max(peak, limiter.in_flight)
+            await asyncio.sleep(0.02)
+
+    await asyncio.gather(*(call() for _ in range(6)))
+
+    assert peak == 2
+    assert limiter.in_flight == 0
+    assert limiter.waiting == 0
+
+
+@pytest.mark.asyncio
+async def test_limiter_times_out_when_saturated() -> None:
+    limiter = ConcurrencyLimiter(max_concurrency=1, rate_per_minute=6000, burst=10)
+
+    async with limiter.slot(timeout=1):
+        with pytest.raises(RateLimitTimeout):
+            async with limiter.slot(timeout=0.05):
+                pass
+    assert limiter.waiting == 0
+
+
+@pytest.mark.asyncio
+async def test_admission_enforces_per_user_limits() -> None:
+    admission = AdmissionController(
+        user_max_concurrency=1, user_rate_per_minute=60, user_burst=2,
+        max_in_flight=10, max_waiting=10, queue_timeout=1.0,
+    )
+
+    async with admission.slot(user_id=1):
+        with pytest.raises(RateLimitTimeout):
+            await admission.acquire(user_id=1)
+        # Other users are not affected
+        async with admission.slot(user_id=2):
+            assert admission.in_flight == 2
+
+    async with admission.slot(user_id=1):
+        pass
+    with pytest.raises(RateLimitTimeout) as exc_info:
+        await admission.acquire(user_id=1)
+    assert 0 < exc_info.value.retry_after <= 1.0
+    assert admission.user_in_flight(1) == 0
+
+
+@pytest.mark.asyncio
+async def test_admission_bounds_global_wait_queue() -> None:
+    admission = AdmissionController(
+        user_max_concurrency=10, user_rate_per_minute=6000, user_burst=100,
+        max_in_flight=1, max_waiting=1, queue_timeout=0.5,
+    )
+    release = asyncio.Event()
+
+    async def hold(user_id: int) -> None:
+        async with admission.slot(user_id):
+            await release.wait()
+
+    holder = asyncio.create_task(hold(1))
+    await asyncio.sleep(0.05)
+    waiter = asyncio.create_task(hold(2))
+    await asyncio.sleep(0.05)
+    assert (admission.in_flight, admission.waiting) == (1, 1)
+
+    with pytest.raises(RateLimitTimeout):
+        await admission.acquire(user_id=3)
+
+    release.set()
+    await asyncio.gather(holder, waiter)
+    assert (admission.in_flight, admission.waiting) == (0, 0)
+
+
+@pytest.mark.asyncio
+async def test_admission_queue_full_rejection_keeps_user_token() -> None:
+    admission = AdmissionController(
+        user_max_concurrency=10, user_rate_per_minute=1, user_burst=1,
+        max_in_flight=1, max_waiting=0, queue_timeout=0.5,
+    )
+    await admission.acquire_global()
+
+    with pytest.raises(RateLimitTimeout):
+        await admission.acquire(user_id=1)
+    assert admission.user_in_flight(1) == 0
+
+    admission.release_global()
+    async with admission.slot(user_id=1):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_admission_cost_charges_several_tokens() -> None:
+    admission = AdmissionController(
+        user_max_concurrency=10, user_rate_per_minute=1, user_burst=5,
+        max_in_flight=10, max_waiting=10, queue_timeout=0.5,
+    )
+
+    async with admission.slot(user_id=1, cost=4):
+        pass
+    async with admission.slot(user_id=1):
+        pass
+    with pytest.raises(RateLimitTimeout):
+        await admission.acquire(user_id=1)
+
+
+@pytest.mark.asyncio
+async def test_admission_rejects_cost_above_burst() -> None:
+    admission = AdmissionController(
+        user_max_concurrency=10, user_rate_per_minute=60, user_burst=5,
+        max_in_flight=10, max_waiting=10, queue_timeout=0.5,
+    )
+
+    with pytest.raises(ValueError):
+        await admission.acquire(user_id=1, cost=6)
+
+    # Nothing was charged or held for the rejected request
+    assert admission.user_in_flight(1) == 0
+    await admission.acquire(user_id=1, cost=5)
+    admission.release(user_id=1)
+
+
+def test_default_burst_admits_a_full_batch() -> None:
+    assert settings.ADMISSION_USER_BURST >= settings.EVALUATION_BATCH_MAX_ITEMS
+
+
+@pytest.mark.asyncio
+async def test_admission_without_global_slot_counts_user_concurrency() -> None:
+    admission = AdmissionController(
+        user_max_concurrency=1, user_rate_per_minute=6000, user_burst=100,
+        max_in_flight=1, max_waiting=0, queue_timeout=0.5,
+    )
+
+    await admission.acquire(user_id=1, hold_global=False)
+    assert (admission.user_in_flight(1), admission.in_flight) == (1, 0)
+    with pytest.raises(RateLimitTimeout):
+        await admission.acquire(user_id=1, hold_global=False)
+
+    # The global slot is still free for other users
+    async with admission.slot(user_id=2):
+        assert admission.in_flight == 1
+    admission.release(user_id=1, hold_global=False)
+    assert admission.user_in_flight(1) == 0
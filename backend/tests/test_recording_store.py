@@ -0,0 +1,48 @@
+"""Tests for the content-addressed recording store."""
+
+import os
+import struct
+
+from app.services.audio_service import DecodedAudio
+from app.services.object_storage import LocalObjectStorage
+from app.services.recording_store import KEY_PATTERN, RecordingStore
+
+
+def _audio(value: int, frames: int = 1600) -> DecodedAudio:
+    return DecodedAudio(
+        pcm=struct.pack(f"<{frames}h", *([value] * frames)),
+        frame_rate=16000,
+        channels=1,
+        sample_width=2,
+    )
+
+
+def test_identical_recordings_are_stored_once(tmp_path) -> None:
+    store = RecordingStore(LocalObjectStorage(str(tmp_path)), output_format="wav")
+
+    first = store.save(_audio(100))
+    second = store.save(_audio(100))
+    other = store.save(_audio(200))
+
+    assert first == second != other
+    assert KEY_PATTERN.match(first)
+    shard, subshard, name = first.split("/")
+    assert name.startswith(shard + subshard)
+    assert store.path_for(first).is_file()
+    assert len(store.scan()) == 2
+
+
+def test_garbage_collection_by_age_then_quota(tmp_path) -> None:
+    store = RecordingStore(LocalObjectStorage(str(tmp_path)), output_format="wav")
+    keys = [store.save(_audio(value)) for value in (1, 2, 3, 4)]
+    for age, key in zip((400, 300, 200, 100), keys):
+        path = store.path_for(key)
+        os.utime(path, (1000 - age, 1000 - age))
+    size = store.path_for(keys[0]).stat().st_size
+
+    expired = store.collect_garbage(max_age_seconds=350, max_bytes=None, now=1000)
+    assert expired == [keys[0]]
+
+    over_quota = store.collect_garbage(max_age_seconds=None, max_bytes=size * 2, now=1000)
+    assert over_quota == [keys[1]]
+    assert sorted(key for key, _, _ in store.scan()) == sorted(keys[2:])
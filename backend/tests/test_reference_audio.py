@@ -0,0 +1,72 @@
+"""Tests for the local reference-audio store."""
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.core.config import settings
+from app.db.base import Base
+from app.db.models import PracticeSentence
+from app.scripts.generate_reference_audio import generate_all
+from app.services.reference_audio import (
+    FakeSynthesizer,
+    GTTSSynthesizer,
+    ReferenceAudioStore,
+    create_synthesizer,
+)
+
+
+class _CountingSynthesizer(FakeSynthesizer):
+    def __init__(self) -> None:
+        super().__init__()
+        self.calls = 0
+
+    def synthesize(self, text: str) -> bytes:
+        self.calls += 1
+        if text == "fail":
+            raise RuntimeError("synthesis failed")
+        return super().synthesize(text)
+
+
+def test_store_generates_once_and_atomically(tmp_path) -> None:
+    synthesizer = _CountingSynthesizer()
+    store = ReferenceAudioStore(str(tmp_path), synthesizer)
+
+    assert store.get(7) is None
+    path = store.generate(7, "Hello world")
+    store.generate(7, "Hello world")
+
+    assert store.get(7) == path == tmp_path / "7.wav"
+    assert path.read_bytes()[:4] == b"RIFF"
+    assert synthesizer.calls == 1
+    assert [p.name for p in tmp_path.iterdir()] == ["7.wav"]
+
+
+def test_generate_all_skips_existing_and_reports_failures(tmp_path) -> None:
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+    db.add_all([
+        PracticeSentence(sentence_id=1, sentence_text="Good morning"),
+        PracticeSentence(sentence_id=2, sentence_text="fail"),
+        PracticeSentence(sentence_id=3, sentence_text="See you later"),
+    ])
+    db.commit()
+    synthesizer = _CountingSynthesizer()
+    store = ReferenceAudioStore(str(tmp_path), synthesizer)
+    store.generate(1, "Good morning")
+
+    generated, failed = generate_all(db, store, concurrency=2, batch_size=2)
+
+    assert (generated, failed) == (1, 1)
+    assert store.get(3) is not None and store.get(2) is None
+    assert synthesizer.calls == 3
+    db.close()
+
+
+def test_create_synthesizer_argument_overrides_settings(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "REFERENCE_AUDIO_SYNTHESIZER", "gtts")
+
+    assert isinstance(create_synthesizer("fake"), FakeSynthesizer)
+    assert isinstance(create_synthesizer(), GTTSSynthesizer)
+    assert settings.REFERENCE_AUDIO_SYNTHESIZER == "gtts"
@@ -0,0 +1,100 @@
+"""Tests for retry, hedging and circuit breaker primitives."""
+
+import asyncio
+
+import pytest
+
+from app.utils.resilience import (
+    CIRCUIT_CLOSED,
+    CIRCUIT_HALF_OPEN,
+    CIRCUIT_OPEN,
+    CircuitBreaker,
+    CircuitOpenError,
+    hedged,
+    retry_async,
+)
+
+
+@pytest.mark.asyncio
+async def test_retry_stops_on_non_retryable_error() -> None:
+    attempts = 0
+
+    async def call() -> None:
+        nonlocal attempts
+        attempts += 1
+        raise ValueError("bad request")
+
+    with pytest.raises(ValueError):
+        await retry_async(
+            call,
+            is_retryable=lambda e: isinstance(e, ConnectionError),
+            attempts=5,
+            base_delay=0.001,
+            max_delay=0.01,
+        )
+    assert attempts == 1
+
+
+@pytest.mark.asyncio
+async def test_hedged_returns_faster_backup() -> None:
+    started = 0
+    hedges = []
+
+    async def call() -> str:
+        nonlocal started
+        started += 1
+        if started == 1:
+            await asyncio.sleep(1)
+            return "primary"
+        return "backup"
+
+    result = await hedged(call, delay=0.01, on_hedge=lambda: hedges.append(1))
+
+    assert result == "backup"
+    assert hedges == [1]
+
+
+@pytest.mark.asyncio
+async def test_hedged_cancels_primary_when_caller_is_cancelled() -> None:
+    started = asyncio.Event()
+    cancelled = asyncio.Event()
+
+    async def call() -> str:
+        started.set()
+        try:
+            await asyncio.sleep(1)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+        return "primary"
+
+    caller = asyncio.ensure_future(hedged(call, delay=0.5))
+    await started.wait()
+    caller.cancel()
+
+    with pytest.raises(asyncio.CancelledError):
+        await caller
+    await asyncio.wait_for(cancelled.wait(), timeout=0.1)
+
+
+def test_circuit_opens_then_half_opens(monkeypatch) -> None:
+    breaker = CircuitBreaker(failure_rate=0.5, min_calls=4, window_seconds=60, open_seconds=30)
+    now = [1000.0]
+    monkeypatch.setattr("app.utils.resilience.time.monotonic", lambda: now[0])
+
+    breaker.record_success()
+    for _ in range(3):
+        breaker.record_failure()
+    assert breaker.state == CIRCUIT_OPEN
+    with pytest.raises(CircuitOpenError) as exc_info:
+        breaker.before_call()
+    assert exc_info.value.retry_after == pytest.approx(30)
+
+    now[0] += 31
+    breaker.before_call()  # trial call
+    assert breaker.state == CIRCUIT_HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    breaker.record_success()
+    assert breaker.state == CIRCUIT_CLOSED
@@ -0,0 +1,69 @@
+"""Tests for random sentence selection through the in-memory id index."""
+
+import pytest
+from sqlalchemy import create_engine, delete
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.db.base import Base
+from app.db.models import PracticeSentence
+from app.services.practice_service import PracticeService
+from app.services.sentence_index import SentenceIndex, sentence_index
+
+
+@pytest.fixture()
+def db():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    session.add_all([
+        PracticeSentence(sentence_id=1, sentence_text="a", difficulty="beginner", topic="food"),
+        PracticeSentence(sentence_id=2, sentence_text="b", difficulty="beginner", topic="travel"),
+        PracticeSentence(sentence_id=3, sentence_text="c", difficulty="advanced", topic="food"),
+        PracticeSentence(sentence_id=4, sentence_text="d", difficulty="advanced", topic=None),
+    ])
+    session.commit()
+    sentence_index.invalidate()
+    yield session
+    session.close()
+    sentence_index.invalidate()
+
+
+def test_buckets_by_difficulty_and_topic(db) -> None:
+    index = SentenceIndex(ttl_seconds=60)
+
+    assert list(index.ids(db)) == [1, 2, 3, 4]
+    assert list(index.ids(db, difficulty="advanced")) == [3, 4]
+    assert list(index.ids(db, topic="food")) == [1, 3]
+    assert list(index.ids(db, difficulty="beginner", topic="food")) == [1]
+    assert list(index.ids(db, topic="music")) == []
+    # An empty difficulty means any; an empty topic is matched exactly
+    assert list(index.ids(db, difficulty="")) == [1, 2, 3, 4]
+    assert list(index.ids(db, topic="")) == []
+    assert index.pick_id(db, difficulty="beginner", exclude={1}) == 2
+    # Everything excluded: still answer rather than 404
+    assert index.pick_id(db, topic="food", exclude={1, 3}) in (1, 3)
+
+
+def test_commit_invalidates_index(db) -> None:
+    service = PracticeService(db)
+    assert service.get_random_sentence_by_topic("music") is None
+
+    db.add(PracticeSentence(sentence_id=5, sentence_text="e", difficulty="beginner", topic="music"))
+    db.commit()
+    assert service.get_random_sentence_by_topic("music").sentence_id == 5
+
+    db.execute(delete(PracticeSentence).where(PracticeSentence.topic == "music"))
+    db.commit()
+    assert service.get_random_sentence_by_topic("music") is None
+
+
+def test_recent_sentences_are_excluded(db) -> None:
+    service = PracticeService(db)
+    service.save_attempt(user_id=1, sentence_id=3, target_sentence="c", overall_score=7)
+
+    recent = service.get_recent_sentence_ids(user_id=1, limit=5)
+    picks = {service.get_random_sentence("advanced", exclude_ids=recent).sentence_id for _ in range(20)}
+
+    assert recent == {3}
+    assert picks == {4}
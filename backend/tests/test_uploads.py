@@ -0,0 +1,89 @@
+"""Tests for streaming upload spooling."""
+
+import os
+from pathlib import Path
+
+import pytest
+from starlette.datastructures import Headers, UploadFile
+
+from app.utils.uploads import MULTIPART_OVERHEAD, UploadTooLargeError, parse_multipart, spool_stream
+
+
+async def _chunks(*parts: bytes):
+    for part in parts:
+        yield part
+
+
+@pytest.mark.asyncio
+async def test_small_upload_stays_in_memory() -> None:
+    spool = await spool_stream(_chunks(b"abc", b"def"), max_memory=16, max_size=64)
+    with spool:
+        assert not spool.rolled
+        assert spool.as_audio_input().read() == b"abcdef"
+
+
+@pytest.mark.asyncio
+async def test_large_upload_rolls_to_named_file_and_is_deleted() -> None:
+    spool = await spool_stream(_chunks(b"a" * 10, b"b" * 10), max_memory=16, max_size=64)
+    path = spool.path
+    assert isinstance(spool.as_audio_input(), Path)
+    assert Path(path).read_bytes() == b"a" * 10 + b"b" * 10
+    spool.close()
+    assert not os.path.exists(path)
+
+
+@pytest.mark.asyncio
+async def test_upload_over_limit_is_rejected() -> None:
+    with pytest.raises(UploadTooLargeError):
+        await spool_stream(_chunks(b"a" * 40, b"b" * 40), max_memory=16, max_size=64)
+
+
+def _multipart(audio: bytes, boundary: str = "b0undary") -> tuple[Headers, list[bytes]]:
+    body = (
+        f"--{boundary}\r\n"
+        'Content-Disposition: form-data; name="sentence_id"\r\n\r\n7\r\n'
+        f"--{boundary}\r\n"
+        'Content-Disposition: form-data; name="audio_file"; filename="a.wav"\r\n'
+        "Content-Type: audio/wav\r\n\r\n"
+    ).encode() + audio + f"\r\n--{boundary}--\r\n".encode()
+    headers = Headers({"content-type": f"multipart/form-data; boundary={boundary}"})
+    return headers, [body[i:i + 1024] for i in range(0, len(body), 1024)]
+
+
+@pytest.mark.asyncio
+async def test_multipart_file_is_read_in_place() -> None:
+    headers, parts = _multipart(b"RIFF" + b"x" * 5000)
+
+    form = await parse_multipart(headers, _chunks(*parts), max_file_size=10_000)
+    upload = form["audio_file"]
+
+    assert isinstance(upload, UploadFile)
+    assert upload.size == 5004
+    assert form["sentence_id"] == "7"
+    await form.close()
+
+
+@pytest.mark.asyncio
+async def test_multipart_over_limit_stops_while_streaming() -> None:
+    headers, parts = _multipart(b"x" * (MULTIPART_OVERHEAD + 20_000))
+    consumed = []
+
+    async def _tracked():
+        for part in parts:
+            consumed.append(part)
+            yield part
+
+    with pytest.raises(UploadTooLargeError):
+        await parse_multipart(headers, _tracked(), max_file_size=10_000)
+    assert len(consumed) < len(parts)
+
+
+@pytest.mark.asyncio
+async def test_multipart_rejected_from_content_length() -> None:
+    headers = Headers({
+        "content-type": "multipart/form-data; boundary=b0undary",
+        "content-length": str(10_000 + MULTIPART_OVERHEAD + 1),
+    })
+
+    with pytest.raises(UploadTooLargeError):
+        await parse_multipart(headers, _chunks(), max_file_size=10_000)